@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import events, reminders, daybook, modules, backups, firm_details, labour, setup
+from app.api.v1.endpoints import events, reminders, daybook, modules, backups, firm_details, labour, setup, admin
 from app.modules.auth import router as auth
 from app.modules.users import router as users
 from app.modules.master_data import router as master_data
@@ -23,3 +23,4 @@ api_router.include_router(backups.router, prefix="/backups", tags=["backups"])
 api_router.include_router(firm_details.router, prefix="/firm_details", tags=["firm_details"])
 api_router.include_router(labour.router, prefix="/labour", tags=["labour"])
 api_router.include_router(setup.router, prefix="", tags=["setup"]) # Setup endpoints (init_db, db/status)
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"]) # Diagnostics, superadmin only
@@ -0,0 +1,122 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from app.core.config import settings
+from app.core.loop_monitor import loop_monitor
+from app.core.memory import memory_overview, memory_tracer
+from app.core.profiler import profile_store
+from app.core.query_log import slow_query_log
+from app.core.security import require_superadmin
+from app.db.retry import busy_retry
+from app.db.storage import storage_stats
+from app.db.writer import write_queue
+
+router = APIRouter()
+
+@router.get("/slow_queries")
+def get_slow_queries(current_user: dict = Depends(require_superadmin)):
+    """Recent slow statements (newest first) and per-fingerprint aggregates"""
+    return {
+        "enabled": settings.SLOW_QUERY_LOG_ENABLED,
+        "threshold_ms": slow_query_log.threshold_ms,
+        "fingerprints": slow_query_log.summary(),
+        "recent": slow_query_log.recent(),
+    }
+
+@router.delete("/slow_queries")
+def reset_slow_queries(current_user: dict = Depends(require_superadmin)):
+    slow_query_log.reset()
+    return {"detail": "Slow query log cleared"}
+
+@router.get("/write_queue")
+def get_write_queue_stats(current_user: dict = Depends(require_superadmin)):
+    """Depth, wait/run time percentiles and group commit sizes of the single-writer queue"""
+    return {"enabled": settings.WRITE_QUEUE_ENABLED, **write_queue.stats()}
+
+@router.get("/db_contention")
+def get_db_contention(current_user: dict = Depends(require_superadmin)):
+    """SQLITE_BUSY retries, recoveries, give-ups and time spent waiting on locks"""
+    return busy_retry.stats()
+
+@router.delete("/db_contention")
+def reset_db_contention(current_user: dict = Depends(require_superadmin)):
+    busy_retry.reset()
+    return {"detail": "Contention counters cleared"}
+
+@router.get("/storage")
+def get_storage_stats(refresh: bool = False, current_user: dict = Depends(require_superadmin)):
+    """Per-table and per-index pages, bytes, free space, fragmentation and row counts (cached; `refresh` rescans)"""
+    return storage_stats.get(refresh=refresh)
+
+@router.get("/event_loop")
+def get_event_loop_stats(current_user: dict = Depends(require_superadmin)):
+    """Event-loop lag percentiles and the stacks of recent blocking calls (newest first)"""
+    return {"enabled": settings.LOOP_MONITOR_ENABLED, **loop_monitor.stats()}
+
+@router.get("/profiles")
+def get_profiles(current_user: dict = Depends(require_superadmin)):
+    """Stored request profiles, newest first"""
+    return {"enabled": settings.PROFILING_ENABLED, "ring_size": profile_store.size, "profiles": profile_store.list()}
+
+@router.get("/profiles/{profile_id}")
+def download_profile(
+    profile_id: str,
+    format: str = Query("raw", pattern="^(raw|text)$"),
+    limit: int = Query(50, ge=1, le=1000),
+    current_user: dict = Depends(require_superadmin),
+):
+    """
+    `raw` is the file as stored: a pstats dump (`python -m pstats`, snakeviz) or collapsed
+    stacks (flamegraph.pl, speedscope). `text` is a readable top-`limit` summary.
+    """
+    if format == "text":
+        return PlainTextResponse(profile_store.summary(profile_id, limit))
+    meta = profile_store.get(profile_id)
+    return FileResponse(meta["path"], filename=meta["file"], media_type="application/octet-stream")
+
+@router.delete("/profiles")
+def clear_profiles(current_user: dict = Depends(require_superadmin)):
+    profile_store.clear()
+    return {"detail": "Profiles deleted"}
+
+@router.get("/memory")
+def get_memory(current_user: dict = Depends(require_superadmin)):
+    """RSS, in-process cache sizes and tracemalloc status with the stored snapshots"""
+    return memory_overview()
+
+@router.post("/memory/tracemalloc/start")
+def start_tracemalloc(frames: int = Query(1, ge=1, le=50), current_user: dict = Depends(require_superadmin)):
+    """Start tracing allocations, keeping `frames` frames per allocation (more is slower but groups by call path)"""
+    memory_tracer.start(frames)
+    return memory_tracer.status()
+
+@router.post("/memory/tracemalloc/stop")
+def stop_tracemalloc(current_user: dict = Depends(require_superadmin)):
+    memory_tracer.stop()
+    return {"detail": "tracemalloc stopped, snapshots dropped"}
+
+@router.post("/memory/snapshots/{name}")
+def take_memory_snapshot(name: str, current_user: dict = Depends(require_superadmin)):
+    return memory_tracer.snapshot(name)
+
+@router.get("/memory/diff")
+def get_memory_diff(
+    base: str,
+    compare: Optional[str] = None,
+    top: int = Query(20, ge=1, le=500),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    current_user: dict = Depends(require_superadmin),
+):
+    """Top allocation growth from snapshot `base` to snapshot `compare` (or to now)"""
+    return memory_tracer.diff(base, compare, top, group_by)
+
+@router.get("/memory/top")
+def get_memory_top(
+    top: int = Query(20, ge=1, le=500),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    current_user: dict = Depends(require_superadmin),
+):
+    """Largest live allocations traced so far"""
+    return memory_tracer.top(top, group_by)
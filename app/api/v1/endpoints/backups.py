@@ -7,10 +7,9 @@ from urllib.parse import urlparse
 import zipfile
 from datetime import datetime
 from starlette.concurrency import run_in_threadpool
-from sqlalchemy.orm.session import close_all_sessions
 
 from app.core.security import get_current_user
-from app.db.session import engine
+from app.db.session import dispose_all_engines, engine
 from app.core.config import settings
 
 router = APIRouter()
@@ -86,7 +85,7 @@ def download(current_user: dict = Depends(get_current_user)):
     )
 
 @router.post("/restore")
-def restore_database(
+async def restore_database(
     file: UploadFile = File(...)
 ):
     # Extract real DB path
@@ -97,9 +96,15 @@ def restore_database(
     if not file.filename.endswith(".db"):
         raise HTTPException(status_code=400, detail="Only .db files are allowed")
 
+    # No pooled connection may keep reading (or writing) the file being replaced
+    await dispose_all_engines()
+
     # Save uploaded file to DB path
-    with open(db_path, "wb") as out_file:
-        shutil.copyfileobj(file.file, out_file)
+    def save():
+        with open(db_path, "wb") as out_file:
+            shutil.copyfileobj(file.file, out_file)
+
+    await run_in_threadpool(save)
 
     return {"message": "Database restored successfully"}
 
@@ -126,9 +131,8 @@ async def delete_current_database(
         )
 
     try:
-        # Close all sessions and dispose engine
-        close_all_sessions()
-        engine.dispose()
+        # Close every engine's connections, so none keeps the deleted file open
+        await dispose_all_engines()
 
         # Delete the file
         await run_in_threadpool(os.remove, db_file_path)
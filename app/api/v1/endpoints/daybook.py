@@ -1,4 +1,4 @@
-from fastapi import APIRouter, status, HTTPException, Depends
+from fastapi import APIRouter, status, HTTPException, Depends, Response
 from typing import Optional, List
 from datetime import datetime
 from sqlalchemy import func
@@ -9,20 +9,20 @@ from openpyxl.styles import Font, Alignment, PatternFill
 from openpyxl.worksheet.table import Table, TableStyleInfo
 import io
 
-from app.db.session import get_db
-from app.core.security import get_current_user
+from app.db.session import get_db, get_read_db
+from app.db.retry import retry_on_busy
+from app.db.writer import run_write_async
+from app.core.security import get_current_user, get_current_user_async
+from app.core.pagination import AllRowsPageParams, page_response
+from app.core.repository import paginate
 import app.models as models
 import app.schemas.daybook as schemas
 from app.modules.users.models import User as UserModel
 
 router = APIRouter()
 
-@router.post("/create_daybook", response_model=schemas.DayBook)
-def create_daybook(
-    daybook: schemas.CreateDaybook,
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user),
-):
+@retry_on_busy
+def _create_daybook(db: Session, daybook: schemas.CreateDaybook) -> models.DayBook:
     last_daybook = (
         db.query(models.DayBook)
         .order_by(models.DayBook.id.desc())
@@ -48,14 +48,31 @@ def create_daybook(
 
     db.add(new_daybook)
     db.commit()
-    db.refresh(new_daybook)
-    return new_daybook
+    # Load what the response walks while the writer's session is open
+    return (
+        db.query(models.DayBook)
+        .options(joinedload(models.DayBook.users).load_only(UserModel.user_login_id))
+        .populate_existing()
+        .filter(models.DayBook.id == new_daybook.id)
+        .one()
+    )
+
+@router.post("/create_daybook", response_model=schemas.DayBook)
+async def create_daybook(
+    daybook: schemas.CreateDaybook,
+    current_user: dict = Depends(get_current_user_async),
+):
+    # Read-last-balance-then-insert: on the single writer no two entries can chain off the same balance.
+    # Validated after the commit, so a serialization error cannot roll back the write
+    return schemas.DayBook.model_validate(await run_write_async(lambda db: _create_daybook(db, daybook)))
 
 @router.get("/get_daybook", response_model=List[schemas.DayBook])
 def get_daybook(
+    response: Response,
     party_name: Optional[str] = None,
     date: Optional[str] = None,
     particular: Optional[str] = None,
+    page: AllRowsPageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)):
     
@@ -74,8 +91,9 @@ def get_daybook(
     if particular:
         query = query.filter(models.DayBook.particular == particular)
 
-    db_daybook = query.options(joinedload(models.DayBook.users).load_only(UserModel.user_login_id)).all()
-    return db_daybook
+    query = query.options(joinedload(models.DayBook.users).load_only(UserModel.user_login_id))
+    result = paginate(query, models.DayBook, limit=page.limit, cursor=page.cursor, with_total=page.include_total)
+    return page_response(response, result)
 
 @router.get("/get_daybook/{daybook_id}", response_model=schemas.DayBook)
 def get_daybook_by_id(daybook_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -90,7 +108,7 @@ def get_daybook_report_data(
     particular: Optional[str] = None,
     from_date: Optional[str] = None,
     to_date: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     query = db.query(models.DayBook).options(joinedload(models.DayBook.users))
@@ -124,7 +142,7 @@ def download_daybook_report(
     from_date: Optional[str] = None,
     to_date: Optional[str] = None,
     download: bool = False,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     query = db.query(models.DayBook).options(joinedload(models.DayBook.users))
@@ -1,17 +1,22 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from sqlalchemy.orm import Session
 from typing import List
 from app.db.session import get_db
 from app.core.security import get_current_user
+from app.core.pagination import AllRowsPageParams, page_response
+from app.core.repository import paginate
 import app.models.events as models
 import app.schemas.events as schemas
 
 router = APIRouter()
 
 @router.get("/get_events", response_model=List[schemas.Event])
-def get_events(db: Session = Depends(get_db)):
-    events = db.query(models.Events).all()
-    return events
+def get_events(response: Response, page: AllRowsPageParams = Depends(), db: Session = Depends(get_db)):
+    events = paginate(
+        db.query(models.Events), models.Events,
+        limit=page.limit, cursor=page.cursor, with_total=page.include_total
+    )
+    return page_response(response, events)
 
 @router.get("/get_event/{event_id}", response_model=schemas.Event)
 def get_event(event_id: int, db: Session = Depends(get_db)):
@@ -59,9 +64,12 @@ def delete_event(event_id: int, db: Session = Depends(get_db)):
 # --- Announcements ---
 
 @router.get("/get_announcements", response_model=List[schemas.Announcement])
-def get_announcements(db: Session = Depends(get_db)):
-    announcements = db.query(models.Announcement).all()
-    return announcements
+def get_announcements(response: Response, page: AllRowsPageParams = Depends(), db: Session = Depends(get_db)):
+    announcements = paginate(
+        db.query(models.Announcement), models.Announcement,
+        limit=page.limit, cursor=page.cursor, with_total=page.include_total
+    )
+    return page_response(response, announcements)
 
 @router.post("/create_announcement", response_model=schemas.Announcement)
 def create_announcement(announcement: schemas.AnnouncementCreate, db: Session = Depends(get_db)):
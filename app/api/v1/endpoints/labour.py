@@ -1,20 +1,51 @@
 from datetime import date, datetime
-from fastapi import APIRouter, Depends, HTTPException
+import functools
+from fastapi import APIRouter, Depends, HTTPException, Response
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Optional
 import io
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.core.security import get_current_user
-import app.models as models
+from app.core.pagination import AllRowsPageParams, page_response
+from app.core.repository import BaseRepository, paginate
+import app.models.labour as models
 import app.schemas.labour as schemas
 import app.modules.users.models as user_models
 
 router = APIRouter()
 
+# Repositories for the bulk endpoints; natural keys drive `upsert_many`
+labour_gang_repository = BaseRepository(models.LabourGang, natural_key=("gang_name",))
+labour_work_item_repository = BaseRepository(models.LabourWorkItem, natural_key=("labour_item_name",))
+labour_work_particulars_repository = BaseRepository(models.LabourWorkParticulars, natural_key=("work_name",))
+labour_work_location_repository = BaseRepository(models.LabourWorkLocation, natural_key=("work_locations",))
+labour_bag_packaging_repository = BaseRepository(models.LabourBagPackagingWeight, natural_key=("bag_weight",))
+
+# Everything a voucher response or export row shows: one query per detail collection
+# (joining all five would multiply their rows), with the masters of each detail row joined in.
+# Built on first use and cached: building loader options configures the mappers, which
+# fails at import time while models referenced by string are not registered yet.
+@functools.lru_cache(maxsize=None)
+def voucher_load_options():
+    return (
+        joinedload(models.LabourPaymentVouchers.users).load_only(user_models.User.user_login_id),
+        selectinload(models.LabourPaymentVouchers.voucher_gangs).joinedload(models.VoucherGang.gang),
+        selectinload(models.LabourPaymentVouchers.voucher_work_items).joinedload(models.VoucherWorkItem.work_item),
+        selectinload(models.LabourPaymentVouchers.voucher_particulars).joinedload(models.VoucherParticular.particular),
+        selectinload(models.LabourPaymentVouchers.voucher_bag_packagings).options(
+            joinedload(models.VoucherBagPackaging.bag_packaging),
+            joinedload(models.VoucherBagPackaging.gang),
+        ),
+        selectinload(models.LabourPaymentVouchers.voucher_locations).options(
+            joinedload(models.VoucherLocation.location_origin),
+            joinedload(models.VoucherLocation.location_destination),
+        ),
+    )
+
 # Labour Gangs
 # ============================================================
 
@@ -32,10 +63,13 @@ def create_labour_gang(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/get_labour_gang", response_model=List[schemas.LabourGang])
-def read_labour_gang(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+def read_labour_gang(response: Response, page: AllRowsPageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     try:
-        labour_gang = db.query(models.LabourGang).all()
-        return labour_gang
+        labour_gang = paginate(
+            db.query(models.LabourGang), models.LabourGang,
+            limit=page.limit, cursor=page.cursor, with_total=page.include_total
+        )
+        return page_response(response, labour_gang)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -55,6 +89,26 @@ def update_labour_gang(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/bulk_create_labour_gang")
+def bulk_create_labour_gang(
+    labour_gangs: List[schemas.LabourGangCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)
+):
+    try:
+        ids = labour_gang_repository.bulk_create(db, objs_in=labour_gangs, return_ids=True)
+        return {"detail": f"{len(ids)} Labour gangs created", "ids": ids}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/bulk_upsert_labour_gang")
+def bulk_upsert_labour_gang(
+    labour_gangs: List[schemas.LabourGangCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)
+):
+    try:
+        ids = labour_gang_repository.upsert_many(db, objs_in=labour_gangs)
+        return {"detail": f"{len(ids)} Labour gangs saved", "ids": ids}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # ============================================================
 # Labour Work Items
 # ============================================================
@@ -73,10 +127,13 @@ def create_labour_work_item(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/get_labour_work_item", response_model=List[schemas.LabourWorkItem])
-def read_labour_work_item(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+def read_labour_work_item(response: Response, page: AllRowsPageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     try:
-        labour_work_item = db.query(models.LabourWorkItem).all()
-        return labour_work_item
+        labour_work_item = paginate(
+            db.query(models.LabourWorkItem), models.LabourWorkItem,
+            limit=page.limit, cursor=page.cursor, with_total=page.include_total
+        )
+        return page_response(response, labour_work_item)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -96,6 +153,26 @@ def update_labour_work_item(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/bulk_create_labour_work_item")
+def bulk_create_labour_work_item(
+    labour_work_items: List[schemas.LabourWorkItemCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)
+):
+    try:
+        ids = labour_work_item_repository.bulk_create(db, objs_in=labour_work_items, return_ids=True)
+        return {"detail": f"{len(ids)} Labour work items created", "ids": ids}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/bulk_upsert_labour_work_item")
+def bulk_upsert_labour_work_item(
+    labour_work_items: List[schemas.LabourWorkItemCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)
+):
+    try:
+        ids = labour_work_item_repository.upsert_many(db, objs_in=labour_work_items)
+        return {"detail": f"{len(ids)} Labour work items saved", "ids": ids}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # ============================================================
 # Labour Work Particulars
 # ============================================================
@@ -114,10 +191,13 @@ def create_labour_work_particulars(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/get_labour_work_particulars_details", response_model=List[schemas.LabourWorkParticulars])
-def read_labour_work_particulars(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+def read_labour_work_particulars(response: Response, page: AllRowsPageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     try:
-        labour_work_particulars = db.query(models.LabourWorkParticulars).all()
-        return labour_work_particulars
+        labour_work_particulars = paginate(
+            db.query(models.LabourWorkParticulars), models.LabourWorkParticulars,
+            limit=page.limit, cursor=page.cursor, with_total=page.include_total
+        )
+        return page_response(response, labour_work_particulars)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -137,6 +217,26 @@ def update_labour_work_particulars(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/bulk_create_labour_work_particulars")
+def bulk_create_labour_work_particulars(
+    labour_work_particulars: List[schemas.LabourWorkParticularsCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)
+):
+    try:
+        ids = labour_work_particulars_repository.bulk_create(db, objs_in=labour_work_particulars, return_ids=True)
+        return {"detail": f"{len(ids)} Labour work particulars created", "ids": ids}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/bulk_upsert_labour_work_particulars")
+def bulk_upsert_labour_work_particulars(
+    labour_work_particulars: List[schemas.LabourWorkParticularsCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)
+):
+    try:
+        ids = labour_work_particulars_repository.upsert_many(db, objs_in=labour_work_particulars)
+        return {"detail": f"{len(ids)} Labour work particulars saved", "ids": ids}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # ============================================================
 # Labour Work Locations
 # ============================================================
@@ -155,10 +255,13 @@ def create_labour_work_location(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/get_labour_work_location_details", response_model=List[schemas.LabourWorkLocation])
-def read_labour_work_location(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+def read_labour_work_location(response: Response, page: AllRowsPageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     try:
-        labour_work_location = db.query(models.LabourWorkLocation).all()
-        return labour_work_location
+        labour_work_location = paginate(
+            db.query(models.LabourWorkLocation), models.LabourWorkLocation,
+            limit=page.limit, cursor=page.cursor, with_total=page.include_total
+        )
+        return page_response(response, labour_work_location)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -178,6 +281,26 @@ def update_labour_work_location(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/bulk_create_labour_work_location")
+def bulk_create_labour_work_location(
+    labour_work_locations: List[schemas.LabourWorkLocationCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)
+):
+    try:
+        ids = labour_work_location_repository.bulk_create(db, objs_in=labour_work_locations, return_ids=True)
+        return {"detail": f"{len(ids)} Labour work locations created", "ids": ids}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/bulk_upsert_labour_work_location")
+def bulk_upsert_labour_work_location(
+    labour_work_locations: List[schemas.LabourWorkLocationCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)
+):
+    try:
+        ids = labour_work_location_repository.upsert_many(db, objs_in=labour_work_locations)
+        return {"detail": f"{len(ids)} Labour work locations saved", "ids": ids}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # ============================================================
 # Labour Bag Packagings
 # ============================================================
@@ -196,10 +319,13 @@ def create_labour_work_packaging(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/get_labour_bag_packaging_details", response_model=List[schemas.LabourBagPackagingWeight])
-def read_labour_work_packaging(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+def read_labour_work_packaging(response: Response, page: AllRowsPageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     try:
-        labour_work_packaging = db.query(models.LabourBagPackagingWeight).all()
-        return labour_work_packaging
+        labour_work_packaging = paginate(
+            db.query(models.LabourBagPackagingWeight), models.LabourBagPackagingWeight,
+            limit=page.limit, cursor=page.cursor, with_total=page.include_total
+        )
+        return page_response(response, labour_work_packaging)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -219,6 +345,26 @@ def update_labour_work_packaging(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/bulk_create_labour_bag_packaging")
+def bulk_create_labour_bag_packaging(
+    labour_bag_packagings: List[schemas.LabourBagPackagingWeightCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)
+):
+    try:
+        ids = labour_bag_packaging_repository.bulk_create(db, objs_in=labour_bag_packagings, return_ids=True)
+        return {"detail": f"{len(ids)} Labour bag packagings created", "ids": ids}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.put("/bulk_upsert_labour_bag_packaging")
+def bulk_upsert_labour_bag_packaging(
+    labour_bag_packagings: List[schemas.LabourBagPackagingWeightCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)
+):
+    try:
+        ids = labour_bag_packaging_repository.upsert_many(db, objs_in=labour_bag_packagings)
+        return {"detail": f"{len(ids)} Labour bag packagings saved", "ids": ids}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # ============================================================
 # Labour Payment Vouchers
 # ============================================================
@@ -350,15 +496,13 @@ def update_labour_payment_voucher(
     db.refresh(db_voucher)
 
 @router.get("/get_vouchers", response_model=List[schemas.LabourPaymentVoucher])
-def get_all_labour_payment_vouchers(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return db.query(models.LabourPaymentVouchers).options(
-        joinedload(models.LabourPaymentVouchers.users).load_only(user_models.User.user_login_id),
-        joinedload(models.LabourPaymentVouchers.voucher_gangs),
-        joinedload(models.LabourPaymentVouchers.voucher_work_items),
-        joinedload(models.LabourPaymentVouchers.voucher_particulars),
-        joinedload(models.LabourPaymentVouchers.voucher_bag_packagings),
-        joinedload(models.LabourPaymentVouchers.voucher_locations)
-    ).all()
+def get_all_labour_payment_vouchers(response: Response, page: AllRowsPageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    query = db.query(models.LabourPaymentVouchers).options(*voucher_load_options())
+    result = paginate(
+        query, models.LabourPaymentVouchers,
+        limit=page.limit, cursor=page.cursor, with_total=page.include_total
+    )
+    return page_response(response, result)
 
 @router.get("/get_voucher/{voucher_labour_payment_id}", response_model=schemas.LabourPaymentVoucher)
 def get_labour_payment_voucher(
@@ -366,22 +510,21 @@ def get_labour_payment_voucher(
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    db_voucher = db.query(models.LabourPaymentVouchers).filter_by(id=voucher_labour_payment_id).first()
+    db_voucher = db.query(models.LabourPaymentVouchers).options(*voucher_load_options()).filter_by(id=voucher_labour_payment_id).first()
     if not db_voucher:
         raise HTTPException(status_code=404, detail="Voucher not found")
     return db_voucher
 
 @router.get("/download_labour_payment_vouchers", response_class=StreamingResponse)
-async def download_labour_payment_vouchers_report(
+def download_labour_payment_vouchers_report(
     gang_name: Optional[str] = None,
     work_item_name: Optional[str] = None,
     particular_name: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user
 )):
     # Fetch all vouchers with related nested entities
-    query = db.query(models.LabourPaymentVouchers).options(
-        joinedload(models.LabourPaymentVouchers.users).load_only(user_models.User.user_login_id))
+    query = db.query(models.LabourPaymentVouchers).options(*voucher_load_options())
 
     if gang_name:
         query = query.join(models.LabourPaymentVouchers.voucher_gangs).join(models.VoucherGang.gang).filter(models.LabourGang.gang_name.ilike(f"%{gang_name}%"))
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session, joinedload
 from typing import List
 from datetime import date
 
 from app.db.session import get_db
 from app.core.security import get_current_user
+from app.core.pagination import AllRowsPageParams, page_response
+from app.core.repository import paginate
 import app.models as models
 import app.schemas.reminder as schemas
 
@@ -18,9 +20,12 @@ def create_reminder(reminder: schemas.ReminderCreate, db: Session = Depends(get_
     return db_reminder
 
 @router.get("/get_reminders", response_model=List[schemas.Reminder])
-def get_reminders(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    db_reminders = db.query(models.Reminder).options(joinedload(models.Reminder.users)).all()
-    return db_reminders
+def get_reminders(response: Response, page: AllRowsPageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    db_reminders = paginate(
+        db.query(models.Reminder).options(joinedload(models.Reminder.users)), models.Reminder,
+        limit=page.limit, cursor=page.cursor, with_total=page.include_total
+    )
+    return page_response(response, db_reminders)
 
 @router.get("/get_reminder/{reminder_id}", response_model=schemas.Reminder)
 def get_reminder(reminder_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -18,7 +18,7 @@ from app.modules.master_data.models import TransportorDetails, BrokerDetails
 router = APIRouter()
 
 @router.get("/db/status")
-async def db_status():
+def db_status():
     # Extract the raw file path from the SQLAlchemy URL
     raw_path = urlparse(settings.SQLALCHEMY_DATABASE_URL).path.lstrip("/")
     db_path = os.path.normpath(raw_path)
@@ -29,7 +29,7 @@ async def db_status():
     return { "db_initialized": False}
 
 @router.post("/init_db")
-async def init(admin_user: user_schemas.UserCreate = Body(...)):
+def init(admin_user: user_schemas.UserCreate = Body(...)):
     raw_path = urlparse(settings.SQLALCHEMY_DATABASE_URL).path.lstrip("/")
     db_path = os.path.normpath(raw_path)
 
@@ -0,0 +1,132 @@
+"""
+Cache of verified access tokens, so an authenticated request skips the JWT signature
+check and the `User` SELECT when the same token was seen recently. Entries are keyed
+by the token's SHA-256 (raw tokens are never held), bounded to AUTH_CACHE_SIZE with
+LRU eviction and live until the token expires or AUTH_CACHE_TTL_SECONDS pass,
+whichever comes first.
+
+Invalidation is per process: `UserService` drops a user's entries when the user is
+updated, deleted or has the password reset, and `blacklist_token` drops the token's.
+Other workers notice within AUTH_CACHE_TTL_SECONDS.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.memory import register_cache
+from app.core.metrics import registry
+
+auth_cache_lookups = registry.counter(
+    "auth_cache_lookups_total", "Access token lookups in the auth cache", ["result"])
+
+
+class Principal:
+    """Detached snapshot of the authenticated user - the columns handlers read, no session attached"""
+    __slots__ = ("id", "user_login_id", "user_role", "user_first_name", "user_second_name", "mobile_number",
+                 "designation")
+
+    def __init__(self, id: int, user_login_id: str, user_role: str, user_first_name: Optional[str] = None,
+                 user_second_name: Optional[str] = None, mobile_number: Optional[str] = None,
+                 designation: Optional[str] = None):
+        self.id = id
+        self.user_login_id = user_login_id
+        self.user_role = user_role
+        self.user_first_name = user_first_name
+        self.user_second_name = user_second_name
+        self.mobile_number = mobile_number
+        self.designation = designation
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(**{name: getattr(user, name) for name in cls.__slots__})
+
+    def __repr__(self) -> str:
+        return f"Principal(id={self.id!r}, user_login_id={self.user_login_id!r}, user_role={self.user_role!r})"
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class AuthCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        # digest -> (expires_at, role, principal), least recently used first
+        self._entries: "OrderedDict[bytes, Tuple[float, str, Principal]]" = OrderedDict()
+        self._by_user: Dict[str, Set[bytes]] = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a put that started before one is discarded
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        """Read before loading the user from the database and pass to `put`"""
+        return self._generation
+
+    def get(self, digest: bytes) -> Optional[Tuple[str, Principal]]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(digest)
+                    auth_cache_lookups.inc(("hit",))
+                    return entry[1], entry[2]
+                self._remove(digest)
+        auth_cache_lookups.inc(("miss",))
+        return None
+
+    def put(self, digest: bytes, expires_at: float, role: str, principal: Principal, generation: int):
+        expires_at = min(expires_at, time.time() + self.ttl)
+        with self._lock:
+            # An invalidation ran while this request was loading the user: what it loaded may be stale
+            if generation != self._generation or self.max_entries <= 0:
+                return
+            self._remove(digest)
+            self._entries[digest] = (expires_at, role, principal)
+            self._by_user.setdefault(principal.user_login_id, set()).add(digest)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, digest: bytes):
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return
+        login_id = entry[2].user_login_id
+        digests = self._by_user.get(login_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._by_user[login_id]
+
+    def invalidate_token(self, token: str):
+        with self._lock:
+            self._generation += 1
+            self._remove(token_digest(token))
+
+    def invalidate_user(self, *user_login_ids: Optional[str]):
+        with self._lock:
+            self._generation += 1
+            for login_id in user_login_ids:
+                for digest in list(self._by_user.get(login_id, ())):
+                    self._remove(digest)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_user.clear()
+
+
+auth_cache = AuthCache(
+    max_entries=settings.AUTH_CACHE_SIZE if settings.AUTH_CACHE_ENABLED else 0,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
+register_cache("auth_cache", lambda: len(auth_cache))
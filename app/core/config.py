@@ -13,7 +13,138 @@ class Settings:
     
     # Database configuration - using static filename
     SQLALCHEMY_DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./database/rice_mill.db")
+    # Same database through the aiosqlite driver, used by the async session path
+    ASYNC_SQLALCHEMY_DATABASE_URL: str = os.getenv(
+        "ASYNC_DATABASE_URL", SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    )
     ENV: str = os.getenv("ENV", "development")
+
+    # SQLite connection profile - "tuned" applies the PRAGMAs below on every new connection
+    # (and switches the database file to WAL), "default" keeps SQLite's stock settings
+    # (rollback journal, no busy timeout) - except that WRITE_QUEUE_ENABLED always needs WAL
+    SQLITE_PERFORMANCE_PROFILE: str = os.getenv("SQLITE_PERFORMANCE_PROFILE", "default")
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", -64000))  # negative = KiB (64MB)
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    SQLITE_TEMP_STORE: str = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    # Foreign key enforcement, separate from the profile: existing rows may violate constraints
+    # SQLite never checked, so turning it on can make writes fail
+    SQLITE_FOREIGN_KEYS: bool = os.getenv("SQLITE_FOREIGN_KEYS", "false").lower() == "true"
+
+    # Read-only reporting engine - separate pool so reports never queue behind postings
+    READ_POOL_SIZE: int = int(os.getenv("READ_POOL_SIZE", 5))
+    READ_MAX_OVERFLOW: int = int(os.getenv("READ_MAX_OVERFLOW", 10))
+
+    # Keyset pagination on list endpoints
+    DEFAULT_PAGE_SIZE: int = int(os.getenv("DEFAULT_PAGE_SIZE", 100))
+    MAX_PAGE_SIZE: int = int(os.getenv("MAX_PAGE_SIZE", 500))
+
+    # Slow-query log - statements at or above the threshold are kept with their query plan
+    SLOW_QUERY_LOG_ENABLED: bool = os.getenv("SLOW_QUERY_LOG_ENABLED", "true").lower() == "true"
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 100))
+    SLOW_QUERY_LOG_SIZE: int = int(os.getenv("SLOW_QUERY_LOG_SIZE", 200))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+
+    # Write queue - write units of work run one at a time on a dedicated connection/thread;
+    # up to WRITE_QUEUE_GROUP_COMMIT_MAX queued units share one commit (1 disables group commit)
+    WRITE_QUEUE_ENABLED: bool = os.getenv("WRITE_QUEUE_ENABLED", "true").lower() == "true"
+    WRITE_QUEUE_GROUP_COMMIT_MAX: int = int(os.getenv("WRITE_QUEUE_GROUP_COMMIT_MAX", 16))
+    WRITE_QUEUE_GROUP_WINDOW_MS: float = float(os.getenv("WRITE_QUEUE_GROUP_WINDOW_MS", 0))
+
+    # SQLITE_BUSY retry - whole units of work are re-run with jittered exponential backoff
+    DB_BUSY_RETRY_ATTEMPTS: int = int(os.getenv("DB_BUSY_RETRY_ATTEMPTS", 5))
+    DB_BUSY_RETRY_BASE_MS: float = float(os.getenv("DB_BUSY_RETRY_BASE_MS", 25))
+    DB_BUSY_RETRY_MAX_MS: float = float(os.getenv("DB_BUSY_RETRY_MAX_MS", 1000))
+
+    # Request metrics middleware and the Prometheus endpoint at {API_V1_STR}/metrics
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # Server-Timing header (db / deps / handler / serialize); requests slower than the threshold are logged too (0 = never)
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    SERVER_TIMING_LOG_THRESHOLD_MS: float = float(os.getenv("SERVER_TIMING_LOG_THRESHOLD_MS", 1000))
+
+    # N+1 detection - "off", "log" or "raise" for requests over ORM_LAZY_LOAD_THRESHOLD lazy loads
+    # or over their list endpoint's query budget; ORM_RAISELOAD makes unrequested relationships raise
+    ORM_STRICT_MODE: str = os.getenv("ORM_STRICT_MODE", "off").lower()
+    ORM_LAZY_LOAD_THRESHOLD: int = int(os.getenv("ORM_LAZY_LOAD_THRESHOLD", 10))
+    ORM_RAISELOAD: bool = os.getenv("ORM_RAISELOAD", "false").lower() == "true"
+
+    # On-demand profiling - superadmin requests with `X-Profile: 1` (cProfile) or `X-Profile: sample`;
+    # the last PROFILE_RING_SIZE profiles are kept in PROFILE_DIR
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "true").lower() == "true"
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "logs/profiles")
+    PROFILE_RING_SIZE: int = int(os.getenv("PROFILE_RING_SIZE", 50))
+    PROFILE_SAMPLE_INTERVAL_MS: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", 1))
+
+    # Event-loop lag monitor - heartbeat every LOOP_MONITOR_INTERVAL_MS; the stack of anything
+    # holding the loop longer than LOOP_BLOCK_THRESHOLD_MS is logged
+    LOOP_MONITOR_ENABLED: bool = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+    LOOP_MONITOR_INTERVAL_MS: float = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", 100))
+    LOOP_BLOCK_THRESHOLD_MS: float = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", 200))
+
+    # Logging - records beyond LOG_QUEUE_SIZE waiting for the writer thread are dropped (and counted)
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+
+    # Access log - errors and requests slower than ACCESS_LOG_SLOW_MS are always logged,
+    # other responses with probability ACCESS_LOG_SAMPLE_RATE
+    ACCESS_LOG_ENABLED: bool = os.getenv("ACCESS_LOG_ENABLED", "true").lower() == "true"
+    ACCESS_LOG_SAMPLE_RATE: float = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", 0.1))
+    ACCESS_LOG_SLOW_MS: float = float(os.getenv("ACCESS_LOG_SLOW_MS", 1000))
+
+    # Tracing - a TRACING_SAMPLE_RATE fraction of requests is traced (plus any arriving with a sampled
+    # W3C traceparent) and written as OTLP/JSON lines to TRACING_EXPORT_PATH
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACING_SAMPLE_RATE: float = float(os.getenv("TRACING_SAMPLE_RATE", 0.01))
+    TRACING_EXPORT_PATH: str = os.getenv("TRACING_EXPORT_PATH", "logs/traces.jsonl")
+    TRACING_EXPORT_MAX_BYTES: int = int(os.getenv("TRACING_EXPORT_MAX_BYTES", 50 * 1024 * 1024))
+    TRACING_SQL_MAX_LENGTH: int = int(os.getenv("TRACING_SQL_MAX_LENGTH", 2000))
+
+    # Readiness probe - SELECT 1 and the write lock must succeed within HEALTH_DB_TIMEOUT_MS;
+    # results are reused for HEALTH_CACHE_TTL_MS
+    HEALTH_DB_TIMEOUT_MS: float = float(os.getenv("HEALTH_DB_TIMEOUT_MS", 1000))
+    HEALTH_CACHE_TTL_MS: float = float(os.getenv("HEALTH_CACHE_TTL_MS", 2000))
+
+    # Table/index storage statistics (a full dbstat scan) are recomputed at most this often
+    STORAGE_STATS_TTL_SECONDS: float = float(os.getenv("STORAGE_STATS_TTL_SECONDS", 300))
+
+    # Verified access tokens (claims plus a user snapshot) are cached per process, at most
+    # AUTH_CACHE_TTL_SECONDS past the last change another worker made to the user
+    AUTH_CACHE_ENABLED: bool = os.getenv("AUTH_CACHE_ENABLED", "true").lower() == "true"
+    AUTH_CACHE_SIZE: int = int(os.getenv("AUTH_CACHE_SIZE", 10000))
+    AUTH_CACHE_TTL_SECONDS: float = float(os.getenv("AUTH_CACHE_TTL_SECONDS", 60))
+
+    # bcrypt cost (changing it rehashes passwords at the next login) and the dedicated
+    # hashing pool: workers, how many more may wait, and how long a caller waits at most
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_QUEUE_SIZE: int = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", 32))
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", 5))
+
+    # Per-client-IP rate limiting: RATE_LIMIT_DEFAULT for every path, except those matching a
+    # prefix in RATE_LIMIT_ROUTES ("/api/v1/auth=10/minute;/api/v1/admin=30/minute"); idle
+    # clients are forgotten every RATE_LIMIT_SWEEP_SECONDS and at most RATE_LIMIT_MAX_KEYS are kept
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "false").lower() == "true"
+    RATE_LIMIT_DEFAULT: str = os.getenv("RATE_LIMIT_DEFAULT", "120/minute")
+    RATE_LIMIT_ROUTES: str = os.getenv("RATE_LIMIT_ROUTES", f"{API_V1_STR}/auth/login=10/minute")
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))
+    RATE_LIMIT_SWEEP_SECONDS: float = float(os.getenv("RATE_LIMIT_SWEEP_SECONDS", 60))
+    # "memory" counts per worker process; "sqlite" shares the counts between all workers on the
+    # host through RATE_LIMIT_SQLITE_PATH (a check that waits longer than the timeout is allowed).
+    # Runtime state lives in ./runtime, not ./database, which holds the company databases
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_SQLITE_PATH: str = os.getenv("RATE_LIMIT_SQLITE_PATH", "./runtime/rate_limits.db")
+    RATE_LIMIT_SQLITE_TIMEOUT_MS: float = float(os.getenv("RATE_LIMIT_SQLITE_TIMEOUT_MS", 100))
+
+    # Revoked tokens, shared by all workers through TOKEN_REVOCATION_PATH and mirrored into an
+    # in-process Bloom filter of TOKEN_REVOCATION_BLOOM_BITS bits (1 MiB by default), which picks
+    # up other workers' revocations every TOKEN_REVOCATION_SYNC_SECONDS and drops expired ones at
+    # each rebuild
+    TOKEN_REVOCATION_PATH: str = os.getenv("TOKEN_REVOCATION_PATH", "./runtime/revoked_tokens.db")
+    TOKEN_REVOCATION_BLOOM_BITS: int = int(os.getenv("TOKEN_REVOCATION_BLOOM_BITS", 8 * 1024 * 1024))
+    TOKEN_REVOCATION_SYNC_SECONDS: float = float(os.getenv("TOKEN_REVOCATION_SYNC_SECONDS", 1))
+    TOKEN_REVOCATION_REBUILD_SECONDS: float = float(os.getenv("TOKEN_REVOCATION_REBUILD_SECONDS", 600))
     
     SECRET_KEY: str = os.getenv("SECRET_KEY", "supersecretkey")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
@@ -1,25 +1,39 @@
 """
-Structured logging configuration for production-grade application
+Structured logging configuration for production-grade application.
+
+Loggers only put records on a bounded queue (QueueHandler); a QueueListener thread
+formats them and writes to the console and the rotating JSON files, flushing once
+per drained batch instead of after every record.
 """
+import atexit
+import copy
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 import json
 from datetime import datetime
 from typing import Any, Dict
 
+from app.core.config import settings
+
 # Create logs directory if it doesn't exist
 LOGS_DIR = Path("logs")
 LOGS_DIR.mkdir(exist_ok=True)
 
+# Attributes every LogRecord has; anything else on a record came from `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+
 class JSONFormatter(logging.Formatter):
     """
     Custom JSON formatter for structured logging
     """
     def format(self, record: logging.LogRecord) -> str:
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
+            # Formatted on the listener thread, so use the time the record was created
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -31,17 +45,92 @@ class JSONFormatter(logging.Formatter):
         # Add exception info if present
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_data["exception"] = record.exc_text
         
-        # Add extra fields
-        if hasattr(record, "extra"):
-            log_data.update(record.extra)
+        # Add extra fields (logging sets them as record attributes)
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                log_data[key] = value
         
-        return json.dumps(log_data)
+        return json.dumps(log_data, default=str)
+
+
+class _BatchFlushMixin:
+    """Defers flushing to the listener, which calls `flush_batch` once the queue is drained"""
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+
+class BatchedStreamHandler(_BatchFlushMixin, logging.StreamHandler):
+    pass
+
+
+class BatchedRotatingFileHandler(_BatchFlushMixin, RotatingFileHandler):
+    pass
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Never blocks the caller: when the queue is full the record is dropped and counted.
+    Records are prepared without pre-formatting, so the listener's handlers format
+    them themselves (JSON for files) and keep their `extra` fields.
+    """
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            # Tracebacks hold frames; render them now rather than keep those alive on the queue
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingQueueListener(QueueListener):
+    def dequeue(self, block: bool):
+        if block:
+            try:
+                return self.queue.get_nowait()
+            except queue.Empty:
+                # Caught up: write out what the handlers buffered before waiting for more
+                self.flush()
+        return self.queue.get(block)
+
+    def flush(self):
+        for handler in self.handlers:
+            if isinstance(handler, _BatchFlushMixin):
+                try:
+                    handler.flush_batch()
+                except (OSError, ValueError):
+                    # A stream closed under us (e.g. a replaced sys.stdout at exit); as logging.shutdown
+                    # does, skip it so the other handlers still flush and the listener keeps running
+                    pass
+
+    def stop(self):
+        super().stop()
+        self.flush()
+
+
+_listeners: Dict[str, BatchingQueueListener] = {}
 
 
 def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
     """
-    Setup logger with file and console handlers
+    Setup logger with file and console handlers behind a queue
     
     Args:
         name: Logger name
@@ -55,46 +144,76 @@ def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
     
     # Remove existing handlers
     logger.handlers = []
+    if name in _listeners:
+        _listeners.pop(name).stop()
     
     # Console handler with simple format for development
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = BatchedStreamHandler(sys.stdout)
     console_handler.setLevel(logging.DEBUG)
     console_format = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     console_handler.setFormatter(console_format)
-    logger.addHandler(console_handler)
     
     # File handler with JSON format for production
-    file_handler = RotatingFileHandler(
+    file_handler = BatchedRotatingFileHandler(
         LOGS_DIR / f"{name}.log",
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=5
     )
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(JSONFormatter())
-    logger.addHandler(file_handler)
     
     # Error file handler
-    error_handler = RotatingFileHandler(
+    error_handler = BatchedRotatingFileHandler(
         LOGS_DIR / f"{name}_error.log",
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=5
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(JSONFormatter())
-    logger.addHandler(error_handler)
+    
+    attach_queue_listener(logger, console_handler, file_handler, error_handler)
     
     return logger
 
 
+def attach_queue_listener(logger: logging.Logger, *handlers: logging.Handler):
+    """Route `logger`'s records through a bounded queue to `handlers` on a listener thread"""
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    logger.addHandler(DroppingQueueHandler(log_queue))
+    listener = BatchingQueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners[logger.name] = listener
+
+
+def logging_stats() -> Dict[str, int]:
+    """Records waiting for the listener and records dropped because the queue was full"""
+    depth = dropped = 0
+    for name, listener in list(_listeners.items()):
+        depth += listener.queue.qsize()
+        dropped += sum(h.dropped for h in logging.getLogger(name).handlers if isinstance(h, DroppingQueueHandler))
+    return {"queue_depth": depth, "dropped": dropped}
+
+
+def stop_logging():
+    """Write out everything still queued; registered with atexit"""
+    while _listeners:
+        _, listener = _listeners.popitem()
+        listener.stop()
+
+
+atexit.register(stop_logging)
+
+
 # Create application logger
 app_logger = setup_logger("rice_mill_erp", level="INFO")
 
 
-def log_request(method: str, url: str, status_code: int, duration: float, **kwargs):
+def log_request(method: str, url: str, status_code: int, duration: float, level: int = logging.INFO, **kwargs):
     """Log HTTP request"""
-    app_logger.info(
+    app_logger.log(
+        level,
         f"{method} {url} - {status_code}",
         extra={
             "method": method,
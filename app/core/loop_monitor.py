@@ -0,0 +1,140 @@
+"""
+Event-loop lag monitor. A heartbeat task measures how late the loop wakes it up,
+and a watchdog thread logs the stack of whatever is holding the loop once it has
+been stuck longer than LOOP_BLOCK_THRESHOLD_MS - a blocking call inside an
+`async def` endpoint shows up by name instead of as "everything got slow".
+"""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.core.metrics import registry
+from app.core.query_log import percentile
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+event_loop_lag = registry.histogram(
+    "event_loop_lag_seconds", "How late the event loop ran a heartbeat scheduled every LOOP_MONITOR_INTERVAL_MS",
+    buckets=LAG_BUCKETS)
+
+
+class LoopMonitor:
+    def __init__(self, *, interval_ms: float = 100, block_threshold_ms: float = 200,
+                 samples: int = 1000, recent_blocks: int = 20):
+        self.interval = interval_ms / 1000.0
+        self.block_threshold = block_threshold_ms / 1000.0
+        self._lags = deque(maxlen=samples)
+        self._blocks = deque(maxlen=recent_blocks)
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        # perf_counter() when the heartbeat last went to sleep; the watchdog compares against it
+        self._last_tick = 0.0
+        self._reported_tick = 0.0
+        self._current_block: Optional[Dict[str, Any]] = None
+        self._blocked_total = 0
+
+    def start(self):
+        """Start monitoring the running loop; call from a startup hook"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stop.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._watchdog.join()
+        self._watchdog = None
+
+    async def _heartbeat(self):
+        while True:
+            self._last_tick = scheduled = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - scheduled - self.interval)
+            event_loop_lag.observe((), lag)
+            with self._lock:
+                self._lags.append(lag * 1000)
+                block, self._current_block = self._current_block, None
+            if block is not None:
+                block["blocked_ms"] = round(lag * 1000, 2)
+                app_logger.warning(f"Event loop was blocked for {lag * 1000:.0f} ms")
+
+    def _watch(self):
+        # Polls several times per threshold so a block is caught soon after it crosses it
+        poll = min(self.interval, self.block_threshold) / 2
+        while not self._stop.wait(poll):
+            tick = self._last_tick
+            stalled = time.perf_counter() - tick - self.interval
+            if stalled < self.block_threshold or tick == self._reported_tick:
+                continue
+            self._reported_tick = tick
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            block = {
+                "timestamp": datetime.utcnow().isoformat(),
+                "blocked_ms": None,  # filled in by the heartbeat once the loop is back
+                "stack": stack,
+            }
+            with self._lock:
+                self._blocks.append(block)
+                self._current_block = block
+                self._blocked_total += 1
+            app_logger.warning(
+                f"Event loop blocked for more than {stalled * 1000:.0f} ms, currently running:\n{stack}"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lags = sorted(self._lags)
+            blocks: List[Dict[str, Any]] = list(self._blocks)
+            blocked_total = self._blocked_total
+        return {
+            "running": self._task is not None,
+            "interval_ms": self.interval * 1000,
+            "block_threshold_ms": self.block_threshold * 1000,
+            "lag_ms": {
+                "p50": round(percentile(lags, 50), 3),
+                "p95": round(percentile(lags, 95), 3),
+                "p99": round(percentile(lags, 99), 3),
+                "max": round(lags[-1], 3) if lags else 0.0,
+            },
+            "blocked_total": blocked_total,
+            "recent_blocks": blocks[::-1],
+        }
+
+
+loop_monitor = LoopMonitor(
+    interval_ms=settings.LOOP_MONITOR_INTERVAL_MS,
+    block_threshold_ms=settings.LOOP_BLOCK_THRESHOLD_MS,
+)
+
+
+def _collect_loop_lag():
+    stats = loop_monitor.stats()
+    for q in ("p50", "p95", "p99"):
+        yield f"event_loop_lag_{q}_seconds", "gauge", f"{q} event loop lag over the last heartbeats", stats["lag_ms"][q] / 1000
+    yield "event_loop_blocked_total", "counter", "Times the event loop was stuck longer than LOOP_BLOCK_THRESHOLD_MS", stats["blocked_total"]
+
+
+registry.register_collector(_collect_loop_lag)
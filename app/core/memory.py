@@ -0,0 +1,166 @@
+"""
+Memory diagnostics for long-running processes: RSS, the entry counts of in-process
+caches, and on-demand tracemalloc with named snapshots and top-N diffs by file/line.
+tracemalloc slows allocations down noticeably, so it only runs between start and stop.
+"""
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+
+_caches: Dict[str, Callable[[], int]] = {}
+
+
+def register_cache(name: str, size: Callable[[], int]):
+    """Report `size()` (an entry count) as `name` in the memory overview; re-registering a name replaces it"""
+    _caches[name] = size
+
+
+def cache_sizes() -> Dict[str, Optional[int]]:
+    sizes = {}
+    for name, size in sorted(_caches.items()):
+        try:
+            sizes[name] = size()
+        except Exception:
+            sizes[name] = None
+    return sizes
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size, or the peak where only that is available (None on Windows)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemoryTracer:
+    """tracemalloc control plus up to `max_snapshots` named snapshots (oldest dropped first)"""
+    def __init__(self, max_snapshots: int = 10):
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, frames: int = 1):
+        if tracemalloc.is_tracing():
+            raise HTTPException(status_code=409, detail="tracemalloc is already running")
+        tracemalloc.start(frames)
+
+    def stop(self):
+        """Stop tracing and drop the snapshots (their traces are what holds the memory)"""
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+
+    def _take(self) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            raise HTTPException(status_code=409, detail="tracemalloc is not running; start it first")
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+    def snapshot(self, name: str) -> Dict[str, Any]:
+        snapshot = self._take()
+        info = {
+            "name": name,
+            "timestamp": datetime.utcnow().isoformat(),
+            "traced_bytes": tracemalloc.get_traced_memory()[0],
+            "rss_bytes": rss_bytes(),
+        }
+        with self._lock:
+            self._snapshots.pop(name, None)
+            self._snapshots[name] = {**info, "snapshot": snapshot}
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return info
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{k: v for k, v in entry.items() if k != "snapshot"} for entry in self._snapshots.values()]
+
+    def _get(self, name: str) -> tracemalloc.Snapshot:
+        with self._lock:
+            entry = self._snapshots.get(name)
+        if entry is None:
+            raise HTTPException(status_code=404, detail=f"No snapshot named {name!r}")
+        return entry["snapshot"]
+
+    def diff(self, base: str, compare: Optional[str] = None, top: int = 20, group_by: str = "lineno") -> Dict[str, Any]:
+        """Largest growth from snapshot `base` to `compare` (a fresh snapshot when None)"""
+        old = self._get(base)
+        new = self._get(compare) if compare else self._take()
+        stats = new.compare_to(old, group_by)
+        return {
+            "base": base,
+            "compare": compare or "now",
+            "total_size_diff_bytes": sum(stat.size_diff for stat in stats),
+            "top": [_format_stat(stat, stat.size_diff, stat.count_diff) for stat in stats[:top]],
+        }
+
+    def top(self, top: int = 20, group_by: str = "lineno") -> List[Dict[str, Any]]:
+        """Largest live allocations right now"""
+        return [_format_stat(stat) for stat in self._take().statistics(group_by)[:top]]
+
+    def status(self) -> Dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else None,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "snapshots": self.snapshots(),
+        }
+
+
+def _location(frame) -> str:
+    # Grouped by filename, the line number is 0
+    return f"{frame.filename}:{frame.lineno}" if frame.lineno else frame.filename
+
+
+def _format_stat(stat, size_diff: Optional[int] = None, count_diff: Optional[int] = None) -> Dict[str, Any]:
+    frames = stat.traceback
+    entry = {
+        "location": _location(frames[0]),
+        "size_bytes": stat.size,
+        "count": stat.count,
+    }
+    if size_diff is not None:
+        entry["size_diff_bytes"] = size_diff
+        entry["count_diff"] = count_diff
+    if len(frames) > 1:
+        entry["traceback"] = [_location(frame) for frame in frames]
+    return entry
+
+
+memory_tracer = MemoryTracer()
+
+
+def memory_overview() -> Dict[str, Any]:
+    return {
+        "rss_bytes": rss_bytes(),
+        "gc_objects": len(gc.get_objects()),
+        "gc_counts": gc.get_count(),
+        "caches": cache_sizes(),
+        "tracemalloc": memory_tracer.status(),
+    }
@@ -0,0 +1,284 @@
+"""
+In-process metrics in Prometheus text format: per-route latency histograms,
+in-flight requests, response sizes, DB queries per request, threadpool saturation.
+
+Every thread records into its own shard (a plain dict reached through a
+threading.local), so the request path never takes a lock; shards are only
+summed when /metrics is scraped.
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+import anyio.to_thread
+from sqlalchemy import event
+
+from app.core.logger import logging_stats
+from app.core.timing import track_request, untrack_request
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            # Only taken once per thread; shards of finished threads are kept so nothing is lost
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def _snapshot(self) -> List[dict]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        return [dict(shard) for shard in shards]
+
+    def _labels(self, values: Labels, **extra: str) -> Dict[str, str]:
+        labels = dict(zip(self.labelnames, values))
+        labels.update(extra)
+        return labels
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[Sample]:
+        totals: Dict[Labels, float] = {}
+        for shard in self._snapshot():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        if not totals and not self.labelnames:
+            totals[()] = 0
+        for labels, value in sorted(totals.items()):
+            yield self.name, self._labels(labels), value
+
+
+class Gauge(Counter):
+    """Up/down gauge; per-thread deltas add up, so inc and dec may happen on different threads"""
+    kind = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, labels: Labels, value: float):
+        shard = self._shard()
+        # [count per bucket (not cumulative) ..., +Inf bucket, sum]
+        counts = shard.get(labels)
+        if counts is None:
+            counts = shard[labels] = [0] * (len(self.buckets) + 2)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def samples(self) -> Iterable[Sample]:
+        totals: Dict[Labels, List[float]] = {}
+        for shard in self._snapshot():
+            for labels, counts in shard.items():
+                total = totals.setdefault(labels, [0] * len(counts))
+                for i, value in enumerate(list(counts)):
+                    total[i] += value
+        for labels, counts in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts[:-1]):
+                cumulative += count
+                yield f"{self.name}_bucket", self._labels(labels, le=_format_value(bound)), cumulative
+            yield f"{self.name}_sum", self._labels(labels), counts[-1]
+            yield f"{self.name}_count", self._labels(labels), cumulative
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, float]]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def _add(self, metric: _Metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, float]]]):
+        """`collector()` yields (name, type, help, value) for values read at scrape time"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+                    lines.append(f"{name}{{{rendered}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{name} {_format_value(value)}")
+        for collector in self._collectors:
+            for name, kind, help, value in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route template, method and status", ("route", "method", "status"))
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "Time to the end of the response body", ("route", "method", "status"))
+http_response_size = registry.histogram(
+    "http_response_size_bytes", "Response body size", ("route", "method"), buckets=SIZE_BUCKETS)
+http_request_queries = registry.histogram(
+    "http_request_db_queries", "Database statements executed per request", ("route", "method"), buckets=QUERY_BUCKETS)
+http_in_flight = registry.gauge(
+    "http_requests_in_flight", "Requests currently being handled")
+db_queries = registry.counter(
+    "db_queries_total", "Database statements executed", ("engine",))
+threadpool_saturated = registry.counter(
+    "threadpool_saturated_requests_total", "Requests that arrived with every threadpool worker busy")
+
+
+def instrument_engine(engine, name: str):
+    """Count statements on `engine` (for async engines, pass `sync_engine`); per-request counts come from app.core.timing"""
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        db_queries.inc((name,))
+
+    event.listen(engine, "before_cursor_execute", count_query)
+
+
+def _threadpool_limiter():
+    try:
+        return anyio.to_thread.current_default_thread_limiter()
+    except Exception:
+        # Outside a running event loop there is no threadpool to report on
+        return None
+
+
+def _collect_runtime():
+    limiter = _threadpool_limiter()
+    if limiter is not None:
+        statistics = limiter.statistics()
+        yield "threadpool_busy_threads", "gauge", "Threadpool workers running sync endpoints and dependencies", statistics.borrowed_tokens
+        yield "threadpool_max_threads", "gauge", "Threadpool size", statistics.total_tokens
+        yield "threadpool_waiting_tasks", "gauge", "Sync calls queued for a threadpool worker", statistics.tasks_waiting
+
+    log_stats = logging_stats()
+    yield "log_queue_depth", "gauge", "Log records waiting for the writer thread", log_stats["queue_depth"]
+    yield "log_records_dropped_total", "counter", "Log records dropped because the queue was full", log_stats["dropped"]
+
+    # Imported here: both modules import the database session, which imports this one
+    from app.db.retry import busy_retry
+    from app.db.writer import write_queue
+    queue_stats = write_queue.stats()
+    yield "write_queue_depth", "gauge", "Write units waiting for the writer thread", queue_stats["queue_depth"]
+    yield "write_queue_completed_total", "counter", "Write units committed", queue_stats["completed"]
+    yield "write_queue_failed_total", "counter", "Write units that raised or whose group failed", queue_stats["failed"]
+    yield "write_queue_groups_total", "counter", "Group commits", queue_stats["groups"]
+    yield "write_queue_wait_p95_seconds", "gauge", "95th percentile time queued before running", queue_stats["wait_ms"]["p95"] / 1000
+    retry_stats = busy_retry.stats()
+    yield "db_busy_errors_total", "counter", "SQLITE_BUSY/LOCKED errors seen by retried units of work", retry_stats["busy_errors"]
+    yield "db_busy_retries_total", "counter", "Units of work re-run after a busy error", retry_stats["retries"]
+    yield "db_busy_give_ups_total", "counter", "Units of work abandoned with a 503", retry_stats["give_ups"]
+    yield "db_lock_wait_seconds_total", "counter", "Time spent in attempts that ended on a busy error", retry_stats["lock_wait_ms"] / 1000
+
+
+registry.register_collector(_collect_runtime)
+
+
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware (no BaseHTTPMiddleware task/queue overhead). The route label
+    is the matched path template, so `/transactions/{id}` is one series, and anything
+    unmatched is folded into "unmatched" to keep cardinality bounded.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limiter = _threadpool_limiter()
+        if limiter is not None and limiter.borrowed_tokens >= limiter.total_tokens:
+            threadpool_saturated.inc()
+
+        started = time.perf_counter()
+        status_code = 500
+        size = 0
+        timings, token = track_request()
+
+        async def send_wrapper(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec()
+            untrack_request(token)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            status = str(status_code)
+            http_requests.inc((path, method, status))
+            http_request_duration.observe((path, method, status), time.perf_counter() - started)
+            http_response_size.observe((path, method), size)
+            http_request_queries.observe((path, method), timings.queries)
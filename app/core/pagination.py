@@ -0,0 +1,45 @@
+from typing import Optional
+from fastapi import Query, Response
+from app.core.config import settings
+from app.core.repository import Page
+
+
+class PageParams:
+    """
+    Query parameters shared by every list endpoint.
+    Pass the `X-Next-Cursor` response header back as `cursor` to get the next page;
+    `include_total=true` adds an `X-Total-Count` header.
+    """
+    def __init__(
+        self,
+        limit: Optional[int] = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ):
+        # a cursor only comes with a limit; paging on without one continues at the default size
+        self.limit = settings.DEFAULT_PAGE_SIZE if limit is None and cursor else limit
+        self.cursor = cursor
+        self.include_total = include_total
+
+
+class AllRowsPageParams(PageParams):
+    """
+    `PageParams` for lists that returned every row before pagination was added:
+    without `limit` (or `cursor`) they still do, so existing clients see no change.
+    """
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ):
+        super().__init__(limit, cursor, include_total)
+
+
+def page_response(response: Response, page: Page) -> list:
+    """Move the page metadata into headers so list bodies keep their existing shape"""
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    if page.total is not None:
+        response.headers["X-Total-Count"] = str(page.total)
+    return page.items
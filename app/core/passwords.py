@@ -0,0 +1,140 @@
+"""
+Password hashing on a small dedicated pool of threads. bcrypt is deliberately slow
+(~250 ms at 12 rounds), so a burst of logins run on request threads would take the
+whole threadpool; here at most PASSWORD_HASH_WORKERS hashes run at once, at most
+PASSWORD_HASH_QUEUE_SIZE more wait, and anything beyond that - or anything not done
+within PASSWORD_HASH_TIMEOUT_SECONDS - gets a 503 instead of piling up.
+
+The cost is BCRYPT_ROUNDS. Hashes made with any other cost still verify, and
+`verify_and_update` returns a replacement hash so logins move users to the new cost.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+HASH_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+password_hash_duration = registry.histogram(
+    "password_hash_duration_seconds", "Time a worker spent hashing or verifying a password", ["operation"],
+    buckets=HASH_BUCKETS)
+password_hash_queue_wait = registry.histogram(
+    "password_hash_queue_wait_seconds", "Time a password operation waited for a free worker", ["operation"],
+    buckets=HASH_BUCKETS)
+password_hash_rejected = registry.counter(
+    "password_hash_rejected_total", "Password operations refused because the queue was full or timed out",
+    ["reason"])
+
+
+class PasswordHasher:
+    def __init__(self, rounds: int, workers: int, queue_size: int, timeout_seconds: float):
+        # min/max pin the cost, so hashes made with more or fewer rounds are flagged for rehash
+        self.context = CryptContext(
+            schemes=["bcrypt"], deprecated="auto",
+            bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds, bcrypt__max_rounds=rounds,
+        )
+        self.workers = workers
+        self.max_pending = workers + queue_size
+        self.timeout = timeout_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        # Submitted and not finished yet; a caller that timed out still counts until its job ends
+        self._pending = 0
+
+    def _run(self, operation: str, func: Callable, *args) -> Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                password_hash_rejected.inc(("queue_full",))
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many password checks in progress, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        submitted = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            password_hash_queue_wait.observe((operation,), started - submitted)
+            try:
+                return func(*args)
+            finally:
+                password_hash_duration.observe((operation,), time.perf_counter() - started)
+
+        future = self._executor.submit(job)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future: Future):
+        with self._lock:
+            self._pending -= 1
+
+    def _timed_out(self, future: Future) -> HTTPException:
+        # Still queued: drop it; already running: let it finish, the result is discarded
+        future.cancel()
+        password_hash_rejected.inc(("timeout",))
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Password check timed out, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    def _wait(self, future: Future):
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise self._timed_out(future)
+
+    async def _wait_async(self, future: Future):
+        try:
+            # shield: on timeout the concurrent future is cancelled by `_timed_out`, not by wait_for
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), self.timeout)
+        except asyncio.TimeoutError:
+            raise self._timed_out(future)
+
+    def hash(self, password: str) -> str:
+        return self._wait(self._run("hash", self.context.hash, password))
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self._wait(self._run("verify", self.context.verify, password, hashed))
+
+    def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Whether `password` matches, plus a new hash when `hashed` was made with another cost"""
+        return self._wait(self._run("verify", self.context.verify_and_update, password, hashed))
+
+    async def verify_and_update_async(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """`verify_and_update` for `async def` endpoints - waiting holds no threadpool worker"""
+        return await self._wait_async(self._run("verify", self.context.verify_and_update, password, hashed))
+
+    def stats(self):
+        with self._lock:
+            pending = self._pending
+        return {
+            "busy_workers": min(pending, self.workers),
+            "queued": max(0, pending - self.workers),
+        }
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    timeout_seconds=settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+)
+
+
+def _collect_password_hashing():
+    stats = password_hasher.stats()
+    yield "password_hash_busy_workers", "gauge", "Password hashing workers in use", stats["busy_workers"]
+    yield "password_hash_queued", "gauge", "Password operations waiting for a worker", stats["queued"]
+
+
+registry.register_collector(_collect_password_hashing)
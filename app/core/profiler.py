@@ -0,0 +1,299 @@
+"""
+On-demand request profiler. A superadmin sends `X-Profile: 1` (cProfile) or
+`X-Profile: sample` (stack sampling) and the request runs under the profiler; the
+result is kept in a bounded ring of files under PROFILE_DIR and can be downloaded
+from /admin/profiles. Requests without the header only pay for one header scan.
+"""
+import asyncio
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.core.security import _decode_access_token
+
+PROFILE_ID = re.compile(r"^\d{13}-[0-9a-f]{6}$")
+_SAMPLE_MODES = ("sample", "sampling")
+
+# From 3.12 cProfile hooks sys.monitoring, which is process-wide: one enabled profile
+# records every thread, and no second profile can be enabled while it is
+_PROCESS_WIDE_CPROFILE = sys.version_info >= (3, 12)
+# At most one cProfile session per process, whichever middleware or thread starts it
+_cprofile_lock = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """Another cProfile session, or another profiling tool, is active in this process"""
+
+
+class ProfileSession:
+    """
+    One profiled request. Before 3.12 cProfile only sees the thread it is enabled on,
+    so the event loop thread is profiled from the middleware and sync endpoints add
+    their worker thread through `profile_routes`; from 3.12 the one profile sees all
+    threads. Other requests served meanwhile show up in the profile too.
+    """
+    def __init__(self, mode: str):
+        self.id = f"{int(time.time() * 1000)}-{secrets.token_hex(3)}"
+        self.mode = "sample" if mode in _SAMPLE_MODES else "cprofile"
+        self.profiles: List[cProfile.Profile] = []
+        self.thread_ids = set()
+        self.samples: Counter = Counter()
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if self.mode == "sample":
+            self.thread_ids.add(threading.get_ident())
+            self._sampler = threading.Thread(target=self._sample, name=f"profile-{self.id}", daemon=True)
+            self._sampler.start()
+        else:
+            if not _cprofile_lock.acquire(blocking=False):
+                raise ProfilerBusy()
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except (ValueError, RuntimeError):
+                # Another tool (a debugger, coverage) already profiles this thread, or on 3.12+ the process
+                _cprofile_lock.release()
+                raise ProfilerBusy()
+            self.profiles.append(profile)
+
+    def stop(self):
+        if self.mode == "sample":
+            self._stop.set()
+            self._sampler.join()
+        else:
+            self.profiles[0].disable()
+            _cprofile_lock.release()
+
+    def run_in_thread(self, call, *args, **kwargs):
+        """Run `call` on the current (worker) thread under this session"""
+        if self.mode == "sample":
+            thread_id = threading.get_ident()
+            self.thread_ids.add(thread_id)
+            try:
+                return call(*args, **kwargs)
+            finally:
+                self.thread_ids.discard(thread_id)
+        if _PROCESS_WIDE_CPROFILE:
+            # Already recorded by the profile enabled in `start`
+            return call(*args, **kwargs)
+        profile = cProfile.Profile()
+        self.profiles.append(profile)
+        return profile.runcall(call, *args, **kwargs)
+
+    def _sample(self):
+        interval = settings.PROFILE_SAMPLE_INTERVAL_MS / 1000.0
+        while not self._stop.wait(interval):
+            frames = sys._current_frames()
+            for thread_id in list(self.thread_ids):
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if stack:
+                    self.samples[";".join(reversed(stack))] += 1
+
+    def dump(self, directory: Path) -> Path:
+        if self.mode == "sample":
+            path = directory / f"{self.id}.collapsed"
+            with open(path, "w") as f:
+                for stack, count in self.samples.most_common():
+                    f.write(f"{stack} {count}\n")
+            return path
+        path = directory / f"{self.id}.prof"
+        stats = pstats.Stats(self.profiles[0])
+        for profile in self.profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(str(path))
+        return path
+
+
+_current_session: ContextVar[Optional[ProfileSession]] = ContextVar("profile_session", default=None)
+
+
+class ProfileStore:
+    """Ring of the last `size` profiles on disk: `<id>.prof` or `<id>.collapsed`, plus `<id>.json` metadata"""
+    def __init__(self, directory: str, size: int):
+        self.directory = Path(directory)
+        self.size = size
+        self._lock = threading.Lock()
+
+    def save(self, session: ProfileSession, meta: Dict[str, Any]):
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = session.dump(self.directory)
+            meta = {"id": session.id, "mode": session.mode, "file": path.name, "size_bytes": path.stat().st_size, **meta}
+            (self.directory / f"{session.id}.json").write_text(json.dumps(meta))
+            for old in self._metadata_files()[:-self.size]:
+                for file in self.directory.glob(f"{old.stem}.*"):
+                    file.unlink(missing_ok=True)
+
+    def _metadata_files(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        # Ids start with a millisecond timestamp, so name order is age order
+        return sorted(self.directory.glob("*.json"))
+
+    def list(self) -> List[Dict[str, Any]]:
+        entries = []
+        for path in reversed(self._metadata_files()):
+            try:
+                entries.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def get(self, profile_id: str) -> Dict[str, Any]:
+        if not PROFILE_ID.match(profile_id):
+            raise HTTPException(status_code=400, detail="Invalid profile id")
+        try:
+            meta = json.loads((self.directory / f"{profile_id}.json").read_text())
+        except (OSError, ValueError):
+            raise HTTPException(status_code=404, detail="Profile not found")
+        meta["path"] = self.directory / meta["file"]
+        return meta
+
+    def summary(self, profile_id: str, limit: int = 50) -> str:
+        """Top functions by cumulative time (cProfile) or hottest stacks (sampling) as text"""
+        meta = self.get(profile_id)
+        if meta["mode"] == "sample":
+            with open(meta["path"]) as f:
+                return "".join(f.readlines()[:limit])
+        out = io.StringIO()
+        pstats.Stats(str(meta["path"]), stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def clear(self):
+        with self._lock:
+            for path in self.directory.glob("*"):
+                if path.suffix in (".json", ".prof", ".collapsed"):
+                    path.unlink(missing_ok=True)
+
+
+profile_store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_RING_SIZE)
+
+
+def _profiled_endpoint(call):
+    @functools.wraps(call)
+    def profiled(*args, **kwargs):
+        session = _current_session.get()
+        if session is None:
+            return call(*args, **kwargs)
+        return session.run_in_thread(call, *args, **kwargs)
+    return profiled
+
+
+def profile_routes(app):
+    """Let sync endpoints (run on worker threads) join their request's profile. Call after all routers are included."""
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.dependant.call is not None \
+                and not asyncio.iscoroutinefunction(route.dependant.call):
+            route.dependant.call = _profiled_endpoint(route.dependant.call)
+
+
+def _is_superadmin(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return False
+            try:
+                _, role = _decode_access_token(token)
+            except HTTPException:
+                return False
+            return role == "superadmin"
+    return False
+
+
+class ProfilerMiddleware:
+    """
+    Profiles requests carrying `X-Profile` from a superadmin token; the response gets
+    `X-Profile-Id`. One profiled request at a time - while one runs, or while another
+    profiler is active in the process, others are served normally with
+    `X-Profile-Status: busy`. Anyone else's header is ignored.
+    """
+    def __init__(self, app):
+        self.app = app
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        mode = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                mode = value.decode("latin-1").strip().lower()
+                break
+        if mode in (None, "", "0", "false") or not _is_superadmin(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._lock.acquire(blocking=False):
+            await self.app(scope, receive, self._with_headers(send, [(b"x-profile-status", b"busy")]))
+            return
+
+        session = ProfileSession(mode)
+        try:
+            session.start()
+        except ProfilerBusy:
+            self._lock.release()
+            await self.app(scope, receive, self._with_headers(send, [(b"x-profile-status", b"busy")]))
+            return
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = _current_session.set(session)
+        try:
+            await self.app(scope, receive, self._with_headers(send_wrapper, [(b"x-profile-id", session.id.encode())]))
+        finally:
+            session.stop()
+            _current_session.reset(token)
+            self._lock.release()
+            meta = {
+                "timestamp": datetime.utcnow().isoformat(),
+                "method": scope["method"],
+                "path": scope["path"],
+                "query_string": scope.get("query_string", b"").decode("latin-1"),
+                "status_code": status_code,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            }
+            try:
+                await run_in_threadpool(profile_store.save, session, meta)
+            except OSError as exc:
+                app_logger.error(f"Could not store profile {session.id}: {exc}")
+
+    @staticmethod
+    def _with_headers(send, headers):
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), *headers]}
+            await send(message)
+        return send_with_headers
@@ -0,0 +1,186 @@
+"""
+N+1 detection: per-request lazy-load counting, an optional `raiseload('*')` strict
+mode, per-route query budgets for the list endpoints, and `assert_max_queries`
+for tests.
+"""
+import json
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, raiseload
+
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.core.timing import current_timings, track_request, untrack_request
+from app.db import session as db_session
+
+# Statements per request for the list, report and export endpoints, measured at a full
+# page with a distinct related row per item (the worst case for many-to-one lazy loads).
+# Each budget includes the auth lookup (1) and, for paginated lists, include_total's COUNT (1).
+_API = settings.API_V1_STR
+LIST_QUERY_BUDGETS: Dict[str, int] = {
+    f"{_API}/users/get_users": 3,
+    f"{_API}/master_data/get_party_details": 3,
+    f"{_API}/master_data/get_broker_details": 3,
+    f"{_API}/master_data/get_transportor_details": 3,
+    f"{_API}/master_data/get_godown_details": 3,
+    f"{_API}/master_data/get_stock_items_details": 3,
+    f"{_API}/master_data/get_packaging_details": 3,
+    f"{_API}/master_data/get_weight_bridge_operator_details": 3,
+    f"{_API}/inventory/incoming_outgoing": 3,
+    f"{_API}/inventory/transactions": 10,
+    f"{_API}/inventory/stock_summary": 4,
+    f"{_API}/production/get_batch_operators": 3,
+    f"{_API}/production/get_clerks": 3,
+    f"{_API}/production/get_all_batches": 3,
+    f"{_API}/production/get_steam_on_details": 3,
+    f"{_API}/production/get_steam_off_details": 3,
+    f"{_API}/production/get_drainage_details": 3,
+    f"{_API}/production/get_immerse_details": 3,
+    f"{_API}/production/get_milling_analysis_details": 3,
+    f"{_API}/production/get_sorting_analysis_details": 3,
+    f"{_API}/production/get_cross_verification_details": 3,
+    f"{_API}/production/get_lot_details": 3,
+    f"{_API}/events/get_events": 3,
+    f"{_API}/events/get_announcements": 3,
+    f"{_API}/reminders/get_reminders": 3,
+    f"{_API}/reminders/get_latest_renewal_dates": 2,
+    f"{_API}/daybook/get_daybook": 3,
+    f"{_API}/daybook/daybook_report": 3,
+    f"{_API}/daybook/download_daybook_report": 3,
+    f"{_API}/modules/get_modules": 2,
+    f"{_API}/modules/enabled_modules": 2,
+    f"{_API}/labour/get_labour_gang": 3,
+    f"{_API}/labour/get_labour_work_item": 3,
+    f"{_API}/labour/get_labour_work_particulars_details": 3,
+    f"{_API}/labour/get_labour_work_location_details": 3,
+    f"{_API}/labour/get_labour_bag_packaging_details": 3,
+    f"{_API}/labour/get_vouchers": 8,
+    f"{_API}/labour/download_labour_payment_vouchers": 8,
+}
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def _lazy_load_path(orm_execute_state) -> str:
+    path = orm_execute_state.loader_strategy_path
+    attribute = getattr(path[-1], "key", "?") if path is not None and len(path) else "?"
+    return f"{orm_execute_state.lazy_loaded_from.class_.__name__}.{attribute}"
+
+
+def _on_orm_execute(orm_execute_state):
+    timings = current_timings()
+    if timings is None:
+        return
+    if orm_execute_state.lazy_loaded_from is not None:
+        timings.lazy_loads.append(_lazy_load_path(orm_execute_state))
+        if settings.ORM_STRICT_MODE == "raise" and len(timings.lazy_loads) > settings.ORM_LAZY_LOAD_THRESHOLD:
+            raise QueryBudgetExceeded(
+                f"{len(timings.lazy_loads)} lazy loads in one request (threshold {settings.ORM_LAZY_LOAD_THRESHOLD}): "
+                f"{', '.join(sorted(set(timings.lazy_loads)))}; add joinedload/selectinload for them"
+            )
+    elif settings.ORM_RAISELOAD and orm_execute_state.is_select and not orm_execute_state.is_relationship_load \
+            and not orm_execute_state.is_column_load:
+        # Relationships the query did not ask for raise on access instead of loading one by one
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+
+def instrument_sessions():
+    """Count lazy loads (and apply raiseload in strict mode) for every Session, sync or async"""
+    if not event.contains(Session, "do_orm_execute", _on_orm_execute):
+        event.listen(Session, "do_orm_execute", _on_orm_execute)
+
+
+class QueryBudgetMiddleware:
+    """
+    Checks each request against ORM_LAZY_LOAD_THRESHOLD and its route's entry in
+    LIST_QUERY_BUDGETS. "log" mode logs offenders; "raise" mode replaces the
+    response with a 500 naming the lazy-loaded relationships.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings, token = track_request()
+        replaced = False
+
+        async def send_wrapper(message):
+            nonlocal replaced
+            if replaced:
+                return
+            if message["type"] == "http.response.start":
+                problems = self._check(scope, timings)
+                if problems:
+                    detail = f"{scope['method']} {scope['path']}: {'; '.join(problems)}"
+                    app_logger.warning(f"Query budget exceeded - {detail}", extra={
+                        "queries": timings.queries, "lazy_loads": timings.lazy_loads, "path": scope["path"],
+                    })
+                    if settings.ORM_STRICT_MODE == "raise":
+                        replaced = True
+                        body = json.dumps({"detail": f"Query budget exceeded - {detail}"}).encode()
+                        await send({"type": "http.response.start", "status": 500, "headers": [
+                            (b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                        ]})
+                        await send({"type": "http.response.body", "body": body})
+                        return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            untrack_request(token)
+
+    @staticmethod
+    def _check(scope, timings) -> List[str]:
+        problems = []
+        if len(timings.lazy_loads) > settings.ORM_LAZY_LOAD_THRESHOLD:
+            problems.append(
+                f"{len(timings.lazy_loads)} lazy loads (threshold {settings.ORM_LAZY_LOAD_THRESHOLD}): "
+                f"{', '.join(sorted(set(timings.lazy_loads)))}"
+            )
+        route = scope.get("route")
+        budget = LIST_QUERY_BUDGETS.get(getattr(route, "path", None))
+        if budget is not None and timings.queries > budget:
+            problems.append(f"{timings.queries} queries (budget {budget})")
+        return problems
+
+
+@contextmanager
+def assert_max_queries(n: int, *engines) -> Iterator[List[str]]:
+    """
+    Fail if the block executes more than `n` statements. Counts everything on the
+    given engines (all app engines by default) whatever thread runs it, so it works
+    around a TestClient call:
+
+        with assert_max_queries(3):
+            client.get("/api/v1/inventory/transactions")
+
+    Yields the list of statements, for a closer look at what ran.
+    """
+    if not engines:
+        engines = (db_session.engine, db_session.write_engine, db_session.read_engine,
+                   db_session.async_engine.sync_engine, db_session.async_read_engine.sync_engine)
+
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", record)
+
+    if len(statements) > n:
+        listing = "\n".join(f"  {i}. {' '.join(statement.split())[:200]}" for i, statement in enumerate(statements, 1))
+        raise QueryBudgetExceeded(f"{len(statements)} queries executed, expected at most {n}:\n{listing}")
@@ -0,0 +1,201 @@
+"""
+Slow-query log: engine hooks that time every statement, keep the slow ones in a
+ring buffer with their EXPLAIN QUERY PLAN, and aggregate them per fingerprint
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.core.memory import register_cache
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+
+def fingerprint(statement: str) -> str:
+    """Statement with literals and IN-lists collapsed, so the same query with other values groups together"""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    return _PLACEHOLDER_LIST.sub("(?...)", normalized)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def analyze_plan(plan: List[str], statement: str) -> Dict[str, Any]:
+    """
+    Flag full table scans and temp B-trees in an EXPLAIN QUERY PLAN and suggest
+    indexes from the columns the statement filters or orders on.
+    """
+    full_scans = []
+    temp_btrees = []
+    for detail in plan:
+        match = re.match(r"SCAN (?:TABLE )?(\w+)(?: AS (\w+))?$", detail)
+        if match:
+            full_scans.append((match.group(1), match.group(2) or match.group(1)))
+        elif "USE TEMP B-TREE" in detail:
+            temp_btrees.append(detail)
+
+    advice = []
+    where = re.search(r"\bWHERE\b(.*?)(?:\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|$)", statement, re.S | re.I)
+    for table, alias in full_scans:
+        columns = []
+        if where:
+            for column in re.findall(rf"\b{re.escape(alias)}\.(\w+)\s*(?:=|<|>|IN\b|LIKE\b|IS\b|BETWEEN\b)", where.group(1), re.I):
+                if column not in columns:
+                    columns.append(column)
+        if columns:
+            advice.append(f"CREATE INDEX ix_{table}_{'_'.join(columns)} ON {table} ({', '.join(columns)})")
+        else:
+            advice.append(f"{table} is read in full; add a WHERE clause on an indexed column or a LIMIT")
+    if temp_btrees:
+        order_by = re.search(r"\bORDER BY\b(.*?)(?:\bLIMIT\b|\bOFFSET\b|$)", statement, re.S | re.I)
+        if order_by:
+            advice.append(f"sort needs a temp B-tree; an index ending in ({order_by.group(1).strip()}) would avoid it")
+
+    return {
+        "full_table_scans": [table for table, _ in full_scans],
+        "temp_btrees": temp_btrees,
+        "advice": advice,
+    }
+
+
+class SlowQueryLog:
+    """
+    Times statements through `before_cursor_execute`/`after_cursor_execute` and
+    records those at or above `threshold_ms`. The plan is captured once per
+    fingerprint; percentiles come from the last `samples` durations of each.
+    """
+    def __init__(self, threshold_ms: float, size: int = 200, explain: bool = True, samples: int = 500):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.samples = samples
+        self.entries = deque(maxlen=size)
+        self.fingerprints: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def instrument(self, engine):
+        """Attach the timing hooks to `engine` (for async engines, pass `sync_engine`)"""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def _handle_error(self, exception_context):
+        # A failed statement never reaches after_cursor_execute; drop its start time so the stack stays paired
+        conn = exception_context.connection
+        if conn is None or exception_context.execution_context is None:
+            return
+        starts = conn.info.get("query_start_time")
+        if starts:
+            starts.pop()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+        if elapsed_ms < self.threshold_ms:
+            return
+
+        key = fingerprint(statement)
+        digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+        with self._lock:
+            stats = self.fingerprints.get(digest)
+            if stats is None:
+                stats = self.fingerprints[digest] = {
+                    "fingerprint": key,
+                    "count": 0,
+                    "durations_ms": deque(maxlen=self.samples),
+                    "plan": None,
+                    "analysis": None,
+                }
+            stats["count"] += 1
+            stats["durations_ms"].append(elapsed_ms)
+            needs_plan = stats["plan"] is None
+
+        if needs_plan and self.explain and not executemany:
+            plan = self._explain(conn, statement, parameters)
+            if plan is not None:
+                with self._lock:
+                    stats["plan"] = plan
+                    stats["analysis"] = analyze_plan(plan, statement)
+
+        entry = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "fingerprint_id": digest,
+            "statement": statement,
+            "duration_ms": round(elapsed_ms, 2),
+            "executemany": executemany,
+            "plan": stats["plan"],
+            "analysis": stats["analysis"],
+        }
+        with self._lock:
+            self.entries.append(entry)
+        app_logger.warning(f"Slow query ({entry['duration_ms']} ms): {key[:200]}", extra={"slow_query": entry})
+
+    def _explain(self, conn, statement: str, parameters) -> Optional[List[str]]:
+        if conn.dialect.name != "sqlite" or not statement.lstrip().upper().startswith(_EXPLAINABLE):
+            return None
+        # Straight on the DBAPI connection so the EXPLAIN does not re-enter these hooks
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+            return [row[3] for row in cursor.fetchall()]
+        except Exception:
+            return None
+        finally:
+            cursor.close()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-fingerprint count, p50, p95 and max, slowest total time first"""
+        with self._lock:
+            items = [(digest, dict(stats), sorted(stats["durations_ms"])) for digest, stats in self.fingerprints.items()]
+        result = []
+        for digest, stats, durations in items:
+            result.append({
+                "fingerprint_id": digest,
+                "fingerprint": stats["fingerprint"],
+                "count": stats["count"],
+                "p50_ms": round(percentile(durations, 50), 2),
+                "p95_ms": round(percentile(durations, 95), 2),
+                "max_ms": round(durations[-1], 2) if durations else 0.0,
+                "plan": stats["plan"],
+                "analysis": stats["analysis"],
+            })
+        result.sort(key=lambda s: s["p50_ms"] * s["count"], reverse=True)
+        return result
+
+    def recent(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(reversed(self.entries))
+
+    def reset(self):
+        with self._lock:
+            self.entries.clear()
+            self.fingerprints.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    size=settings.SLOW_QUERY_LOG_SIZE,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+)
+register_cache("slow_query_log.entries", lambda: len(slow_query_log.entries))
+register_cache("slow_query_log.fingerprints", lambda: len(slow_query_log.fingerprints))
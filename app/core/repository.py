@@ -1,38 +1,217 @@
-from typing import Any, Generic, List, Optional, Type, TypeVar, Union
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import Any, Callable, Generic, List, Optional, Sequence, Type, TypeVar, Union
+from fastapi import HTTPException
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.tracing import traced
 from app.db.base import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+
+LoaderOptions = Union[Sequence[Any], Callable[[], Sequence[Any]]]
+
+
+def resolve_options(options: LoaderOptions) -> list:
+    """
+    Loader options given as a function are built on first use and the result kept.
+    Building `joinedload(...)` / `.load_only(...)` configures the mappers, which fails
+    at import time while models referenced by string are not registered yet.
+    """
+    return list(options()) if callable(options) else options
+
+
+@dataclass
+class Page(Generic[ModelType]):
+    """One page of a keyset-paginated list"""
+    items: List[ModelType]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+def _keyset_columns(model, sort_column=None) -> list:
+    # `id` is always the tie-breaker so the ordering is total even when the sort column is not unique
+    if sort_column is None or sort_column.key == model.id.key:
+        return [model.id]
+    return [sort_column, model.id]
+
+
+def encode_cursor(item: Any, columns: list) -> str:
+    values = jsonable_encoder([getattr(item, column.key) for column in columns])
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, columns: list) -> list:
+    """Turn an opaque cursor back into the typed key values it was built from"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        decoded = []
+        for column, value in zip(columns, values):
+            python_type = column.type.python_type
+            if python_type in (date, datetime, time):
+                decoded.append(python_type.fromisoformat(value))
+            else:
+                decoded.append(python_type(value))
+        return decoded
+    except (ValueError, TypeError, NotImplementedError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_keyset(
+    query, model, *, cursor: Optional[str] = None, sort_column=None, descending: bool = False
+):
+    """
+    Order `query` by (sort column, id) and, when a cursor is given, start right after it.
+    Works on both a legacy `Query` and a `select()`. The sort column should be NOT NULL.
+    """
+    columns = _keyset_columns(model, sort_column)
+    if cursor:
+        key = tuple_(*columns) if len(columns) > 1 else columns[0]
+        values = decode_cursor(cursor, columns)
+        bound = tuple_(*values) if len(values) > 1 else values[0]
+        query = query.filter(key < bound if descending else key > bound)
+    return query.order_by(*[column.desc() if descending else column.asc() for column in columns])
+
+
+def _build_page(rows: list, columns: list, limit: Optional[int], total: Optional[int]) -> Page:
+    # one extra row is fetched to know whether another page exists without counting
+    if limit is None:
+        return Page(items=list(rows), total=total)
+    items = list(rows[:limit])
+    next_cursor = encode_cursor(items[-1], columns) if len(rows) > limit else None
+    return Page(items=items, next_cursor=next_cursor, total=total)
+
+
+def paginate(
+    query,
+    model,
+    *,
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+    sort_column=None,
+    descending: bool = False,
+    with_total: bool = False
+) -> Page:
+    """
+    Keyset-paginate a legacy `Query` over `model`.
+    Every page is a range scan on the key, so deep pages cost the same as the first.
+    `limit=None` returns every row after the cursor as a single page.
+    `with_total` adds a `COUNT(*)` over the filtered rows (no eager loads, no ordering).
+    """
+    total = query.enable_eagerloads(False).order_by(None).count() if with_total else None
+    query = apply_keyset(query, model, cursor=cursor, sort_column=sort_column, descending=descending)
+    rows = (query if limit is None else query.limit(limit + 1)).all()
+    return _build_page(rows, _keyset_columns(model, sort_column), limit, total)
+
+
+async def paginate_async(
+    db: AsyncSession,
+    stmt,
+    model,
+    *,
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+    sort_column=None,
+    descending: bool = False,
+    with_total: bool = False
+) -> Page:
+    """`paginate` for a `select()` run on an AsyncSession"""
+    total = None
+    if with_total:
+        count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+        total = (await db.execute(count_stmt)).scalar_one()
+    stmt = apply_keyset(stmt, model, cursor=cursor, sort_column=sort_column, descending=descending)
+    result = await db.execute(stmt if limit is None else stmt.limit(limit + 1))
+    rows = result.unique().scalars().all()
+    return _build_page(rows, _keyset_columns(model, sort_column), limit, total)
+
+
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
-    def __init__(self, model: Type[ModelType]):
+    def __init__(
+        self, model: Type[ModelType], *, options: LoaderOptions = (), natural_key: Sequence[str] = ()
+    ):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
         **Parameters**
         * `model`: A SQLAlchemy model class
+        * `options`: Loader options applied to every read (e.g. joinedloads the response schema needs),
+          or a function returning them - see `resolve_options`
+        * `natural_key`: Columns identifying a row for `upsert_many` (e.g. `("party_name",)`)
         """
         self.model = model
+        self._options = options if callable(options) else list(options)
+        self.natural_key = tuple(natural_key)
+
+    @property
+    def options(self) -> list:
+        self._options = resolve_options(self._options)
+        return self._options
+
+    def _query(self, db: Session):
+        return db.query(self.model).options(*self.options)
 
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        return db.query(self.model).filter(self.model.id == id).first()
+        return self._query(db).filter(self.model.id == id).first()
+
+    def reload(self, db: Session, id: Any) -> ModelType:
+        """Re-read a row with `options` after a write, so it still serializes once the session is gone"""
+        # populate_existing so relationships are re-read, not served from the identity map
+        return self._query(db).populate_existing().filter(self.model.id == id).one()
 
     def get_multi(
         self, db: Session, *, skip: int = 0, limit: int = 100
     ) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return self._query(db).offset(skip).limit(limit).all()
 
-    def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
-        obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)
+    @traced()
+    def get_page(
+        self,
+        db: Session,
+        *,
+        limit: Optional[int],
+        cursor: Optional[str] = None,
+        filters: Sequence[Any] = (),
+        sort_column=None,
+        descending: bool = False,
+        with_total: bool = False
+    ) -> Page[ModelType]:
+        """Keyset page ordered by (`sort_column`, id); defaults to id order"""
+        return paginate(
+            self._query(db).filter(*filters), self.model,
+            limit=limit, cursor=cursor, sort_column=sort_column,
+            descending=descending, with_total=with_total
+        )
+
+    @traced()
+    def save(self, db: Session, db_obj: ModelType) -> ModelType:
+        """
+        Add and commit `db_obj` without a follow-up refresh. Server-generated columns come back
+        through INSERT/UPDATE ... RETURNING (`eager_defaults` on Base) and the session does not
+        expire on commit, so the object can be serialized straight away.
+        """
         db.add(db_obj)
         db.commit()
-        db.refresh(db_obj)
         return db_obj
 
+    @traced()
+    def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = self.model(**obj_in_data)
+        return self.save(db, db_obj)
+
+    @traced()
     def update(
         self,
         db: Session,
@@ -48,13 +227,245 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         for field in obj_data:
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return self.save(db, db_obj)
 
+    @traced()
     def delete(self, db: Session, *, id: int) -> ModelType:
         obj = db.query(self.model).get(id)
         db.delete(obj)
         db.commit()
         return obj
+
+    @staticmethod
+    def _rows(
+        objs_in: Sequence[Union[CreateSchemaType, UpdateSchemaType, dict[str, Any]]], exclude_unset: bool = False
+    ) -> List[dict]:
+        return [dict(obj) if isinstance(obj, dict) else obj.model_dump(exclude_unset=exclude_unset) for obj in objs_in]
+
+    def _insert_returning_ids(self, db: Session, rows: List[dict]) -> List[int]:
+        """
+        Insert `rows` and return their ids in input order in two statements.
+        SQLite has no insertmanyvalues sentinel, so `RETURNING ... sort_by_parameter_order`
+        degrades to one INSERT per row there. Instead, the first row is inserted alone, which
+        takes the write lock and yields max(id) + 1; the rest get consecutive explicit ids
+        and go in as a single executemany while no other writer can interleave.
+        """
+        if db.get_bind().dialect.name != "sqlite":
+            stmt = insert(self.model).returning(self.model.id, sort_by_parameter_order=True)
+            return list(db.scalars(stmt, rows).all())
+        first_id = db.scalar(insert(self.model).returning(self.model.id), rows[0])
+        ids = [first_id + offset for offset in range(len(rows))]
+        if len(rows) > 1:
+            db.execute(insert(self.model), [{**row, "id": id} for row, id in zip(rows[1:], ids[1:])])
+        return ids
+
+    @traced()
+    def bulk_create(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, dict[str, Any]]],
+        return_ids: bool = False
+    ) -> Optional[List[int]]:
+        """
+        Insert all rows with one executemany in a single transaction (one commit, no refreshes).
+        With `return_ids` the generated ids are returned in input order.
+        """
+        rows = self._rows(objs_in)
+        if not rows:
+            return [] if return_ids else None
+        ids = None
+        if return_ids:
+            ids = self._insert_returning_ids(db, rows)
+        else:
+            db.execute(insert(self.model), rows)
+        db.commit()
+        return ids
+
+    @traced()
+    def bulk_update(self, db: Session, *, objs_in: Sequence[dict[str, Any]]) -> int:
+        """Update rows by primary key; every dict must carry its `id`. One executemany, one commit."""
+        rows = self._rows(objs_in)
+        if any(row.get("id") is None for row in rows):
+            raise ValueError("bulk_update needs an `id` in every row")
+        if rows:
+            db.execute(update(self.model), rows)
+            db.commit()
+        return len(rows)
+
+    def _upsert_statement(self, db: Session, columns: Sequence[str], key: Sequence[str]):
+        """`INSERT ... ON CONFLICT (<natural key>) DO UPDATE ... RETURNING`, or None where the dialect has no such clause"""
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            stmt = sqlite_insert(self.model)
+        elif dialect == "postgresql":
+            stmt = postgresql_insert(self.model)
+        else:
+            return None
+        # a row carrying only its key still updates that key to itself, so RETURNING gives its id
+        set_ = {name: stmt.excluded[name] for name in columns if name not in key} or {key[0]: stmt.excluded[key[0]]}
+        # ON CONFLICT DO UPDATE skips column `onupdate` defaults (e.g. time_stamp), add them back
+        for column in self.model.__table__.columns:
+            if column.onupdate is not None and column.onupdate.is_clause_element and column.name not in set_:
+                set_[column.name] = column.onupdate.arg
+        key_columns = [getattr(self.model, name) for name in key]
+        return stmt.on_conflict_do_update(index_elements=key_columns, set_=set_).returning(self.model.id, *key_columns)
+
+    def _upsert_rows(self, db: Session, rows: List[dict], key: Sequence[str]) -> dict:
+        """Row-at-a-time fallback for dialects without ON CONFLICT; the UNIQUE index still rejects a racing duplicate"""
+        ids = {}
+        for row in rows:
+            natural = tuple(row[name] for name in key)
+            filters = [getattr(self.model, name) == value for name, value in zip(key, natural)]
+            id = db.scalar(select(self.model.id).filter(*filters))
+            if id is None:
+                id = db.scalar(insert(self.model).returning(self.model.id), row)
+            else:
+                db.execute(update(self.model).filter(self.model.id == id), row)
+            ids[natural] = id
+        return ids
+
+    @traced()
+    def upsert_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, dict[str, Any]]],
+        key: Optional[Sequence[str]] = None
+    ) -> List[int]:
+        """
+        Insert-or-update rows matched on a natural key (defaults to `self.natural_key`) and
+        return one id per distinct key, in first-seen order (later rows win when a key repeats).
+        The key must have a UNIQUE index: rows go through `INSERT ... ON CONFLICT(<key>)
+        DO UPDATE ... RETURNING` executemany (one per distinct set of columns), so two
+        concurrent upserts of the same new key update one row rather than insert two.
+        Only the fields a row supplies are written; unset schema fields keep their stored
+        value (or the column default for a new row).
+        """
+        key = tuple(key or self.natural_key)
+        if not key:
+            raise ValueError(f"No natural key configured for {self.model.__name__}")
+        by_key = {}
+        for row in self._rows(objs_in, exclude_unset=True):
+            row.pop("id", None)
+            missing = [name for name in key if name not in row]
+            if missing:
+                raise ValueError(f"upsert_many needs the natural key {missing} in every row")
+            by_key[tuple(row[name] for name in key)] = row
+        if not by_key:
+            return []
+
+        # executemany needs the same columns in every row: one statement per column set
+        groups = {}
+        for row in by_key.values():
+            groups.setdefault(tuple(row), []).append(row)
+        ids = {}
+        for columns, rows in groups.items():
+            stmt = self._upsert_statement(db, columns, key)
+            if stmt is None:
+                ids.update(self._upsert_rows(db, rows, key))
+                continue
+            # matched back by key: RETURNING order is not guaranteed to follow the parameters
+            for id, *natural in db.execute(stmt, rows):
+                ids[tuple(natural)] = id
+        db.commit()
+        return [ids[natural] for natural in by_key]
+
+
+class AsyncBaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, model: Type[ModelType], *, options: LoaderOptions = ()):
+        """
+        Async counterpart of `BaseRepository` for use with `get_async_db`.
+        **Parameters**
+        * `model`: A SQLAlchemy model class
+        * `options`: Loader options applied to every read, or a function returning
+          them (see `resolve_options`). Lazy loads are not possible on an AsyncSession,
+          so anything the response schema touches (e.g. the `user_login` hybrid) must
+          be eager loaded here.
+        """
+        self.model = model
+        self._options = options if callable(options) else list(options)
+
+    @property
+    def options(self) -> list:
+        self._options = resolve_options(self._options)
+        return self._options
+
+    def _select(self):
+        return select(self.model).options(*self.options)
+
+    async def _reload(self, db: AsyncSession, id: Any) -> ModelType:
+        # populate_existing so relationships are re-read after a write, not served from the identity map
+        stmt = self._select().filter(self.model.id == id).execution_options(populate_existing=True)
+        result = await db.execute(stmt)
+        return result.unique().scalars().one()
+
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        result = await db.execute(self._select().filter(self.model.id == id))
+        return result.unique().scalars().first()
+
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        result = await db.execute(self._select().offset(skip).limit(limit))
+        return result.unique().scalars().all()
+
+    @traced()
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        limit: Optional[int],
+        cursor: Optional[str] = None,
+        filters: Sequence[Any] = (),
+        sort_column=None,
+        descending: bool = False,
+        with_total: bool = False
+    ) -> Page[ModelType]:
+        return await paginate_async(
+            db, self._select().filter(*filters), self.model,
+            limit=limit, cursor=cursor, sort_column=sort_column,
+            descending=descending, with_total=with_total
+        )
+
+    def search_filter(self, *, field: str, term: str):
+        return getattr(self.model, field).ilike(f"%{term}%")
+
+    async def search(self, db: AsyncSession, *, field: str, term: str) -> List[ModelType]:
+        """Case-insensitive `LIKE %term%` match on a single column"""
+        result = await db.execute(self._select().filter(self.search_filter(field=field, term=term)))
+        return result.unique().scalars().all()
+
+    @traced()
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        obj_in_data = jsonable_encoder(obj_in)
+        db_obj = self.model(**obj_in_data)
+        db.add(db_obj)
+        await db.commit()
+        return await self._reload(db, db_obj.id)
+
+    @traced()
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, dict[str, Any]]
+    ) -> ModelType:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        for field in update_data:
+            if hasattr(db_obj, field):
+                setattr(db_obj, field, update_data[field])
+        db.add(db_obj)
+        await db.commit()
+        return await self._reload(db, db_obj.id)
+
+    @traced()
+    async def delete(self, db: AsyncSession, *, id: int) -> ModelType:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        return obj
@@ -0,0 +1,216 @@
+"""
+Revoked access tokens, shared by every worker process on the host and kept across
+restarts in a small SQLite file (TOKEN_REVOCATION_PATH). Tokens are stored by their
+SHA-256 digest and only until they would have expired anyway.
+
+Each process mirrors the table into a Bloom filter, so checking a token that was
+never revoked - nearly every request - touches no database: a few bit tests in
+memory. Only a filter hit is confirmed against the table. A background thread
+picks up revocations made by other workers every TOKEN_REVOCATION_SYNC_SECONDS, and
+purges expired entries and rebuilds the filter every TOKEN_REVOCATION_REBUILD_SECONDS,
+so requests never wait on the file's write lock.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.core.memory import register_cache
+
+
+class BloomFilter:
+    """Three bit positions per item, taken from separate 32-bit slices of its (uniform) SHA-256 digest"""
+    __slots__ = ("bits", "mask")
+
+    def __init__(self, size_bits: int):
+        # A power of two, so a position is a mask rather than a modulo
+        size_bits = 1 << max(3, (size_bits - 1).bit_length())
+        self.bits = bytearray(size_bits >> 3)
+        self.mask = size_bits - 1
+
+    def add(self, digest: bytes):
+        n = int.from_bytes(digest[:12], "little")
+        for shift in (0, 32, 64):
+            position = (n >> shift) & self.mask
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest: bytes) -> bool:
+        # Unrolled: on the request path, and a token never revoked usually fails the first test
+        bits, mask = self.bits, self.mask
+        n = int.from_bytes(digest[:12], "little")
+        position = n & mask
+        if not bits[position >> 3] >> (position & 7) & 1:
+            return False
+        position = n >> 32 & mask
+        if not bits[position >> 3] >> (position & 7) & 1:
+            return False
+        position = n >> 64 & mask
+        return bool(bits[position >> 3] >> (position & 7) & 1)
+
+
+class RevocationStore:
+    def __init__(self, path: str, *, bloom_bits: int, sync_seconds: float, rebuild_seconds: float,
+                 recent_size: int = 1024):
+        self.path = path
+        self.bloom_bits = bloom_bits
+        self.sync_seconds = sync_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self.recent_size = recent_size
+        self._bloom = BloomFilter(bloom_bits)
+        # Confirmed revocations (digest -> expires_at), so a revoked token being replayed skips the table too
+        self._recent: "OrderedDict[bytes, float]" = OrderedDict()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._last_id = 0
+        self._next_rebuild = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        # Set by stop(): a request arriving during shutdown must not start the thread again
+        self._stopped = False
+
+    def start(self):
+        """Load the table into the filter, then keep it in sync on a background thread"""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped = False
+            # The first sync is a rebuild: the filter is complete before any request is checked
+            self._sync()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._worker, name="token-revocation-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        with self._start_lock:
+            self._stopped = True
+            if self._thread is None:
+                return
+            self._stop.set()
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _worker(self):
+        while not self._stop.wait(self.sync_seconds):
+            self._sync()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=settings.SQLITE_BUSY_TIMEOUT_MS / 1000, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # AUTOINCREMENT: ids are never reused after a purge, so "id > last seen" finds every new row
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS revoked_tokens ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, digest BLOB NOT NULL UNIQUE, expires_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def revoke(self, digest: bytes, expires_at: float):
+        """Record a revocation for every worker; it is dropped once the token has expired"""
+        try:
+            self._connection().execute(
+                "INSERT INTO revoked_tokens (digest, expires_at) VALUES (?, ?) "
+                "ON CONFLICT (digest) DO UPDATE SET expires_at = max(expires_at, excluded.expires_at)",
+                (digest, expires_at),
+            )
+        except sqlite3.Error as exc:
+            app_logger.error(f"Could not record token revocation: {exc}")
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Could not revoke token")
+        with self._lock:
+            self._bloom.add(digest)
+            self._remember(digest, expires_at)
+
+    def is_revoked(self, digest: bytes) -> bool:
+        if self._thread is None and not self._stopped:
+            # Scripts and benchmarks that never called start()
+            self.start()
+        if digest not in self._bloom:
+            return False
+        expires_at = self._recent.get(digest)
+        if expires_at is None:
+            # A filter hit: revoked, or a false positive. A read, which WAL never makes wait for the writer
+            try:
+                row = self._connection().execute(
+                    "SELECT expires_at FROM revoked_tokens WHERE digest = ?", (digest,)).fetchone()
+            except sqlite3.Error as exc:
+                app_logger.error(f"Could not check token revocation, refusing the token: {exc}")
+                return True
+            if row is None:
+                return False
+            expires_at = row[0]
+            with self._lock:
+                self._remember(digest, expires_at)
+        return expires_at > time.time()
+
+    def _remember(self, digest: bytes, expires_at: float):
+        self._recent[digest] = expires_at
+        self._recent.move_to_end(digest)
+        while len(self._recent) > self.recent_size:
+            self._recent.popitem(last=False)
+
+    def _sync(self):
+        """Add revocations other workers made since the last sync; periodically purge and rebuild"""
+        # Whoever holds the lock is already syncing; the others go on with the current filter
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            conn = self._connection()
+            if time.monotonic() >= self._next_rebuild:
+                self._rebuild(conn)
+                return
+            rows = conn.execute("SELECT id, digest FROM revoked_tokens WHERE id > ? ORDER BY id",
+                                (self._last_id,)).fetchall()
+            with self._lock:
+                for row_id, digest in rows:
+                    self._bloom.add(digest)
+                    self._last_id = row_id
+        except sqlite3.Error as exc:
+            app_logger.warning(f"Could not sync token revocations: {exc}")
+        finally:
+            self._sync_lock.release()
+
+    def _rebuild(self, conn: sqlite3.Connection):
+        now = time.time()
+        conn.execute("DELETE FROM revoked_tokens WHERE expires_at <= ?", (now,))
+        bloom = BloomFilter(self.bloom_bits)
+        last_id = 0
+        for row_id, digest in conn.execute("SELECT id, digest FROM revoked_tokens ORDER BY id"):
+            bloom.add(digest)
+            last_id = row_id
+        with self._lock:
+            for digest, expires_at in list(self._recent.items()):
+                if expires_at <= now:
+                    del self._recent[digest]
+                else:
+                    # Covers revocations this process made after the SELECT above
+                    bloom.add(digest)
+            # Swapped in whole, so readers never see a half-built filter
+            self._bloom = bloom
+            self._last_id = max(self._last_id, last_id)
+        self._next_rebuild = time.monotonic() + self.rebuild_seconds
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+
+revocation_store = RevocationStore(
+    settings.TOKEN_REVOCATION_PATH,
+    bloom_bits=settings.TOKEN_REVOCATION_BLOOM_BITS,
+    sync_seconds=settings.TOKEN_REVOCATION_SYNC_SECONDS,
+    rebuild_seconds=settings.TOKEN_REVOCATION_REBUILD_SECONDS,
+)
+register_cache("token_revocations.recent", lambda: len(revocation_store))
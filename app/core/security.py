@@ -1,26 +1,30 @@
 from datetime import datetime, timedelta
-from typing import Union, Optional
+from typing import Union
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.auth_cache import Principal, auth_cache, token_digest
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.passwords import password_hasher
+from app.core.revocation import revocation_store
+from app.db.session import get_db, get_async_db
 from app.modules.users.models import User
 import secrets
 
 security = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-# Token blacklist (use Redis in production)
-token_blacklist = set()
+# How long after expiry /auth/refresh_token still accepts a token
+REFRESH_GRACE = timedelta(minutes=15)
+
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify(plain_password, hashed_password)
 
 def hash_password(password):
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
 def authenticate_user(db: Session, user_login_id: str, password: str):
     user = db.query(User).filter(User.user_login_id == user_login_id).first()
@@ -52,12 +56,18 @@ def create_refresh_token(data: dict, expires_delta: Union[timedelta, None] = Non
     return encoded_jwt
 
 def blacklist_token(token: str):
-    """Add token to blacklist"""
-    token_blacklist.add(token)
+    """Revoke the token in every worker until it can no longer be used, refresh grace included"""
+    try:
+        expires_at = float(jwt.get_unverified_claims(token)["exp"]) + REFRESH_GRACE.total_seconds()
+    except (JWTError, KeyError, TypeError, ValueError):
+        # No usable exp: keep it for as long as any token we issue can live
+        expires_at = (datetime.utcnow() + timedelta(days=7)).timestamp()
+    revocation_store.revoke(token_digest(token), expires_at)
+    auth_cache.invalidate_token(token)
 
 def is_token_blacklisted(token: str) -> bool:
     """Check if token is blacklisted"""
-    return token in token_blacklist
+    return revocation_store.is_revoked(token_digest(token))
 
 def validate_password_strength(password: str) -> bool:
     """
@@ -84,33 +94,81 @@ def generate_csrf_token() -> str:
     """Generate CSRF token"""
     return secrets.token_urlsafe(32)
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> dict:
-    token = credentials.credentials
-    
-    # Check if token is blacklisted
-    if is_token_blacklisted(token):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has been revoked"
-        )
-    
+def _verify_access_token(token: str) -> dict:
+    """Signature, expiry and payload only - callers check revocation first"""
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_login_id: str = payload.get("sub")
-        user_role: str = payload.get("role")
-        if user_login_id is None or user_role is None:
+        if payload.get("sub") is None or payload.get("role") is None:
             raise HTTPException(status_code=401, detail="Invalid token payload")
     except JWTError:
         raise HTTPException(status_code=401, detail="Token verification failed")
 
-    user = db.query(User).filter(User.user_login_id == user_login_id).first()
+    return payload
+
+def _decode_access_token(token: str):
+    if is_token_blacklisted(token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked"
+        )
+    payload = _verify_access_token(token)
+    return payload["sub"], payload["role"]
+
+def _cached_user(token: str):
+    """The token's digest and, when it was verified recently, the current user without a JWT check or SELECT"""
+    digest = token_digest(token)
+    if revocation_store.is_revoked(digest):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+    cached = auth_cache.get(digest)
+    if cached is None:
+        return digest, None
+    user_role, principal = cached
+    return digest, {"user": principal, "role": user_role}
+
+def _remember_user(digest: bytes, payload: dict, user: User, generation: int) -> dict:
+    principal = Principal.from_user(user)
+    auth_cache.put(digest, payload.get("exp") or float("inf"), payload["role"], principal, generation)
+    return {"user": principal, "role": payload["role"]}
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> dict:
+    digest, current_user = _cached_user(credentials.credentials)
+    if current_user is not None:
+        return current_user
+
+    # Read first, so an invalidation racing with the lookup below keeps a stale user out of the cache
+    generation = auth_cache.generation
+    payload = _verify_access_token(credentials.credentials)
+
+    user = db.query(User).filter(User.user_login_id == payload["sub"]).first()
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
 
-    return {
-        "user": user,
-        "role": user_role,
-    }
+    return _remember_user(digest, payload, user, generation)
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> dict:
+    """Same as `get_current_user`, for `async def` endpoints so auth does not need a worker thread"""
+    digest, current_user = _cached_user(credentials.credentials)
+    if current_user is not None:
+        return current_user
+
+    generation = auth_cache.generation
+    payload = _verify_access_token(credentials.credentials)
+
+    result = await db.execute(select(User).filter(User.user_login_id == payload["sub"]))
+    user = result.scalars().first()
+    if user is None:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    return _remember_user(digest, payload, user, generation)
+
+def require_superadmin(current_user: dict = Depends(get_current_user)) -> dict:
+    """Restrict an endpoint to the superadmin role"""
+    if current_user["role"] != "superadmin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Superadmin access required")
+    return current_user
@@ -1,6 +1,7 @@
-from typing import Any, Generic, List, Optional, TypeVar
+from typing import Any, Generic, List, Optional, Sequence, TypeVar, Union
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.repository import BaseRepository, ModelType, CreateSchemaType, UpdateSchemaType
+from app.core.repository import AsyncBaseRepository, BaseRepository, ModelType, CreateSchemaType, UpdateSchemaType, Page
 
 RepositoryType = TypeVar("RepositoryType", bound=BaseRepository)
 
@@ -14,6 +15,11 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
         return self.repository.get_multi(db, skip=skip, limit=limit)
 
+    def get_page(
+        self, db: Session, *, limit: Optional[int], cursor: Optional[str] = None, with_total: bool = False
+    ) -> Page[ModelType]:
+        return self.repository.get_page(db, limit=limit, cursor=cursor, with_total=with_total)
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         return self.repository.create(db, obj_in=obj_in)
 
@@ -22,3 +28,59 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
     def delete(self, db: Session, *, id: int) -> ModelType:
         return self.repository.delete(db, id=id)
+
+    def bulk_create(
+        self, db: Session, *, objs_in: Sequence[Union[CreateSchemaType, dict[str, Any]]], return_ids: bool = False
+    ) -> Optional[List[int]]:
+        return self.repository.bulk_create(db, objs_in=objs_in, return_ids=return_ids)
+
+    def bulk_update(self, db: Session, *, objs_in: Sequence[dict[str, Any]]) -> int:
+        return self.repository.bulk_update(db, objs_in=objs_in)
+
+    def upsert_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, dict[str, Any]]],
+        key: Optional[Sequence[str]] = None
+    ) -> List[int]:
+        return self.repository.upsert_many(db, objs_in=objs_in, key=key)
+
+
+class AsyncBaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, repository: AsyncBaseRepository[ModelType, CreateSchemaType, UpdateSchemaType]):
+        self.repository = repository
+
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await self.repository.get(db, id)
+
+    async def get_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        return await self.repository.get_multi(db, skip=skip, limit=limit)
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        limit: Optional[int],
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        field: Optional[str] = None,
+        term: Optional[str] = None
+    ) -> Page[ModelType]:
+        """Keyset page, optionally narrowed to a `search` match on `field`"""
+        filters = [self.repository.search_filter(field=field, term=term)] if field and term else []
+        return await self.repository.get_page(
+            db, limit=limit, cursor=cursor, filters=filters, with_total=with_total
+        )
+
+    async def search(self, db: AsyncSession, *, field: str, term: str) -> List[ModelType]:
+        return await self.repository.search(db, field=field, term=term)
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        return await self.repository.create(db, obj_in=obj_in)
+
+    async def update(self, db: AsyncSession, *, db_obj: ModelType, obj_in: UpdateSchemaType) -> ModelType:
+        return await self.repository.update(db, db_obj=db_obj, obj_in=obj_in)
+
+    async def delete(self, db: AsyncSession, *, id: int) -> ModelType:
+        return await self.repository.delete(db, id=id)
@@ -0,0 +1,161 @@
+"""
+Per-request timing breakdown (database, dependencies, handler, serialization),
+sent back as a `Server-Timing` header so browser devtools show where a slow call spent its time.
+"""
+import asyncio
+import functools
+import time
+from contextvars import ContextVar, Token
+from typing import List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.logger import app_logger
+
+
+class RequestTimings:
+    """Mutable accumulator shared (by reference) with the worker threads the request runs on"""
+    __slots__ = ("started", "db", "queries", "lazy_loads", "handler", "handler_started", "handler_ended")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db = 0.0
+        self.queries = 0
+        self.lazy_loads: List[str] = []
+        self.handler = 0.0
+        self.handler_started: Optional[float] = None
+        self.handler_ended: Optional[float] = None
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current_timings.get()
+
+
+def track_request() -> Tuple[RequestTimings, Optional[Token]]:
+    """
+    The timings of the current request, created if no outer middleware did so yet.
+    Pass the token to `untrack_request` when done (it is None for the non-owner).
+    """
+    timings = _current_timings.get()
+    if timings is not None:
+        return timings, None
+    timings = RequestTimings()
+    return timings, _current_timings.set(timings)
+
+
+def untrack_request(token: Optional[Token]):
+    if token is not None:
+        _current_timings.reset(token)
+
+
+def instrument_engine(engine):
+    """Add statement time and count on `engine` to the current request (for async engines, pass `sync_engine`)"""
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and _current_timings.get() is not None:
+            context._request_query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+        timings = _current_timings.get()
+        started = getattr(context, "_request_query_started", None)
+        if timings is not None and started is not None:
+            timings.db += time.perf_counter() - started
+            timings.queries += 1
+
+
+def _timed_endpoint(call):
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def timed(*args, **kwargs):
+            timings = _current_timings.get()
+            if timings is None:
+                return await call(*args, **kwargs)
+            timings.handler_started = time.perf_counter()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                timings.handler_ended = time.perf_counter()
+                timings.handler += timings.handler_ended - timings.handler_started
+    else:
+        @functools.wraps(call)
+        def timed(*args, **kwargs):
+            timings = _current_timings.get()
+            if timings is None:
+                return call(*args, **kwargs)
+            timings.handler_started = time.perf_counter()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                timings.handler_ended = time.perf_counter()
+                timings.handler += timings.handler_ended - timings.handler_started
+    return timed
+
+
+def instrument_routes(app):
+    """
+    Time the endpoint functions of every route already on `app`, so handler time can be told
+    apart from dependencies before it and response validation/encoding after it. Call once,
+    after all routers are included.
+    """
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.dependant.call is not None:
+            route.dependant.call = _timed_endpoint(route.dependant.call)
+
+
+def server_timing_header(timings: RequestTimings, response_started: float) -> str:
+    total = response_started - timings.started
+    queries = f"{timings.queries} {'query' if timings.queries == 1 else 'queries'}"
+    if timings.lazy_loads:
+        queries += f", {len(timings.lazy_loads)} lazy"
+    metrics = [f'db;dur={timings.db * 1000:.2f};desc="{queries}"']
+    if timings.handler_started is not None:
+        metrics.append(f"deps;dur={(timings.handler_started - timings.started) * 1000:.2f}")
+        metrics.append(f"handler;dur={timings.handler * 1000:.2f}")
+        metrics.append(f"serialize;dur={(response_started - timings.handler_ended) * 1000:.2f}")
+    metrics.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(metrics)
+
+
+class ServerTimingMiddleware:
+    """
+    Adds `Server-Timing: db, deps, handler, serialize, total` to every HTTP response.
+    `db` overlaps the others (it is the SQL part of them); requests slower than
+    SERVER_TIMING_LOG_THRESHOLD_MS are also logged with the same breakdown.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings, token = track_request()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response_started = time.perf_counter()
+                header = server_timing_header(timings, response_started)
+                message = {**message, "headers": [
+                    *message.get("headers", []),
+                    (b"server-timing", header.encode("latin-1")),
+                    (b"timing-allow-origin", b"*"),
+                ]}
+                threshold = settings.SERVER_TIMING_LOG_THRESHOLD_MS
+                if threshold and (response_started - timings.started) * 1000 >= threshold:
+                    app_logger.warning(
+                        f"Slow request {scope['method']} {scope['path']}: {header}",
+                        extra={"server_timing": header, "method": scope["method"], "path": scope["path"]},
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            untrack_request(token)
@@ -0,0 +1,322 @@
+"""
+Minimal in-process tracing. The current span travels in a context variable (so it
+follows requests into threadpool workers and the write queue); `@traced` and `span()`
+add child spans, engine events add one span per SQL statement, and finished traces
+are written as OTLP/JSON lines (one ExportTraceServiceRequest per trace) to
+TRACING_EXPORT_PATH for offline inspection - no collector needed.
+
+Only a TRACING_SAMPLE_RATE fraction of requests is traced (or those arriving with a
+sampled W3C `traceparent`); everywhere else a traced call costs one context lookup.
+"""
+import asyncio
+import functools
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.logger import BatchedRotatingFileHandler, attach_queue_listener
+
+# OTLP span kinds and status codes
+KIND_INTERNAL, KIND_SERVER, KIND_CLIENT = 1, 2, 3
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class _Trace:
+    """Spans of one trace; they may finish on different threads"""
+    __slots__ = ("trace_id", "spans", "lock")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List["Span"] = []
+        self.lock = threading.Lock()
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes",
+                 "status", "status_message")
+
+    def __init__(self, trace: _Trace, name: str, kind: int = KIND_INTERNAL, parent_id: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes or {}
+        self.status = STATUS_UNSET
+        self.status_message = ""
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_error(self, exc: BaseException):
+        self.status = STATUS_ERROR
+        self.status_message = f"{type(exc).__name__}: {exc}"[:500]
+
+    def end(self):
+        self.end_ns = time.time_ns()
+        with self.trace.lock:
+            self.trace.spans.append(self)
+
+    def child(self, name: str, kind: int = KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None) -> "Span":
+        return Span(self.trace, name, kind, self.span_id, attributes)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Child span of the current one; yields None (and records nothing) outside a sampled trace"""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = parent.child(name, kind, attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.record_error(exc)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+@contextmanager
+def start_trace(name: str, kind: int = KIND_SERVER, traceparent: Optional[str] = None,
+                **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Root span of a new trace, exported when it ends. Sampled at TRACING_SAMPLE_RATE
+    unless `traceparent` carries a sampling decision, whose trace it then continues.
+    """
+    trace_id = parent_id = None
+    match = _TRACEPARENT.match(traceparent or "")
+    if match:
+        trace_id, parent_id, flags = match.groups()
+        sampled = bool(int(flags, 16) & 1)
+    else:
+        sampled = random.random() < settings.TRACING_SAMPLE_RATE
+    if not sampled:
+        yield None
+        return
+
+    root = Span(_Trace(trace_id or os.urandom(16).hex()), name, kind, parent_id, attributes)
+    token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException as exc:
+        root.record_error(exc)
+        raise
+    finally:
+        _current_span.reset(token)
+        root.end()
+        exporter.export(root.trace)
+
+
+def traced(name: Optional[str] = None):
+    """
+    Decorator recording a span per call while a trace is active. The default name is
+    `<class>.<method>` of the instance it is called on (so inherited repository
+    methods show their concrete repository), or the function's qualified name.
+    """
+    def decorate(func):
+        is_method = "." in func.__qualname__ and "<locals>" not in func.__qualname__
+
+        def span_name(args) -> str:
+            if name is not None:
+                return name
+            if is_method and args:
+                return f"{type(args[0]).__name__}.{func.__name__}"
+            return func.__qualname__
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _current_span.get() is None:
+                    return await func(*args, **kwargs)
+                with span(span_name(args), **{"code.function": func.__qualname__, "code.namespace": func.__module__}):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name(args), **{"code.function": func.__qualname__, "code.namespace": func.__module__}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def instrument_engine(engine, name: str):
+    """One client span per statement executed on `engine` inside a sampled trace (for async engines, pass `sync_engine`)"""
+    def start_statement(conn, cursor, statement, parameters, context, executemany):
+        parent = _current_span.get()
+        if parent is None or context is None:
+            return
+        context._trace_span = parent.child(statement.split(None, 1)[0].upper() if statement else "SQL", KIND_CLIENT, {
+            "db.system": "sqlite",
+            "db.name": name,
+            "db.statement": statement[:settings.TRACING_SQL_MAX_LENGTH],
+            "db.executemany": executemany,
+        })
+
+    def end_statement(conn, cursor, statement, parameters, context, executemany):
+        statement_span = getattr(context, "_trace_span", None)
+        if statement_span is not None:
+            context._trace_span = None
+            statement_span.end()
+
+    def statement_failed(exception_context):
+        context = exception_context.execution_context
+        statement_span = getattr(context, "_trace_span", None)
+        if statement_span is not None:
+            context._trace_span = None
+            statement_span.record_error(exception_context.original_exception)
+            statement_span.end()
+
+    event.listen(engine, "before_cursor_execute", start_statement)
+    event.listen(engine, "after_cursor_execute", end_statement)
+    event.listen(engine, "handle_error", statement_failed)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON encodes 64-bit integers as strings
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(item: Span) -> Dict[str, Any]:
+    encoded = {
+        "traceId": item.trace_id,
+        "spanId": item.span_id,
+        "name": item.name,
+        "kind": item.kind,
+        "startTimeUnixNano": str(item.start_ns),
+        "endTimeUnixNano": str(item.end_ns),
+        "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in item.attributes.items()
+                       if value is not None],
+        "status": {"code": item.status, **({"message": item.status_message} if item.status_message else {})},
+    }
+    if item.parent_id:
+        encoded["parentSpanId"] = item.parent_id
+    return encoded
+
+
+class JsonLinesExporter:
+    """
+    Appends each finished trace as one OTLP/JSON line. Encoding happens on the caller,
+    the write on the logging listener thread; files rotate at TRACING_EXPORT_MAX_BYTES.
+    """
+    def __init__(self, path: str, max_bytes: int, backup_count: int = 5, service_name: str = settings.PROJECT_NAME):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._resource = {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]}
+        self._logger: Optional[logging.Logger] = None
+        self._lock = threading.Lock()
+
+    def _get_logger(self) -> logging.Logger:
+        with self._lock:
+            if self._logger is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                handler = BatchedRotatingFileHandler(self.path, maxBytes=self.max_bytes, backupCount=self.backup_count)
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger = logging.getLogger("app.tracing.export")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                logger.handlers = []
+                attach_queue_listener(logger, handler)
+                self._logger = logger
+            return self._logger
+
+    def encode(self, trace: _Trace) -> str:
+        with trace.lock:
+            spans = sorted(trace.spans, key=lambda item: item.start_ns)
+        return json.dumps({"resourceSpans": [{
+            "resource": self._resource,
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": [_otlp_span(item) for item in spans]}],
+        }]}, separators=(",", ":"))
+
+    def export(self, trace: _Trace):
+        self._get_logger().info(self.encode(trace))
+
+
+exporter = JsonLinesExporter(settings.TRACING_EXPORT_PATH, settings.TRACING_EXPORT_MAX_BYTES)
+
+
+class TracingMiddleware:
+    """
+    Starts a sampled root span per HTTP request (named after the route template once
+    routing has matched) and returns its `traceparent` so a trace can be found by id.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for key, value in scope["headers"]:
+            if key == b"traceparent":
+                traceparent = value.decode("latin-1").strip().lower()
+                break
+
+        with start_trace(f"{scope['method']} {scope['path']}", KIND_SERVER, traceparent, **{
+            "http.method": scope["method"],
+            "http.target": scope["path"],
+        }) as root:
+            if root is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    root.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        root.status = STATUS_ERROR
+                    message = {**message, "headers": [
+                        *message.get("headers", []),
+                        (b"traceparent", f"00-{root.trace_id}-{root.span_id}-01".encode()),
+                    ]}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    root.name = f"{scope['method']} {route}"
+                    root.set_attribute("http.route", route)
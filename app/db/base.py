@@ -1,3 +1,10 @@
 from sqlalchemy.ext.declarative import declarative_base
 
-Base = declarative_base()
+
+class _ReturningDefaults:
+    # Fetch server-generated columns (ids, func.now() time stamps) with INSERT/UPDATE ... RETURNING
+    # in the write itself, so objects are complete after commit without a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+
+Base = declarative_base(cls=_ReturningDefaults)
@@ -0,0 +1,179 @@
+"""
+Readiness probe for the SQLite database: file present, timed `SELECT 1`, write lock
+obtainable within a deadline, plus pool and WAL statistics. Results are cached for
+HEALTH_CACHE_TTL_MS and only one check runs at a time, so a burst of probes against
+a struggling database costs one check - the rest get the last result immediately.
+"""
+import os
+import sqlite3
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.session import async_read_engine, engine, read_engine, write_engine
+from app.db.writer import write_queue
+
+
+def _pool_stats(pool) -> Dict[str, Any]:
+    stats: Dict[str, Any] = {"type": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if method is not None:
+            stats[name] = method()
+    return stats
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    return {
+        "default": _pool_stats(engine.pool),
+        "write": _pool_stats(write_engine.pool),
+        "read": _pool_stats(read_engine.pool),
+        "async_read": _pool_stats(async_read_engine.sync_engine.pool),
+    }
+
+
+class ReadinessProbe:
+    def __init__(self, database_path: Optional[str], *, timeout_ms: float, cache_ttl_ms: float):
+        self.database_path = database_path
+        self.timeout = timeout_ms / 1000.0
+        self.cache_ttl = cache_ttl_ms / 1000.0
+        self._lock = threading.Lock()
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        # The WAL header's checkpoint sequence number and salt change whenever a checkpoint resets the log
+        self._wal_generation: Optional[tuple] = None
+        self._checkpoint_seen_at: Optional[str] = None
+
+    def cached(self) -> Optional[Dict[str, Any]]:
+        """The last result if still fresh - cheap enough to call on the event loop"""
+        if self._result is not None and time.monotonic() - self._checked_at < self.cache_ttl:
+            return self._result
+        return None
+
+    def check(self) -> Dict[str, Any]:
+        """The cached result while fresh (or while another thread is refreshing it), otherwise a new check"""
+        cached = self.cached()
+        if cached is not None:
+            return cached
+        if not self._lock.acquire(blocking=self._result is None):
+            return self._result
+        try:
+            if self._result is None or time.monotonic() - self._checked_at >= self.cache_ttl:
+                self._result = self._run()
+                self._checked_at = time.monotonic()
+            return self._result
+        finally:
+            self._lock.release()
+
+    def _run(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        checks: Dict[str, Any] = {}
+        if self.database_path:
+            checks.update(self._check_sqlite())
+        else:
+            checks.update(self._check_engine())
+        ready = all(check.get("ok", True) for check in checks.values() if isinstance(check, dict))
+        return {
+            "status": "ready" if ready else "not_ready",
+            "checked_at": datetime.utcnow().isoformat(),
+            "check_ms": round((time.perf_counter() - started) * 1000, 2),
+            "checks": checks,
+            "pools": pool_stats(),
+            "write_queue_depth": write_queue.stats()["queue_depth"],
+        }
+
+    def _check_sqlite(self) -> Dict[str, Any]:
+        checks: Dict[str, Any] = {}
+        if not os.path.exists(self.database_path):
+            checks["database_file"] = {"ok": False, "error": f"{self.database_path} does not exist"}
+            return checks
+        checks["database_file"] = {"ok": True, "size_bytes": os.path.getsize(self.database_path)}
+
+        # A connection of its own rather than one from the pools, so a probe never waits
+        # behind requests for a connection; mode=rw keeps it from creating a missing file
+        try:
+            conn = sqlite3.connect(f"file:{self.database_path}?mode=rw", uri=True,
+                                   timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        except sqlite3.Error as exc:
+            checks["select"] = {"ok": False, "error": str(exc)}
+            return checks
+        try:
+            started = time.perf_counter()
+            try:
+                conn.execute("SELECT 1").fetchone()
+                # SELECT 1 alone never reads the file; this fails on a corrupt or non-database file
+                conn.execute("PRAGMA schema_version").fetchone()
+                checks["select"] = {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 3)}
+            except sqlite3.Error as exc:
+                checks["select"] = {"ok": False, "error": str(exc)}
+                return checks
+
+            started = time.perf_counter()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("ROLLBACK")
+                checks["write_lock"] = {"ok": True, "wait_ms": round((time.perf_counter() - started) * 1000, 3)}
+            except sqlite3.OperationalError as exc:
+                checks["write_lock"] = {
+                    "ok": False, "error": str(exc),
+                    "wait_ms": round((time.perf_counter() - started) * 1000, 3),
+                }
+            checks["wal"] = self._wal_stats(conn)
+        finally:
+            conn.close()
+        return checks
+
+    def _wal_stats(self, conn) -> Dict[str, Any]:
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        if journal_mode.lower() != "wal":
+            return {"journal_mode": journal_mode}
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        path = f"{self.database_path}-wal"
+        stats: Dict[str, Any] = {"journal_mode": journal_mode, "size_bytes": 0, "frames": 0}
+        try:
+            with open(path, "rb") as f:
+                header = f.read(32)
+                size = os.fstat(f.fileno()).st_size
+        except OSError:
+            return stats
+        stats["size_bytes"] = size
+        if len(header) == 32:
+            _, _, _, checkpoint_seq, salt1, salt2 = struct.unpack(">6I", header[:24])
+            stats["frames"] = max(0, (size - 32) // (page_size + 24))
+            stats["checkpoint_sequence"] = checkpoint_seq
+            generation = (checkpoint_seq, salt1, salt2)
+            if generation != self._wal_generation:
+                if self._wal_generation is not None:
+                    self._checkpoint_seen_at = datetime.utcnow().isoformat()
+                self._wal_generation = generation
+        # When this process first saw the log restart after a checkpoint (None: not since startup)
+        stats["last_checkpoint_seen_at"] = self._checkpoint_seen_at
+        return stats
+
+    def _check_engine(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except Exception as exc:
+            return {"select": {"ok": False, "error": str(exc)}}
+        return {"select": {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 3)}}
+
+
+def _sqlite_path() -> Optional[str]:
+    url = engine.url
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return os.path.abspath(url.database)
+
+
+readiness_probe = ReadinessProbe(
+    _sqlite_path(),
+    timeout_ms=settings.HEALTH_DB_TIMEOUT_MS,
+    cache_ttl_ms=settings.HEALTH_CACHE_TTL_MS,
+)
@@ -0,0 +1,141 @@
+"""
+Retry of whole units of work on SQLITE_BUSY / SQLITE_LOCKED, with jittered
+exponential backoff and contention counters.
+"""
+import functools
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, TypeVar
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import app_logger
+
+T = TypeVar("T")
+
+_SQLITE_BUSY = 5
+_SQLITE_LOCKED = 6
+_BUSY_MESSAGES = ("database is locked", "database table is locked", "database is busy")
+
+
+def is_busy_error(exc: BaseException) -> bool:
+    """True for SQLite lock contention (including extended codes such as SQLITE_BUSY_SNAPSHOT)"""
+    if isinstance(exc, OperationalError):
+        exc = exc.orig
+    if not isinstance(exc, sqlite3.OperationalError):
+        return False
+    code = getattr(exc, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (_SQLITE_BUSY, _SQLITE_LOCKED)
+    return str(exc).lower().startswith(_BUSY_MESSAGES)
+
+
+class BusyRetry:
+    """
+    Re-runs a callable when it fails on a locked database. Attempt n sleeps a random
+    time in [0, min(max_delay, base_delay * 2**n)] ("full jitter") so colliding
+    writers spread out instead of retrying in lockstep. After `attempts` tries the
+    request gets a 503 with Retry-After rather than a bare OperationalError.
+    """
+    def __init__(self, attempts: int = 5, base_delay_ms: float = 25, max_delay_ms: float = 1000):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay_ms / 1000.0
+        self.max_delay = max_delay_ms / 1000.0
+        self._lock = threading.Lock()
+        self._counters = self._empty_counters()
+
+    @staticmethod
+    def _empty_counters() -> Dict[str, float]:
+        return {"busy_errors": 0, "retries": 0, "recovered": 0, "give_ups": 0, "lock_wait_ms": 0.0, "backoff_ms": 0.0}
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, fn: Callable[..., T], *args, on_retry: Callable[[], Any] = None, **kwargs) -> T:
+        """
+        Call `fn` until it succeeds, fails with anything but a busy error, or runs out
+        of attempts. `on_retry` runs before each new attempt (e.g. to roll back the session).
+        """
+        for attempt in range(self.attempts):
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as exc:
+                if not is_busy_error(exc):
+                    raise
+                # Time spent in the failed attempt is mostly SQLite's own busy_timeout wait
+                waited = time.perf_counter() - started
+                last_attempt = attempt == self.attempts - 1
+                delay = 0.0 if last_attempt else self.backoff(attempt)
+                with self._lock:
+                    self._counters["busy_errors"] += 1
+                    self._counters["lock_wait_ms"] += waited * 1000
+                    if last_attempt:
+                        self._counters["give_ups"] += 1
+                    else:
+                        self._counters["retries"] += 1
+                        self._counters["backoff_ms"] += delay * 1000
+                if last_attempt:
+                    app_logger.error(f"Database still locked after {self.attempts} attempts: {exc}")
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail="Database is busy, please retry",
+                        headers={"Retry-After": str(max(1, round(self.max_delay)))},
+                    ) from exc
+                app_logger.warning(f"Database locked, retrying in {delay * 1000:.0f} ms (attempt {attempt + 1}/{self.attempts})")
+                if on_retry is not None:
+                    on_retry()
+                time.sleep(delay)
+                continue
+            if attempt:
+                with self._lock:
+                    self._counters["recovered"] += 1
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+        counters["lock_wait_ms"] = round(counters["lock_wait_ms"], 3)
+        counters["backoff_ms"] = round(counters["backoff_ms"], 3)
+        return {
+            "attempts": self.attempts,
+            "base_delay_ms": self.base_delay * 1000,
+            "max_delay_ms": self.max_delay * 1000,
+            **counters,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._counters = self._empty_counters()
+
+
+busy_retry = BusyRetry(
+    attempts=settings.DB_BUSY_RETRY_ATTEMPTS,
+    base_delay_ms=settings.DB_BUSY_RETRY_BASE_MS,
+    max_delay_ms=settings.DB_BUSY_RETRY_MAX_MS,
+)
+
+
+def retry_on_busy(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    Retry a service method (or function) taking a Session as a whole unit of work:
+    on a busy error the session is rolled back and the call is made again.
+
+    Re-execution contract for decorated callables: every write goes through that
+    session and is committed once, at the end; arguments are only read, never
+    mutated; nothing outside the database (files, caches, other sessions) is touched
+    before the commit. A failed attempt then leaves nothing behind, and running it
+    again is the same as running it for the first time.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        db = kwargs.get("db") or next((arg for arg in args if isinstance(arg, Session)), None)
+        if db is None:
+            raise TypeError(f"{fn.__qualname__} needs a Session argument to be retried")
+        return busy_retry.call(fn, *args, on_retry=db.rollback, **kwargs)
+    return wrapper
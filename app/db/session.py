@@ -1,15 +1,189 @@
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.session import close_all_sessions
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core import metrics, timing, tracing
+from app.core.query_log import slow_query_log
+
+def get_sqlite_pragmas(profile: Optional[str] = None) -> dict:
+    """
+    PRAGMAs applied to every new SQLite connection for the given profile.
+    The "default" profile keeps SQLite's stock behaviour; foreign key enforcement
+    is only added when SQLITE_FOREIGN_KEYS opts in, whatever the profile.
+    """
+    profile = profile or settings.SQLITE_PERFORMANCE_PROFILE
+    pragmas = {}
+    if profile == "tuned":
+        pragmas.update({
+            "journal_mode": settings.SQLITE_JOURNAL_MODE,
+            "synchronous": settings.SQLITE_SYNCHRONOUS,
+            "cache_size": settings.SQLITE_CACHE_SIZE,
+            "mmap_size": settings.SQLITE_MMAP_SIZE,
+            "temp_store": settings.SQLITE_TEMP_STORE,
+            "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        })
+    if settings.SQLITE_FOREIGN_KEYS:
+        pragmas["foreign_keys"] = "ON"
+    return pragmas
+
+def get_engine_pragmas() -> dict:
+    """
+    `get_sqlite_pragmas()` for the application's engines, plus WAL while the write queue
+    is enabled: under a rollback journal every queued COMMIT would wait for all open
+    read transactions. A journal mode other than WAL with the queue on is refused.
+    """
+    pragmas = get_sqlite_pragmas()
+    if settings.WRITE_QUEUE_ENABLED:
+        journal_mode = str(pragmas.setdefault("journal_mode", "WAL"))
+        if journal_mode.upper() != "WAL":
+            raise RuntimeError(
+                f"WRITE_QUEUE_ENABLED needs SQLITE_JOURNAL_MODE=WAL, got {journal_mode}; "
+                "change the journal mode or set WRITE_QUEUE_ENABLED=false"
+            )
+    return pragmas
+
+def apply_sqlite_pragmas(engine, pragmas: dict):
+    """Register a `connect` listener that runs the given PRAGMAs on each new DBAPI connection"""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+def begin_explicit_transactions(engine, begin_statement: str):
+    """Turn off pysqlite's own transaction handling and start every transaction on `engine` with `begin_statement`"""
+    @event.listens_for(engine, "connect")
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin_explicit(conn):
+        conn.exec_driver_sql(begin_statement)
+
+def begin_deferred_read_transactions(engine):
+    """
+    Make every transaction on `engine` an explicit `BEGIN DEFERRED`.
+    pysqlite normally runs SELECTs outside a transaction, so each query of a
+    multi-query report would see its own snapshot; with an explicit read
+    transaction they all share the snapshot taken by the first SELECT, and no
+    write lock is ever requested.
+    """
+    begin_explicit_transactions(engine, "BEGIN DEFERRED")
+
+def begin_immediate_write_transactions(engine):
+    """
+    Make every transaction on `engine` an explicit `BEGIN IMMEDIATE`, so the write
+    lock is taken up front instead of on the first write, and SAVEPOINTs work
+    (pysqlite's implicit transactions do not nest them properly).
+    """
+    begin_explicit_transactions(engine, "BEGIN IMMEDIATE")
 
 # Create engine
 engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URL, 
+    settings.SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in settings.SQLALCHEMY_DATABASE_URL else {}
 )
 
+if "sqlite" in settings.SQLALCHEMY_DATABASE_URL:
+    apply_sqlite_pragmas(engine, get_engine_pragmas())
+
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False so what was just written can be serialized without reloading it
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Single connection owned by the write queue thread (app/db/writer.py)
+write_engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False} if "sqlite" in settings.SQLALCHEMY_DATABASE_URL else {},
+    poolclass=StaticPool,
+)
+
+if "sqlite" in settings.SQLALCHEMY_DATABASE_URL:
+    apply_sqlite_pragmas(write_engine, get_engine_pragmas())
+    begin_immediate_write_transactions(write_engine)
+
+# Read-only reporting engine with its own pool
+read_engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False} if "sqlite" in settings.SQLALCHEMY_DATABASE_URL else {},
+    pool_size=settings.READ_POOL_SIZE,
+    max_overflow=settings.READ_MAX_OVERFLOW,
+)
+
+if "sqlite" in settings.SQLALCHEMY_DATABASE_URL:
+    apply_sqlite_pragmas(read_engine, {**get_engine_pragmas(), "query_only": "ON"})
+    begin_deferred_read_transactions(read_engine)
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Async engine on the same database for endpoints that have moved to `async def`.
+# The `connect` listener has to be attached to the underlying sync engine.
+async_engine = create_async_engine(settings.ASYNC_SQLALCHEMY_DATABASE_URL)
+
+if "sqlite" in settings.ASYNC_SQLALCHEMY_DATABASE_URL:
+    apply_sqlite_pragmas(async_engine.sync_engine, get_engine_pragmas())
+
+# expire_on_commit=False so returned objects stay usable without implicit (awaitable) refreshes
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+async_read_engine = create_async_engine(
+    settings.ASYNC_SQLALCHEMY_DATABASE_URL,
+    pool_size=settings.READ_POOL_SIZE,
+    max_overflow=settings.READ_MAX_OVERFLOW,
+)
+
+if "sqlite" in settings.ASYNC_SQLALCHEMY_DATABASE_URL:
+    apply_sqlite_pragmas(async_read_engine.sync_engine, {**get_engine_pragmas(), "query_only": "ON"})
+    begin_deferred_read_transactions(async_read_engine.sync_engine)
+
+AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine, autoflush=False, expire_on_commit=False)
+
+if settings.SLOW_QUERY_LOG_ENABLED:
+    for _engine in (engine, write_engine, read_engine, async_engine.sync_engine, async_read_engine.sync_engine):
+        slow_query_log.instrument(_engine)
+
+for _name, _engine in (
+    ("default", engine), ("write", write_engine), ("read", read_engine),
+    ("async", async_engine.sync_engine), ("async_read", async_read_engine.sync_engine),
+):
+    # Per-request DB time/count feeds both the Server-Timing header and the metrics
+    if settings.METRICS_ENABLED or settings.SERVER_TIMING_ENABLED:
+        timing.instrument_engine(_engine)
+    if settings.METRICS_ENABLED:
+        metrics.instrument_engine(_engine, _name)
+    if settings.TRACING_ENABLED:
+        tracing.instrument_engine(_engine, _name)
+
+async def dispose_all_engines():
+    """
+    Close every pooled connection to the database, e.g. before its file is deleted or
+    replaced: the default, write, read and both async engines. The write queue commits
+    what is queued and stops while its connection is closed, then starts again; each
+    engine reconnects on its next use.
+    """
+    # Imported here: the writer imports this module
+    from app.db.writer import write_queue
+
+    def dispose_sync_engines():
+        close_all_sessions()
+        write_queue.stop(timeout=30)
+        for sync_engine in (engine, write_engine, read_engine):
+            sync_engine.dispose()
+
+    await run_in_threadpool(dispose_sync_engines)
+    await async_engine.dispose()
+    await async_read_engine.dispose()
+    write_queue.start()
 
 def get_db():
     db = SessionLocal()
@@ -17,3 +191,19 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_read_db():
+    """Session on the read-only engine; the whole request runs in one snapshot, closed (rolled back) at the end"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -0,0 +1,144 @@
+"""
+Storage statistics for the SQLite database from the `dbstat` virtual table (page
+counts, bytes, free space and leaf fragmentation per table and index) and
+`sqlite_stat1` (planner row estimates, present once ANALYZE has run). A full scan
+reads every page, so results are cached for STORAGE_STATS_TTL_SECONDS.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.db.session import read_engine
+
+
+def _new_btree(name: str, kind: str, table: str) -> Dict[str, Any]:
+    return {
+        "name": name, "type": kind, "table": table,
+        "pages": 0, "leaf_pages": 0, "overflow_pages": 0, "bytes": 0, "payload_bytes": 0, "unused_bytes": 0,
+        "cells": 0, "_interior_cells": 0, "_out_of_order": 0, "_last_leaf": None,
+    }
+
+
+class StorageStats:
+    def __init__(self, engine, ttl_seconds: float):
+        self.engine = engine
+        self.ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._result: Optional[Dict[str, Any]] = None
+        self._computed_at = 0.0
+
+    def get(self, refresh: bool = False) -> Dict[str, Any]:
+        """Cached statistics; a caller arriving during a refresh waits for it instead of starting another scan"""
+        with self._lock:
+            if refresh or self._result is None or time.monotonic() - self._computed_at >= self.ttl:
+                self._result = self._compute()
+                self._computed_at = time.monotonic()
+            return self._result
+
+    def _compute(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        with self.engine.connect() as conn:
+            objects = {
+                name: (kind, table)
+                for kind, name, table in conn.exec_driver_sql("SELECT type, name, tbl_name FROM sqlite_master").fetchall()
+            }
+            page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+            page_count = conn.exec_driver_sql("PRAGMA page_count").scalar()
+            freelist_count = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+
+            btrees: Dict[str, Dict[str, Any]] = {}
+            try:
+                # Rows come in b-tree traversal order, so consecutive leaf pages are in key order
+                rows = conn.exec_driver_sql("SELECT name, pageno, pagetype, ncell, payload, unused, pgsize FROM dbstat")
+            except OperationalError as exc:
+                raise HTTPException(status_code=501, detail=f"dbstat is not available in this SQLite build: {exc.orig}")
+            for name, pageno, pagetype, ncell, payload, unused, pgsize in rows:
+                stats = btrees.get(name)
+                if stats is None:
+                    kind, table = objects.get(name, ("internal", name))
+                    stats = btrees[name] = _new_btree(name, kind, table)
+                stats["pages"] += 1
+                stats["bytes"] += pgsize
+                stats["payload_bytes"] += payload
+                stats["unused_bytes"] += unused
+                if pagetype == "leaf":
+                    stats["leaf_pages"] += 1
+                    stats["cells"] += ncell
+                    if stats["_last_leaf"] is not None and pageno != stats["_last_leaf"] + 1:
+                        stats["_out_of_order"] += 1
+                    stats["_last_leaf"] = pageno
+                elif pagetype == "overflow":
+                    stats["overflow_pages"] += 1
+                else:
+                    stats["_interior_cells"] += ncell
+
+            stat1, stat1_tables = self._stat1_rows(conn)
+
+        tables: List[Dict[str, Any]] = []
+        indexes: List[Dict[str, Any]] = []
+        for stats in btrees.values():
+            out_of_order = stats.pop("_out_of_order")
+            interior_cells = stats.pop("_interior_cells")
+            stats.pop("_last_leaf")
+            stats["unused_pct"] = round(100.0 * stats["unused_bytes"] / stats["bytes"], 1) if stats["bytes"] else 0.0
+            # Share of leaf pages not physically following the previous one (what VACUUM fixes)
+            stats["fragmentation_pct"] = (
+                round(100.0 * out_of_order / (stats["leaf_pages"] - 1), 1) if stats["leaf_pages"] > 1 else 0.0
+            )
+            if stats["type"] == "index":
+                # Interior cells of an index b-tree hold entries too
+                stats["entries"] = stats.pop("cells") + interior_cells
+                stats["stat1_rows"] = stat1.get(stats["name"])
+                indexes.append(stats)
+            else:
+                # Leaf cells of a rowid table are its rows
+                stats["rows"] = stats.pop("cells")
+                stats["stat1_rows"] = stat1.get(stats["name"], stat1_tables.get(stats["name"]))
+                tables.append(stats)
+
+        database = self.engine.url.database
+        return {
+            "computed_at": datetime.utcnow().isoformat(),
+            "scan_ms": round((time.perf_counter() - started) * 1000, 1),
+            "ttl_seconds": self.ttl,
+            "file": {
+                "path": database,
+                "size_bytes": os.path.getsize(database) if database and os.path.exists(database) else None,
+                "wal_bytes": os.path.getsize(f"{database}-wal") if database and os.path.exists(f"{database}-wal") else 0,
+                "page_size": page_size,
+                "page_count": page_count,
+                "freelist_pages": freelist_count,
+                # Free pages are only returned to the filesystem by VACUUM (or incremental auto_vacuum)
+                "freelist_bytes": freelist_count * page_size,
+            },
+            "tables": sorted(tables, key=lambda item: item["bytes"], reverse=True),
+            "indexes": sorted(indexes, key=lambda item: item["bytes"], reverse=True),
+        }
+
+    @staticmethod
+    def _stat1_rows(conn) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Row estimates ANALYZE stored, keyed by b-tree name, and per table. A table only
+        gets a row of its own (idx NULL) when it has no index; otherwise every index row
+        starts with the table's row count.
+        """
+        if conn.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").first() is None:
+            return {}, {}
+        estimates, tables = {}, {}
+        for table, index, stat in conn.exec_driver_sql("SELECT tbl, idx, stat FROM sqlite_stat1").fetchall():
+            try:
+                rows = int(stat.split()[0])
+            except (ValueError, IndexError, AttributeError):
+                continue
+            estimates[index or table] = rows
+            tables[table] = rows
+        return estimates, tables
+
+
+storage_stats = StorageStats(read_engine, ttl_seconds=settings.STORAGE_STATS_TTL_SECONDS)
@@ -0,0 +1,203 @@
+"""
+Single-writer queue: every write unit of work runs on one dedicated thread that
+owns the only write connection, so requests never contend for SQLite's write
+lock. Reads keep using their own pools. While the queue is enabled the database
+runs in WAL (see `get_engine_pragmas`), so a commit never waits for open read
+transactions - `get_read_db` holds one for a whole request - and reads never
+wait for a commit.
+"""
+import asyncio
+import contextvars
+import functools
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.query_log import percentile
+from app.db.retry import busy_retry
+from app.db.session import SessionLocal, write_engine
+
+T = TypeVar("T")
+WriteUnit = Callable[[Session], T]
+
+_STOP = object()
+
+
+class WriteQueue:
+    """
+    FIFO executor for write units of work. A unit is a callable taking a Session;
+    it may commit as usual. Units queued together share one transaction: each
+    runs in its own SAVEPOINT (a failure rolls back only that unit) and the group
+    is committed once. Callers get their result only after
+    that commit, when objects are detached: whatever the caller reads from them has
+    to be loaded inside the unit.
+    """
+    def __init__(self, engine, *, group_commit_max: int = 16, group_window_ms: float = 0.0, samples: int = 1000):
+        self.engine = engine
+        self.group_commit_max = max(1, group_commit_max)
+        self.group_window = group_window_ms / 1000.0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._wait_ms = deque(maxlen=samples)
+        self._run_ms = deque(maxlen=samples)
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "groups": 0, "max_depth": 0, "max_group": 0}
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="sqlite-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Finish what is queued, then stop the writer thread"""
+        with self._start_lock:
+            if self._thread is None:
+                return
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, work: WriteUnit) -> "Future[T]":
+        self.start()
+        future: "Future[T]" = Future()
+        # The unit runs in the submitter's context, so per-request state (query counts, ...) follows it
+        self._queue.put((functools.partial(contextvars.copy_context().run, work), future, time.perf_counter()))
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._counters["submitted"] += 1
+            self._counters["max_depth"] = max(self._counters["max_depth"], depth)
+        return future
+
+    def run(self, work: WriteUnit) -> T:
+        """Run `work` on the writer and wait for its result (or exception)"""
+        return self.submit(work).result()
+
+    async def run_async(self, work: WriteUnit) -> T:
+        """Same as `run` without holding a worker thread while queued"""
+        return await asyncio.wrap_future(self.submit(work))
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            group = [item]
+            stop = False
+            deadline = time.perf_counter() + self.group_window
+            while len(group) < self.group_commit_max:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                group.append(item)
+            self._run_group(group)
+            if stop:
+                return
+
+    def _run_group(self, group: List[Tuple[WriteUnit, Future, float]]):
+        pending = [entry for entry in group if entry[1].set_running_or_notify_cancel()]
+        try:
+            # Another process holding the lock fails BEGIN IMMEDIATE or COMMIT: re-run the group
+            outcomes = busy_retry.call(self._execute_group, pending)
+        except Exception as exc:
+            # The group transaction itself failed: nothing in it was written
+            outcomes = [(future, None, exc) for _, future, _ in pending]
+
+        with self._stats_lock:
+            self._counters["groups"] += 1
+            self._counters["max_group"] = max(self._counters["max_group"], len(group))
+            for _, _, exc in outcomes:
+                self._counters["failed" if exc is not None else "completed"] += 1
+        for future, result, exc in outcomes:
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+    def _execute_group(self, pending: List[Tuple[WriteUnit, Future, float]]) -> List[Tuple[Future, Any, Optional[Exception]]]:
+        outcomes = []
+        with self.engine.connect() as conn:
+            transaction = conn.begin()
+            try:
+                for work, future, enqueued_at in pending:
+                    started = time.perf_counter()
+                    # Own savepoint per unit, so one that commits and then fails leaves nothing behind
+                    savepoint = conn.begin_nested()
+                    try:
+                        with Session(
+                            bind=conn, join_transaction_mode="create_savepoint",
+                            autoflush=False, expire_on_commit=False,
+                        ) as db:
+                            result = work(db)
+                        savepoint.commit()
+                        outcomes.append((future, result, None))
+                    except Exception as exc:
+                        if savepoint.is_active:
+                            savepoint.rollback()
+                        outcomes.append((future, None, exc))
+                    self._record(started - enqueued_at, time.perf_counter() - started)
+                transaction.commit()
+            except BaseException:
+                transaction.rollback()
+                raise
+        return outcomes
+
+    def _record(self, wait: float, run: float):
+        with self._stats_lock:
+            self._wait_ms.append(wait * 1000)
+            self._run_ms.append(run * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            counters = dict(self._counters)
+            wait_ms = sorted(self._wait_ms)
+            run_ms = sorted(self._run_ms)
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "queue_depth": self._queue.qsize(),
+            **counters,
+            "wait_ms": {
+                "p50": round(percentile(wait_ms, 50), 3),
+                "p95": round(percentile(wait_ms, 95), 3),
+                "max": round(wait_ms[-1], 3) if wait_ms else 0.0,
+            },
+            "run_ms": {
+                "p50": round(percentile(run_ms, 50), 3),
+                "p95": round(percentile(run_ms, 95), 3),
+                "max": round(run_ms[-1], 3) if run_ms else 0.0,
+            },
+        }
+
+
+write_queue = WriteQueue(
+    write_engine,
+    group_commit_max=settings.WRITE_QUEUE_GROUP_COMMIT_MAX,
+    group_window_ms=settings.WRITE_QUEUE_GROUP_WINDOW_MS,
+)
+
+
+def run_write(work: WriteUnit) -> T:
+    """Run a write unit on the write queue, or inline on a regular session when the queue is disabled"""
+    if settings.WRITE_QUEUE_ENABLED:
+        return write_queue.run(work)
+    with SessionLocal() as db:
+        return work(db)
+
+
+async def run_write_async(work: WriteUnit) -> T:
+    if settings.WRITE_QUEUE_ENABLED:
+        return await write_queue.run_async(work)
+    return await run_in_threadpool(run_write, work)
@@ -0,0 +1,65 @@
+"""
+Access log middleware: one `log_request` line per request, with 2xx/3xx responses
+sampled so busy list endpoints don't flood the log
+"""
+import logging
+import random
+import time
+
+from app.core.config import settings
+from app.core.logger import log_request
+from app.core.timing import track_request, untrack_request
+
+
+class AccessLogMiddleware:
+    """
+    Logs every 4xx/5xx response and every request slower than `slow_ms`, and a
+    `sample_rate` fraction of the rest (the line carries `sample_rate` so counts
+    can be scaled back up).
+    """
+    def __init__(self, app, sample_rate: float = None, slow_ms: float = None):
+        self.app = app
+        self.sample_rate = settings.ACCESS_LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.slow_ms = settings.ACCESS_LOG_SLOW_MS if slow_ms is None else slow_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        timings, token = track_request()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            untrack_request(token)
+            duration = time.perf_counter() - started
+            slow = self.slow_ms and duration * 1000 >= self.slow_ms
+            if status_code >= 500:
+                level = logging.ERROR
+            elif status_code >= 400 or slow:
+                level = logging.WARNING
+            elif random.random() < self.sample_rate:
+                level = logging.INFO
+            else:
+                level = None
+            if level is not None:
+                route = scope.get("route")
+                client = scope.get("client")
+                log_request(
+                    scope["method"], scope["path"], status_code, duration, level=level,
+                    route=getattr(route, "path", None),
+                    query_string=scope.get("query_string", b"").decode("latin-1"),
+                    client_ip=client[0] if client else None,
+                    db_queries=timings.queries,
+                    slow=bool(slow),
+                    sample_rate=1.0 if level != logging.INFO else self.sample_rate,
+                )
@@ -1,107 +1,282 @@
 """
-Rate limiting middleware for API endpoints
+Rate limiting middleware for API endpoints.
+
+Limits are enforced with GCRA (the generic cell rate algorithm, equivalent to a token
+bucket refilled continuously): each key holds a single float, its "theoretical arrival
+time", so memory per client is constant and a check is a few arithmetic operations.
+Keys are spread over shards with a lock each, and a key whose allowance has fully
+refilled carries no information, so shards periodically drop those.
+
+`RateLimiter` keeps that state in process memory; `SQLiteRateLimiter` keeps it in a
+small SQLite file shared by every worker on the host (RATE_LIMIT_BACKEND=sqlite).
 """
-from fastapi import Request, HTTPException, status
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Protocol, Tuple
+
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Dict, Tuple
-import asyncio
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.core.memory import register_cache
+from app.core.metrics import registry
+
+rate_limit_rejected = registry.counter(
+    "rate_limit_rejected_total", "Requests refused with 429 by the rate limiter", ["limit_class"])
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600}
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """"120/minute" -> (120, 60.0)"""
+    count, _, period = rate.strip().partition("/")
+    if period not in PERIODS:
+        raise ValueError(f"Invalid rate {rate!r}: expected <count>/second|minute|hour")
+    return int(count), float(PERIODS[period])
+
+
+def parse_route_limits(spec: str) -> Dict[str, Tuple[int, float]]:
+    """"/api/v1/auth=10/minute;/api/v1/admin=30/minute" -> {path prefix: (count, period)}"""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(";"))):
+        prefix, _, rate = item.partition("=")
+        limits[prefix.strip()] = parse_rate(rate)
+    return limits
+
+
+class RateLimit:
+    """`count` requests per `period` seconds, all of which may arrive at once"""
+    __slots__ = ("name", "count", "period", "interval", "max_debt")
+
+    def __init__(self, name: str, count: int, period: float):
+        self.name = name
+        self.count = count
+        self.period = period
+        # One request "costs" interval seconds; a request is allowed while the key's arrival
+        # time is at most max_debt ahead of now (0 when only one request per period is allowed)
+        self.interval = period / count
+        self.max_debt = period - self.interval
+
+
+class RateLimitBackend(Protocol):
+    # True when `hit` does I/O, so the middleware runs it off the event loop
+    blocking: bool
+
+    def hit(self, key: str, limit: RateLimit) -> Tuple[bool, int, float]:
+        """Count a request for `key`: (allowed, remaining, seconds until one request fits when refused)"""
+        ...
+
+
+class _Shard:
+    __slots__ = ("lock", "keys", "next_sweep")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> theoretical arrival time (monotonic seconds)
+        self.keys: Dict[str, float] = {}
+        self.next_sweep = 0.0
+
 
 class RateLimiter:
     """
-    Simple in-memory rate limiter
-    For production with multiple servers, use Redis
+    In-memory rate limiter. Each process keeps its own counts, so with several
+    workers a client gets up to workers x the limit - see `SQLiteRateLimiter`.
     """
-    def __init__(self, requests_per_minute: int = 60):
-        self.requests_per_minute = requests_per_minute
-        self.requests: Dict[str, list] = defaultdict(list)
-        self.lock = asyncio.Lock()
-    
-    async def is_allowed(self, identifier: str) -> Tuple[bool, int]:
+    blocking = False
+
+    def __init__(self, shards: int = 16, max_keys: int = 100_000, sweep_seconds: float = 60):
+        self.shards = [_Shard() for _ in range(shards)]
+        self.max_keys_per_shard = max(1, max_keys // shards)
+        self.sweep_seconds = sweep_seconds
+        register_cache("rate_limiter.identifiers", lambda: len(self))
+
+    def __len__(self) -> int:
+        return sum(len(shard.keys) for shard in self.shards)
+
+    def hit(self, key: str, limit: RateLimit) -> Tuple[bool, int, float]:
         """
-        Check if request is allowed
-        
-        Args:
-            identifier: IP address or user ID
-        
-        Returns:
-            Tuple of (is_allowed, remaining_requests)
+        Count a request for `key`. Returns (allowed, remaining, retry_after): what is
+        left of the allowance, and when refused, how many seconds until one request fits.
         """
-        async with self.lock:
-            now = datetime.now()
-            minute_ago = now - timedelta(minutes=1)
-            
-            # Clean old requests
-            self.requests[identifier] = [
-                req_time for req_time in self.requests[identifier]
-                if req_time > minute_ago
-            ]
-            
-            # Check limit
-            current_requests = len(self.requests[identifier])
-            
-            if current_requests >= self.requests_per_minute:
-                return False, 0
-            
-            # Add current request
-            self.requests[identifier].append(now)
-            remaining = self.requests_per_minute - current_requests - 1
-            
-            return True, remaining
-
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
+        now = time.monotonic()
+        shard = self.shards[hash(key) % len(self.shards)]
+        with shard.lock:
+            tat = shard.keys.get(key, now)
+            debt = tat - now if tat > now else 0.0
+            if debt > limit.max_debt:
+                return False, 0, debt - limit.max_debt
+            shard.keys[key] = now + debt + limit.interval
+            if now >= shard.next_sweep or len(shard.keys) > self.max_keys_per_shard:
+                self._sweep(shard, now)
+        return True, int((limit.max_debt - debt) / limit.interval + 1e-9), 0.0
+
+    def _sweep(self, shard: _Shard, now: float):
+        # A key whose arrival time has passed has its full allowance back - same as an absent key
+        shard.keys = {key: tat for key, tat in shard.keys.items() if tat > now}
+        # Still over the cap: forget the oldest keys (they get a fresh allowance), leaving
+        # some headroom so a shard full of active keys is not swept on every new one
+        excess = len(shard.keys) - int(self.max_keys_per_shard * 0.9)
+        if excess > 0:
+            for key in list(shard.keys)[:excess]:
+                del shard.keys[key]
+        shard.next_sweep = now + self.sweep_seconds
+
+
+_UPSERT = """
+    INSERT INTO rate_limits (key, tat) VALUES (:key, :now + :interval)
+    ON CONFLICT (key) DO UPDATE SET tat = max(tat, :now) + :interval
+    WHERE max(tat, :now) - :now <= :max_debt
+    RETURNING tat
+"""
+
+
+class SQLiteRateLimiter:
+    """
+    Rate limiter whose state is a SQLite table shared by all worker processes on the
+    host, so together they allow exactly the configured limit. A check is a single
+    UPSERT ... RETURNING that only advances the key when the request fits, atomic
+    under SQLite's write lock. Each thread has its own connection.
+
+    The counts are disposable: the file runs with synchronous=OFF, and if a check
+    fails (the file is locked longer than `busy_timeout_ms`, say) the request is let
+    through rather than refused.
+
+    A check can wait on the file lock, so the middleware runs it on the threadpool.
+    """
+    blocking = True
+
+    def __init__(self, path: str, sweep_seconds: float = 60, busy_timeout_ms: float = 100):
+        self.path = path
+        self.sweep_seconds = sweep_seconds
+        self.busy_timeout = busy_timeout_ms / 1000.0
+        self._local = threading.local()
+        self._next_sweep = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL) WITHOUT ROWID")
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key: str, limit: RateLimit) -> Tuple[bool, int, float]:
+        # Wall-clock time: it has to mean the same in every process
+        now = time.time()
+        try:
+            conn = self._connection()
+            row = conn.execute(_UPSERT, {"key": key, "now": now, "interval": limit.interval,
+                                         "max_debt": limit.max_debt}).fetchone()
+            if row is None:
+                tat = conn.execute("SELECT tat FROM rate_limits WHERE key = ?", (key,)).fetchone()
+                return False, 0, max(0.0, (tat[0] if tat else now) - now - limit.max_debt)
+            if now >= self._next_sweep:
+                self._next_sweep = now + self.sweep_seconds
+                # Keys whose allowance has fully refilled; every worker sweeps, which is harmless
+                conn.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,))
+        except sqlite3.Error as exc:
+            app_logger.warning(f"Rate limit check failed, allowing the request: {exc}")
+            return True, limit.count - 1, 0.0
+        debt = max(0.0, row[0] - limit.interval - now)
+        return True, int((limit.max_debt - debt) / limit.interval + 1e-9), 0.0
+
+
+def create_rate_limiter() -> RateLimitBackend:
+    """The backend RATE_LIMIT_BACKEND selects"""
+    if settings.RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteRateLimiter(settings.RATE_LIMIT_SQLITE_PATH, sweep_seconds=settings.RATE_LIMIT_SWEEP_SECONDS,
+                                 busy_timeout_ms=settings.RATE_LIMIT_SQLITE_TIMEOUT_MS)
+    if settings.RATE_LIMIT_BACKEND != "memory":
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND {settings.RATE_LIMIT_BACKEND!r}: expected memory or sqlite")
+    return RateLimiter(max_keys=settings.RATE_LIMIT_MAX_KEYS, sweep_seconds=settings.RATE_LIMIT_SWEEP_SECONDS)
+
+
+class RateLimitMiddleware:
     """
-    Rate limiting middleware
+    Rate limiting middleware. A request counts against the limit class of the longest
+    matching path prefix in RATE_LIMIT_ROUTES, else RATE_LIMIT_DEFAULT; classes are
+    counted separately per client IP.
     """
-    def __init__(self, app, requests_per_minute: int = 60):
-        super().__init__(app)
-        self.limiter = RateLimiter(requests_per_minute)
-        
+    def __init__(self, app, default: Optional[str] = None, routes: Optional[str] = None,
+                 limiter: Optional[RateLimitBackend] = None):
+        self.app = app
+        self.limiter = limiter if limiter is not None else create_rate_limiter()
+        self.default = RateLimit("default", *parse_rate(default or settings.RATE_LIMIT_DEFAULT))
+        route_limits = parse_route_limits(settings.RATE_LIMIT_ROUTES if routes is None else routes)
+        # Longest prefix first, so the most specific class wins
+        self.routes: List[Tuple[str, RateLimit]] = [
+            (prefix, RateLimit(prefix, *rate))
+            for prefix, rate in sorted(route_limits.items(), key=lambda item: len(item[0]), reverse=True)
+        ]
+
         # Exempt certain paths from rate limiting
-        self.exempt_paths = [
+        self.exempt_paths = tuple(f"{settings.API_V1_STR}{path}" for path in (
             "/docs",
             "/redoc",
             "/openapi.json",
             "/health",
-        ]
-    
-    async def dispatch(self, request: Request, call_next):
-        # Skip rate limiting for exempt paths
-        if any(request.url.path.startswith(path) for path in self.exempt_paths):
-            return await call_next(request)
-        
-        # Get identifier (IP address or user ID from token)
-        identifier = request.client.host
-        
-        # Check if user is authenticated and use user ID instead
-        if "authorization" in request.headers:
-            # In production, decode token and use user ID
-            # For now, use IP
-            pass
-        
-        # Check rate limit
-        is_allowed, remaining = await self.limiter.is_allowed(identifier)
-        
-        if not is_allowed:
-            return JSONResponse(
+            "/metrics",
+        ))
+
+    def limit_for(self, path: str) -> RateLimit:
+        for prefix, limit in self.routes:
+            if path.startswith(prefix):
+                return limit
+        return self.default
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        # Get identifier (IP address)
+        client = scope.get("client")
+        identifier = client[0] if client else "unknown"
+        limit = self.limit_for(scope["path"])
+        key = f"{limit.name}:{identifier}"
+        if self.limiter.blocking:
+            allowed, remaining, retry_after = await run_in_threadpool(self.limiter.hit, key, limit)
+        else:
+            # A few arithmetic operations under a lock: cheaper than a thread hop
+            allowed, remaining, retry_after = self.limiter.hit(key, limit)
+
+        if not allowed:
+            rate_limit_rejected.inc((limit.name,))
+            retry_after = max(1, math.ceil(retry_after))
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={
                     "detail": "Too many requests. Please try again later.",
-                    "retry_after": 60
+                    "retry_after": retry_after
                 },
                 headers={
-                    "X-RateLimit-Limit": str(self.limiter.requests_per_minute),
+                    "X-RateLimit-Limit": str(limit.count),
                     "X-RateLimit-Remaining": "0",
-                    "Retry-After": "60"
+                    "Retry-After": str(retry_after)
                 }
             )
-        
+            await response(scope, receive, send)
+            return
+
         # Add rate limit headers to response
-        response = await call_next(request)
-        response.headers["X-RateLimit-Limit"] = str(self.limiter.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        
-        return response
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [
+                    *message.get("headers", []),
+                    (b"x-ratelimit-limit", str(limit.count).encode()),
+                    (b"x-ratelimit-remaining", str(remaining).encode()),
+                ]}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
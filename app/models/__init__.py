@@ -13,4 +13,13 @@ from app.models.transaction import (
     TransactionAllowanceDeductionsDetails, TransactionPaymentDetails,
     TransactionUnloadingPointDetails, BagDetails, BagsStatus
 )
-from app.models.events import Events
+from app.models.events import Events, Announcement
+from app.models.production import (
+    BatchOperator, Clerks, Batch, SteamOn, SteamOff, Drainage, Immerse,
+    MillingAnalysis, SortingAnalysis, CrossVerification, LotDetails
+)
+from app.models.labour import (
+    LabourPaymentVouchers, LabourGang, LabourWorkItem, LabourWorkParticulars,
+    LabourBagPackagingWeight, LabourWorkLocation, VoucherGang, VoucherWorkItem,
+    VoucherParticular, VoucherBagPackaging, VoucherLocation
+)
@@ -50,7 +50,7 @@ class LabourGang(Base):
     __tablename__ = "labour_gang"
 
     id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    gang_name = Column(String(30), index=True)
+    gang_name = Column(String(30), index=True, unique=True)
     gang_mob_no = Column(String(10), index=True)
     work_rate = Column(Float, index=True)
     is_active = Column(Boolean, index=True)
@@ -63,7 +63,7 @@ class LabourWorkItem(Base):
     __tablename__ = "labour_work_item"
 
     id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    labour_item_name = Column(String(30), index=True)
+    labour_item_name = Column(String(30), index=True, unique=True)
     remarks = Column(String(50), index=True)
 
     # labour_payment_vouchers = relationship("LabourPaymentVouchers", back_populates="labour_work_item")
@@ -73,7 +73,7 @@ class LabourWorkParticulars(Base):
     __tablename__ = "labour_work_particulars"
 
     id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    work_name = Column(String(30), index=True)
+    work_name = Column(String(30), index=True, unique=True)
     remarks = Column(String(50), index=True)
 
     # labour_payment_vouchers = relationship("LabourPaymentVouchers", back_populates="labour_work_particulars")
@@ -83,7 +83,7 @@ class LabourBagPackagingWeight(Base):
     __tablename__ = "labour_bag_packaging_weight"
 
     id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    bag_weight = Column(Integer, index=True)
+    bag_weight = Column(Integer, index=True, unique=True)
     remarks = Column(String(50), index=True)
 
     # labour_payment_vouchers = relationship("LabourPaymentVouchers", back_populates="labour_bag_packaging_weight")
@@ -93,7 +93,7 @@ class LabourWorkLocation(Base):
     __tablename__ = "labour_work_location"
 
     id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    work_locations = Column(String(30), index=True)
+    work_locations = Column(String(30), index=True, unique=True)
     remarks = Column(String(50), index=True)
 
 
@@ -1,24 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import inspect
-from app.db.session import get_db
-from app.core.security import security
+from app.db.session import get_async_db, get_db
+from app.core.security import _verify_access_token, blacklist_token, security
 from app.modules.users.schemas import User as UserSchema
 from app.modules.auth.service import auth_service
 
 router = APIRouter()
 
 @router.post("/login")
-def login(data: UserSchema, db: Session = Depends(get_db)):
+async def login(data: UserSchema, db: AsyncSession = Depends(get_async_db)):
     # Check if the database is initialized (has "users" table)
-    inspector = inspect(db.bind)
-    if "users" not in inspector.get_table_names():
+    has_users = await db.run_sync(lambda session: inspect(session.connection()).has_table("users"))
+    if not has_users:
         raise HTTPException(
             status_code=500,
             detail="Database is not initialized. Please run migrations first."
         )
 
-    result = auth_service.login(db, data.user_login_id, data.password)
+    result = await auth_service.login(db, data.user_login_id, data.password)
     
     # Format response to match frontend expectation
     user = result["user"]
@@ -54,3 +55,11 @@ def refresh_token(
         "access_token": result["access_token"],
         "token_type": result["token_type"]
     }
+
+@router.post("/logout")
+def logout(credentials = Depends(security)):
+    # A sync endpoint: recording the revocation writes to the revocation file
+    token = credentials.credentials
+    _verify_access_token(token)
+    blacklist_token(token)
+    return {"detail": "Logged out"}
@@ -1,25 +1,35 @@
 from datetime import timedelta, datetime
 from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from jose import jwt, JWTError
 
 from app.core.config import settings
-from app.core.security import verify_password, create_access_token
+from app.core.passwords import password_hasher
+from app.core.security import REFRESH_GRACE, create_access_token, is_token_blacklisted
 from app.modules.users.service import user_service
 from app.modules.users.models import User
 
 class AuthService:
-    def authenticate(self, db: Session, user_login_id: str, password: str) -> Optional[User]:
-        user = user_service.get_by_login_id(db, user_login_id=user_login_id)
+    async def authenticate(self, db: AsyncSession, user_login_id: str, password: str) -> Optional[User]:
+        result = await db.execute(select(User).filter(User.user_login_id == user_login_id))
+        user = result.scalars().first()
         if not user:
             return None
-        if not verify_password(password, user.password):
+        # Checked on the password hashing pool; the request waits without holding a worker thread
+        valid, new_hash = await password_hasher.verify_and_update_async(password, user.password)
+        if not valid:
             return None
+        if new_hash:
+            # Hashed with a cost other than BCRYPT_ROUNDS: store it again at the current cost
+            user.password = new_hash
+            await db.commit()
         return user
 
-    def login(self, db: Session, user_login_id: str, password: str) -> dict:
-        user = self.authenticate(db, user_login_id, password)
+    async def login(self, db: AsyncSession, user_login_id: str, password: str) -> dict:
+        user = await self.authenticate(db, user_login_id, password)
         if not user:
             raise HTTPException(status_code=401, detail="Username or password is incorrect")
         
@@ -39,6 +49,8 @@ class AuthService:
         }
 
     def refresh_token(self, db: Session, token: str) -> dict:
+        if is_token_blacklisted(token):
+            raise HTTPException(status_code=401, detail="Token has been revoked")
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], options={"verify_exp": False})
             user_login_id: str = payload.get("sub")
@@ -56,7 +68,7 @@ class AuthService:
         if exp_timestamp:
             exp_time = datetime.utcfromtimestamp(exp_timestamp)
             now = datetime.utcnow()
-            if now - exp_time > timedelta(minutes=15):
+            if now - exp_time > REFRESH_GRACE:
                 raise HTTPException(status_code=401, detail="Token expired too long ago")
 
         new_token = create_access_token(
@@ -1,6 +1,6 @@
 import enum
 from typing import Optional
-from sqlalchemy import Column, Integer, Float, String, Boolean, Date, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, Float, String, Boolean, Date, DateTime, ForeignKey, Index, Enum
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
@@ -14,19 +14,21 @@ class BagsStatus(enum.Enum):
 # Model for Incoming and Outgoing
 class IncomingOutgoing(Base):
     __tablename__ = "incoming_outgoing"
+    # Incoming / outgoing list filters
+    __table_args__ = (Index("ix_incoming_outgoing_is_incoming_io_date", "is_incoming", "io_date"),)
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     io_date = Column(Date, index=True)
-    is_incoming = Column(Boolean, index=True)
-    rst_bill = Column(String(20), index=True)
-    brought_by = Column(String(30), index=True)
-    mob_no = Column(String(10), index=True)
-    vehicle_no = Column(String(11), index=True)
-    origin = Column(String(30), index=True)
-    party_through = Column(String(30), index=True)
-    transportation_expense = Column(Integer, index=True)
-    remarks = Column(String(50), index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    is_incoming = Column(Boolean)
+    rst_bill = Column(String(20))
+    brought_by = Column(String(30))
+    mob_no = Column(String(10))
+    vehicle_no = Column(String(11))
+    origin = Column(String(30))
+    party_through = Column(String(30))
+    transportation_expense = Column(Integer)
+    remarks = Column(String(50))
+    user_login_id = Column(Integer, ForeignKey("users.id"))
     time_stamp = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
 
     # Relationship to User and IncomingOutgoingItems
@@ -42,15 +44,15 @@ class IncomingOutgoing(Base):
 class IncomingOutgoingItems(Base):
     __tablename__ = "incoming_outgoing_items"
     
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     incoming_outgoing_id = Column(Integer, ForeignKey("incoming_outgoing.id", ondelete="CASCADE", onupdate="CASCADE"), index=True)
-    jins = Column(String(30), index=True)
-    bags_no = Column(Boolean, index=True)
-    quantity = Column(Integer, index=True)
-    packaging = Column(String(30), index=True)
-    weight_society = Column(Integer, index=True)
-    weight_wb = Column(Integer, index=True)
-    amount = Column(Integer, index=True)
+    jins = Column(String(30))
+    bags_no = Column(Boolean)
+    quantity = Column(Integer)
+    packaging = Column(String(30))
+    weight_society = Column(Integer)
+    weight_wb = Column(Integer)
+    amount = Column(Integer)
 
     # Relationship to IncomingOutgoing
     incoming_outgoing = relationship("IncomingOutgoing", back_populates="incoming_outgoing_items")
@@ -59,19 +61,21 @@ class IncomingOutgoingItems(Base):
 class IncomingOutgoingPayment(Base):
     __tablename__ = "incoming_outgoing_payment"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     incoming_outgoing_id = Column(Integer, ForeignKey("incoming_outgoing.id", ondelete="CASCADE", onupdate="CASCADE"), index=True)
-    payment_amount = Column(Integer, index=True)
-    payment_date = Column(Date, index=True, nullable=True)
+    payment_amount = Column(Integer)
+    payment_date = Column(Date, nullable=True)
 
     # Relationship to IncomingOutgoing
     incoming_outgoing = relationship("IncomingOutgoing", back_populates="incoming_outgoing_payment")
 
 class StockLedger(Base):
     __tablename__ = "stock_ledger"
+    # Ledger row lookup on every posting
+    __table_args__ = (Index("ix_stock_ledger_godown_id_stock_item_id", "godown_id", "stock_item_id"),)
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    godown_id = Column(Integer, ForeignKey("godown_details_operations.id"), index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
+    godown_id = Column(Integer, ForeignKey("godown_details_operations.id"))
     stock_item_id = Column(Integer, ForeignKey("stock_items_operations.id"), index=True)
     stock_quantity_bags = Column(Integer, default=0)  # Bags
     stock_weight_quintal = Column(Float, default=0.0)  # Quintals
@@ -102,21 +106,23 @@ class StockLedger(Base):
 # Model for Transaction Mill Operations
 class TransactionMillOperations(Base):
     __tablename__ = "transaction_mill_operations"
+    # Purchase / sales lists and reports by date range
+    __table_args__ = (Index("ix_transaction_mill_operations_transaction_type_transaction_date", "transaction_type", "transaction_date"),)
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    rst_number = Column(String(20), index=True)
-    bill_number = Column(String(20), index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
+    rst_number = Column(String(20))
+    bill_number = Column(String(20))
     transaction_date = Column(Date, index=True)
-    transaction_type = Column(Boolean, index=True)  # True for Purchase, False for Sales
+    transaction_type = Column(Boolean)  # True for Purchase, False for Sales
     party_id = Column(Integer, ForeignKey("party_details_operations.id"), index=True)
     broker_id = Column(Integer, ForeignKey("broker_details_operations.id"), index=True)
     transportor_id = Column(Integer, ForeignKey("transportor_details_operations.id"), index=True)
-    gross_weight = Column(Integer, index=True)
-    tare_weight = Column(Integer, index=True)
-    weight_bridge_operator_id = Column(Integer, ForeignKey("weight_bridge_operator_operations.id"), index=True)
-    vehicle_number = Column(String(10), index=True)
-    remarks = Column(String(50), index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    gross_weight = Column(Integer)
+    tare_weight = Column(Integer)
+    weight_bridge_operator_id = Column(Integer, ForeignKey("weight_bridge_operator_operations.id"))
+    vehicle_number = Column(String(10))
+    remarks = Column(String(50))
+    user_login_id = Column(Integer, ForeignKey("users.id"))
 
     time_stamp = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
 
@@ -171,10 +177,10 @@ class TransactionMillOperations(Base):
 class TransactionPackagingDetails(Base):
     __tablename__ = "transaction_packaging_details_mill_operations"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     transaction_id = Column(Integer, ForeignKey("transaction_mill_operations.id", ondelete="CASCADE"), index=True)
-    packaging_id = Column(Integer, ForeignKey("packaging_details_operations.id"), index=True)
-    bag_nos = Column(Integer, index=True)
+    packaging_id = Column(Integer, ForeignKey("packaging_details_operations.id"))
+    bag_nos = Column(Integer)
 
     # Relationship to TransactionMillOperations
     packaging = relationship("app.modules.master_data.models.PackagingDetails", back_populates="transaction_packaging_details")
@@ -183,13 +189,15 @@ class TransactionPackagingDetails(Base):
 # Model for Transaction Stock Item
 class TransactionStockItem(Base):
     __tablename__ = "transaction_stock_items_operations"
+    # Loading a transaction's items and the stock item EXISTS filter
+    __table_args__ = (Index("ix_transaction_stock_items_operations_transaction_id_stock_item_id", "transaction_id", "stock_item_id"),)
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    transaction_id = Column(Integer, ForeignKey("transaction_mill_operations.id", ondelete="CASCADE"), index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
+    transaction_id = Column(Integer, ForeignKey("transaction_mill_operations.id", ondelete="CASCADE"))
     stock_item_id = Column(Integer, ForeignKey("stock_items_operations.id"), index=True)
-    number_of_bags = Column(Integer, index=True)
-    weight = Column(Float, index=True)
-    rate = Column(Float, index=True)
+    number_of_bags = Column(Integer)
+    weight = Column(Float)
+    rate = Column(Float)
 
     # Relationship to TransactionMillOperations
     transaction_mill_operations = relationship("TransactionMillOperations", back_populates="transaction_stock_items")
@@ -200,12 +208,12 @@ class TransactionStockItem(Base):
 class TransactionAllowanceDeductionsDetails(Base):
     __tablename__ = "transaction_allowances_deduction_mill_operations"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     transaction_id = Column(Integer, ForeignKey("transaction_mill_operations.id", ondelete="CASCADE"), index=True)
-    is_allowance = Column(Boolean, index=True)
-    allowance_deduction_name = Column(String(20), index=True)
-    allowance_deduction_amount = Column(Integer, index=True)
-    remarks = Column(String(50), index=True)
+    is_allowance = Column(Boolean)
+    allowance_deduction_name = Column(String(20))
+    allowance_deduction_amount = Column(Integer)
+    remarks = Column(String(50))
 
     # Relationship to TransactionMillOperations
     transaction_mill_operations = relationship("TransactionMillOperations", back_populates="transaction_allowance_deduction_details")
@@ -214,11 +222,11 @@ class TransactionAllowanceDeductionsDetails(Base):
 class TransactionPaymentDetails(Base):
     __tablename__ = "transaction_payments_mill_operations"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     transaction_id = Column(Integer, ForeignKey("transaction_mill_operations.id", ondelete="CASCADE"), index=True)
-    payment_amount = Column(Float, index=True)
-    payment_date = Column(Date, index=True)
-    payment_remarks = Column(String(50), index=True)
+    payment_amount = Column(Float)
+    payment_date = Column(Date)
+    payment_remarks = Column(String(50))
 
     # Relationship to TransactionMillOperations
     transaction_mill_operations = relationship("TransactionMillOperations", back_populates="transaction_payments_mill_operations")
@@ -227,11 +235,11 @@ class TransactionPaymentDetails(Base):
 class TransactionUnloadingPointDetails(Base):
     __tablename__ = "transaction_unloading_point_operations"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     transaction_id = Column(Integer, ForeignKey("transaction_mill_operations.id", ondelete="CASCADE"), index=True)
     godown_id = Column(Integer, ForeignKey("godown_details_operations.id"), index=True)
-    number_of_bags = Column(Integer, index=True) 
-    remarks = Column(String(50), index=True)
+    number_of_bags = Column(Integer) 
+    remarks = Column(String(50))
 
     # Relationship to TransactionMillOperations
     transaction_mill_operations = relationship("TransactionMillOperations", back_populates="transaction_unloading_point_details")
@@ -239,14 +247,16 @@ class TransactionUnloadingPointDetails(Base):
 
 class BagDetails(Base):
     __tablename__ = "bag_details"
-
-    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
-    transaction_id = Column(Integer, ForeignKey("transaction_mill_operations.id", ondelete="CASCADE"), index=True)
-    packaging_id = Column(Integer, ForeignKey("packaging_details_operations.id", ondelete="CASCADE"), index=True)
-    total_bags = Column(Integer, index=True)
-    returned_bags = Column(Integer, index=True)
-    remaining_bags = Column(Integer, index=True)
-    bags_status = Column(Enum(BagsStatus), default=BagsStatus.ACTIVE, index=True)
+    # Bag return lookup by transaction and packaging
+    __table_args__ = (Index("ix_bag_details_transaction_id_packaging_id", "transaction_id", "packaging_id"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    transaction_id = Column(Integer, ForeignKey("transaction_mill_operations.id", ondelete="CASCADE"))
+    packaging_id = Column(Integer, ForeignKey("packaging_details_operations.id", ondelete="CASCADE"))
+    total_bags = Column(Integer)
+    returned_bags = Column(Integer)
+    remaining_bags = Column(Integer)
+    bags_status = Column(Enum(BagsStatus), default=BagsStatus.ACTIVE)
 
     transaction_mill_operations = relationship("TransactionMillOperations", back_populates="bag_details")
     packaging = relationship("app.modules.master_data.models.PackagingDetails", back_populates="bag_details")
@@ -1,8 +1,10 @@
+import functools
 from typing import List, Optional, Any
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, or_
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, or_, select
 from datetime import date, datetime
-from app.core.repository import BaseRepository
+from app.core.repository import AsyncBaseRepository, BaseRepository, Page, paginate, paginate_async
 from app.modules.inventory.models import (
     IncomingOutgoing, IncomingOutgoingItems, IncomingOutgoingPayment,
     TransactionMillOperations, TransactionStockItem, TransactionPaymentDetails,
@@ -21,8 +23,173 @@ from app.modules.master_data.models import (
 )
 from app.modules.users.models import User
 
+def _filter_transactions(
+    query,
+    *,
+    party_name: Optional[str] = None,
+    broker_name: Optional[str] = None,
+    transporter_name: Optional[str] = None,
+    stock_item_name: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    transaction_type: Optional[bool] = None
+):
+    # Works on both a legacy `Query` and a 2.0 `select()` so sync and async paths share the filters
+    if party_name:
+        query = query.join(PartyDetails).filter(PartyDetails.party_name.ilike(f"%{party_name}%"))
+    if broker_name:
+        query = query.join(BrokerDetails).filter(BrokerDetails.broker_name.ilike(f"%{broker_name}%"))
+    if transporter_name:
+        query = query.join(TransportorDetails).filter(TransportorDetails.transportor_name.ilike(f"%{transporter_name}%"))
+    if stock_item_name:
+        # EXISTS rather than a join so a transaction with several matching items stays one row (keeps LIMIT exact)
+        query = query.filter(TransactionMillOperations.transaction_stock_items.any(
+            TransactionStockItem.stock_items.has(StockItems.stock_item_name.ilike(f"%{stock_item_name}%"))
+        ))
+    if start_date:
+        query = query.filter(TransactionMillOperations.transaction_date >= start_date)
+    if end_date:
+        query = query.filter(TransactionMillOperations.transaction_date <= end_date)
+    if transaction_type is not None:
+        query = query.filter(TransactionMillOperations.transaction_type == transaction_type)
+    return query
+
+
+def _stock_ledger_columns():
+    return (
+        GodownDetails.godown_name.label("godown_name"),
+        StockItems.stock_item_name.label("stock_item_name"),
+        func.sum(StockLedger.stock_quantity_bags).label("total_bags"),
+        func.sum(StockLedger.stock_weight_quintal).label("total_weight_quintal")
+    )
+
+
+def _filter_stock_ledger(query, *, godown_name: Optional[str] = None, stock_item_name: Optional[str] = None):
+    if godown_name:
+        query = query.filter(GodownDetails.godown_name.ilike(f"%{godown_name}%"))
+    if stock_item_name:
+        query = query.filter(StockItems.stock_item_name.ilike(f"%{stock_item_name}%"))
+    return query
+
+
+# Loader options are built on first use (and cached): building them configures the
+# mappers, which fails at import time while string-referenced models are missing
+@functools.lru_cache(maxsize=None)
+def _sales_packaging_options():
+    return (
+        joinedload(TransactionMillOperations.transaction_packaging_details).joinedload(TransactionPackagingDetails.packaging),
+        joinedload(TransactionMillOperations.transaction_unloading_point_details).joinedload(TransactionUnloadingPointDetails.godown),
+        joinedload(TransactionMillOperations.transaction_stock_items).joinedload(TransactionStockItem.stock_items),
+    )
+
+
+def _filter_sales_transactions(query, *, godown_name: Optional[str] = None, stock_item_name: Optional[str] = None):
+    if godown_name:
+        query = query.join(TransactionUnloadingPointDetails).join(GodownDetails).filter(GodownDetails.godown_name.ilike(f"%{godown_name}%"))
+    if stock_item_name:
+        # EXISTS rather than a join so a transaction with several matching items stays one row (keeps LIMIT exact)
+        query = query.filter(TransactionMillOperations.transaction_stock_items.any(
+            TransactionStockItem.stock_items.has(StockItems.stock_item_name.ilike(f"%{stock_item_name}%"))
+        ))
+    return query
+
+
+def build_stock_summary(results, sales_transactions) -> dict:
+    """
+    Combine raw ledger totals per (godown, stock item) with the packaging weight
+    carried out by sales, grouped per godown with a grand total.
+    """
+    # Compute packaging weight adjustments for all sales (transaction_type == False).
+    bag_weight_adjustments = {}  # key: (godown_name, stock_item_name) -> quintals to subtract
+    for tx in sales_transactions:
+        pkgs = tx.transaction_packaging_details or []
+        unloads = tx.transaction_unloading_point_details or []
+        t_stock_items = tx.transaction_stock_items or []
+
+        total_pack_bags = sum((p.bag_nos or 0) for p in pkgs) if pkgs else 0
+        total_bag_weight_grams = 0
+        for p in pkgs:
+            if getattr(p, "packaging", None) and getattr(p.packaging, "bag_weight", None):
+                total_bag_weight_grams += (p.packaging.bag_weight or 0) * (p.bag_nos or 0)
+
+        total_unload_bags = sum((u.number_of_bags or 0) for u in unloads) if unloads else 0
+        if total_unload_bags == 0 or not t_stock_items:
+            continue
+
+        total_stock_bags_in_txn = sum((si.number_of_bags or 0) for si in t_stock_items) if t_stock_items else 0
+        
+        for u in unloads:
+            godown = getattr(u, "godown", None)
+            if not godown:
+                continue
+            unload_bags = (u.number_of_bags or 0)
+            
+            if total_stock_bags_in_txn == 0:
+                base = unload_bags // len(t_stock_items)
+                remainder = unload_bags % len(t_stock_items)
+                item_allocations = [(si, base + (1 if idx < remainder else 0)) for idx, si in enumerate(t_stock_items)]
+            else:
+                remaining_bags_to_assign = unload_bags
+                item_allocations = []
+                for idx, si in enumerate(t_stock_items):
+                    if idx < len(t_stock_items) - 1:
+                        proportion = ((si.number_of_bags or 0) / total_stock_bags_in_txn)
+                        item_bags_for_unload = int(proportion * unload_bags)
+                        item_bags_for_unload = min(item_bags_for_unload, remaining_bags_to_assign)
+                    else:
+                        item_bags_for_unload = remaining_bags_to_assign
+                    
+                    remaining_bags_to_assign -= item_bags_for_unload
+                    item_allocations.append((si, item_bags_for_unload))
+
+            for si, item_bags_for_unload in item_allocations:
+                if item_bags_for_unload <= 0:
+                    continue
+                    
+                allocated_bag_weight_grams = total_bag_weight_grams * (item_bags_for_unload / total_unload_bags)
+                allocated_quintal = allocated_bag_weight_grams / 100000.0
+                
+                key = (godown.godown_name, si.stock_items.stock_item_name if si.stock_items else None)
+                bag_weight_adjustments[key] = bag_weight_adjustments.get(key, 0.0) + allocated_quintal
+
+    godown_totals = {}
+    for row in results:
+        godown = row.godown_name
+        item_name = row.stock_item_name
+        if godown not in godown_totals:
+            godown_totals[godown] = {
+                "godown_name": godown,
+                "items": [],
+                "total_bags": 0,
+                "total_weight_quintal": 0.0
+            }
+
+        adj = bag_weight_adjustments.get((godown, item_name), 0.0)
+        adjusted_weight_quintal = float(((row.total_weight_quintal or 0) - adj))
+
+        godown_totals[godown]["items"].append({
+            "stock_item_name": item_name,
+            "bags": int(row.total_bags or 0),
+            "weight_quintal": adjusted_weight_quintal
+        })
+
+        godown_totals[godown]["total_bags"] += int(row.total_bags or 0)
+        godown_totals[godown]["total_weight_quintal"] += adjusted_weight_quintal
+
+    grand_total_bags = sum(g["total_bags"] for g in godown_totals.values())
+    grand_total_weight = sum(g["total_weight_quintal"] for g in godown_totals.values())
+
+    return {
+        "summary": list(godown_totals.values()),
+        "grand_total": {
+            "total_bags": grand_total_bags,
+            "total_weight_quintal": grand_total_weight
+        }
+    }
+
+
 class IncomingOutgoingRepository(BaseRepository[IncomingOutgoing, IncomingOutgoingCreate, IncomingOutgoingUpdate]):
-    def get_multi_with_filters(
+    def _filtered_query(
         self,
         db: Session,
         *,
@@ -32,7 +199,7 @@ class IncomingOutgoingRepository(BaseRepository[IncomingOutgoing, IncomingOutgoi
         from_date: Optional[date] = None,
         to_date: Optional[date] = None,
         is_incoming: Optional[bool] = None
-    ) -> List[IncomingOutgoing]:
+    ):
         query = db.query(IncomingOutgoing).options(
             joinedload(IncomingOutgoing.incoming_outgoing_items),
             joinedload(IncomingOutgoing.users),
@@ -54,7 +221,18 @@ class IncomingOutgoingRepository(BaseRepository[IncomingOutgoing, IncomingOutgoi
         if vehicle_no:
             query = query.filter(IncomingOutgoing.vehicle_no.ilike(f"%{vehicle_no}%"))
 
-        return query.all()
+        return query
+
+    def get_multi_with_filters(self, db: Session, **filters) -> List[IncomingOutgoing]:
+        return self._filtered_query(db, **filters).all()
+
+    def get_page_with_filters(
+        self, db: Session, *, limit: Optional[int], cursor: Optional[str] = None, with_total: bool = False, **filters
+    ) -> Page[IncomingOutgoing]:
+        return paginate(
+            self._filtered_query(db, **filters), IncomingOutgoing,
+            limit=limit, cursor=cursor, with_total=with_total
+        )
 
     def get_by_id(self, db: Session, id: int) -> Optional[IncomingOutgoing]:
         return db.query(IncomingOutgoing).options(
@@ -67,34 +245,24 @@ class IncomingOutgoingRepository(BaseRepository[IncomingOutgoing, IncomingOutgoi
     ) -> IncomingOutgoing:
         # Extract non-nested fields
         incoming_data = obj_in.model_dump(exclude={"incoming_outgoing_items", "incoming_outgoing_payment"})
-        
-        db_obj = IncomingOutgoing(**incoming_data)
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-
-        # Create nested items
-        if obj_in.incoming_outgoing_items:
-            for item in obj_in.incoming_outgoing_items:
-                db_item = IncomingOutgoingItems(
-                    incoming_outgoing_id=db_obj.id,
-                    **item.model_dump()
-                )
-                db.add(db_item)
 
-        # Create nested payments
-        if obj_in.incoming_outgoing_payment:
-            for payment in obj_in.incoming_outgoing_payment:
-                db_payment = IncomingOutgoingPayment(
-                    incoming_outgoing_id=db_obj.id,
+        # Nested rows go in through the relationships so parent and children are written in one
+        # commit and the collections are already populated for the response
+        db_obj = IncomingOutgoing(
+            **incoming_data,
+            incoming_outgoing_items=[
+                IncomingOutgoingItems(**item.model_dump())
+                for item in obj_in.incoming_outgoing_items or []
+            ],
+            incoming_outgoing_payment=[
+                IncomingOutgoingPayment(
                     payment_amount=payment.payment_amount or 0,
                     payment_date=payment.payment_date
                 )
-                db.add(db_payment)
-
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+                for payment in obj_in.incoming_outgoing_payment or []
+            ]
+        )
+        return self.save(db, db_obj)
 
     def update_with_items(
         self, db: Session, *, db_obj: IncomingOutgoing, obj_in: IncomingOutgoingUpdate
@@ -104,31 +272,21 @@ class IncomingOutgoingRepository(BaseRepository[IncomingOutgoing, IncomingOutgoi
         for field in update_data:
             setattr(db_obj, field, update_data[field])
 
-        # Update nested items
+        # Replacing the collections deletes the old rows (delete-orphan) and keeps the
+        # in-memory object in step with the database
         if obj_in.incoming_outgoing_items is not None:
-            # Delete existing
-            db.query(IncomingOutgoingItems).filter(IncomingOutgoingItems.incoming_outgoing_id == db_obj.id).delete()
-            # Add new
-            for item in obj_in.incoming_outgoing_items:
-                db_item = IncomingOutgoingItems(
-                    incoming_outgoing_id=db_obj.id,
-                    **item.model_dump()
-                )
-                db.add(db_item)
+            db_obj.incoming_outgoing_items = [
+                IncomingOutgoingItems(**item.model_dump())
+                for item in obj_in.incoming_outgoing_items
+            ]
 
-        # Update nested payments
         if obj_in.incoming_outgoing_payment is not None:
-            db.query(IncomingOutgoingPayment).filter(IncomingOutgoingPayment.incoming_outgoing_id == db_obj.id).delete()
-            for payment in obj_in.incoming_outgoing_payment:
-                db_payment = IncomingOutgoingPayment(
-                    incoming_outgoing_id=db_obj.id,
-                    **payment.model_dump()
-                )
-                db.add(db_payment)
+            db_obj.incoming_outgoing_payment = [
+                IncomingOutgoingPayment(**payment.model_dump())
+                for payment in obj_in.incoming_outgoing_payment
+            ]
 
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return self.save(db, db_obj)
 
 
 class TransactionRepository(BaseRepository[TransactionMillOperations, Any, Any]):
@@ -158,21 +316,16 @@ class TransactionRepository(BaseRepository[TransactionMillOperations, Any, Any])
             joinedload(TransactionMillOperations.weight_bridge_operator),
         )
 
-        if party_name:
-            query = query.join(PartyDetails).filter(PartyDetails.party_name.ilike(f"%{party_name}%"))
-        if broker_name:
-            query = query.join(BrokerDetails).filter(BrokerDetails.broker_name.ilike(f"%{broker_name}%"))
-        if transporter_name:
-            query = query.join(TransportorDetails).filter(TransportorDetails.transportor_name.ilike(f"%{transporter_name}%"))
-        if stock_item_name:
-            query = query.join(TransactionStockItem).join(StockItems).filter(StockItems.stock_item_name.ilike(f"%{stock_item_name}%"))
-        if start_date:
-            query = query.filter(TransactionMillOperations.transaction_date >= start_date)
-        if end_date:
-            query = query.filter(TransactionMillOperations.transaction_date <= end_date)
-        if transaction_type is not None:
-            query = query.filter(TransactionMillOperations.transaction_type == transaction_type)
-
+        query = _filter_transactions(
+            query,
+            party_name=party_name,
+            broker_name=broker_name,
+            transporter_name=transporter_name,
+            stock_item_name=stock_item_name,
+            start_date=start_date,
+            end_date=end_date,
+            transaction_type=transaction_type
+        )
         return query.all()
 
     def get_by_id(self, db: Session, id: int) -> Optional[TransactionMillOperations]:
@@ -185,6 +338,12 @@ class TransactionRepository(BaseRepository[TransactionMillOperations, Any, Any])
             joinedload(TransactionMillOperations.transaction_packaging_details)
         ).filter(TransactionMillOperations.id == id).first()
 
+    def reload_for_response(self, db: Session, id: int) -> TransactionMillOperations:
+        """Re-read a transaction with everything its response walks, so it serializes after the session closes"""
+        return db.query(TransactionMillOperations).options(*_transaction_response_options()).populate_existing().filter(
+            TransactionMillOperations.id == id
+        ).one()
+
     def get_stock_summary(
         self,
         db: Session,
@@ -192,127 +351,83 @@ class TransactionRepository(BaseRepository[TransactionMillOperations, Any, Any])
         stock_item_name: Optional[str] = None
     ):
         # 1. Query the raw stock ledger totals (Bags & Weight)
-        query = db.query(
-            GodownDetails.godown_name.label("godown_name"),
-            StockItems.stock_item_name.label("stock_item_name"),
-            func.sum(StockLedger.stock_quantity_bags).label("total_bags"),
-            func.sum(StockLedger.stock_weight_quintal).label("total_weight_quintal")
-        ).join(
+        query = db.query(*_stock_ledger_columns()).join(
             GodownDetails, GodownDetails.id == StockLedger.godown_id
         ).join(
             StockItems, StockItems.id == StockLedger.stock_item_id
         ).group_by(
             GodownDetails.godown_name, StockItems.stock_item_name
         )
-
-        if godown_name:
-            query = query.filter(GodownDetails.godown_name.ilike(f"%{godown_name}%"))
-
-        if stock_item_name:
-            query = query.filter(StockItems.stock_item_name.ilike(f"%{stock_item_name}%"))
-
+        query = _filter_stock_ledger(query, godown_name=godown_name, stock_item_name=stock_item_name)
         results = query.all()
 
-        # 2. Compute packaging weight adjustments for all sales (transaction_type == False).
-        bag_weight_adjustments = {}  # key: (godown_name, stock_item_name) -> quintals to subtract
-        sales_txn_q = db.query(TransactionMillOperations).options(
-            joinedload(TransactionMillOperations.transaction_packaging_details).joinedload(TransactionPackagingDetails.packaging),
-            joinedload(TransactionMillOperations.transaction_unloading_point_details).joinedload(TransactionUnloadingPointDetails.godown),
-            joinedload(TransactionMillOperations.transaction_stock_items).joinedload(TransactionStockItem.stock_items),
-        ).filter(TransactionMillOperations.transaction_type == False)
-
-        if godown_name:
-            sales_txn_q = sales_txn_q.join(TransactionUnloadingPointDetails).join(GodownDetails).filter(GodownDetails.godown_name.ilike(f"%{godown_name}%"))
-        if stock_item_name:
-            sales_txn_q = sales_txn_q.join(TransactionStockItem).join(StockItems).filter(StockItems.stock_item_name.ilike(f"%{stock_item_name}%"))
-
+        # 2. Sales transactions whose packaging weight has to be taken off the ledger weight
+        sales_txn_q = db.query(TransactionMillOperations).options(*_sales_packaging_options()).filter(
+            TransactionMillOperations.transaction_type == False
+        )
+        sales_txn_q = _filter_sales_transactions(sales_txn_q, godown_name=godown_name, stock_item_name=stock_item_name)
         sales_transactions = sales_txn_q.all()
 
-        for tx in sales_transactions:
-            pkgs = tx.transaction_packaging_details or []
-            unloads = tx.transaction_unloading_point_details or []
-            t_stock_items = tx.transaction_stock_items or []
+        return build_stock_summary(results, sales_transactions)
+
+
+
+# Everything the `TransactionMillOperations` response schema walks, including the
+# `user_login` hybrids on nested master data, since an AsyncSession (or a detached
+# object) cannot lazy load.
+def _transaction_response_options():
+    return (
+        selectinload(TransactionMillOperations.users),
+        selectinload(TransactionMillOperations.bag_details).joinedload(BagDetails.packaging).joinedload(PackagingDetails.users),
+        selectinload(TransactionMillOperations.transaction_allowance_deduction_details),
+        selectinload(TransactionMillOperations.transaction_payments_mill_operations),
+        selectinload(TransactionMillOperations.transaction_packaging_details)
+            .joinedload(TransactionPackagingDetails.packaging).joinedload(PackagingDetails.users),
+        selectinload(TransactionMillOperations.transaction_unloading_point_details)
+            .joinedload(TransactionUnloadingPointDetails.godown).joinedload(GodownDetails.users),
+        selectinload(TransactionMillOperations.transaction_stock_items)
+            .joinedload(TransactionStockItem.stock_items).joinedload(StockItems.users),
+    )
+
+
+class AsyncTransactionRepository(AsyncBaseRepository[TransactionMillOperations, Any, Any]):
+    async def get_multi_with_filters(self, db: AsyncSession, **filters) -> List[TransactionMillOperations]:
+        stmt = _filter_transactions(self._select(), **filters)
+        result = await db.execute(stmt)
+        return result.unique().scalars().all()
+
+    async def get_page_with_filters(
+        self, db: AsyncSession, *, limit: Optional[int], cursor: Optional[str] = None, with_total: bool = False, **filters
+    ) -> Page[TransactionMillOperations]:
+        return await paginate_async(
+            db, _filter_transactions(self._select(), **filters), TransactionMillOperations,
+            limit=limit, cursor=cursor, with_total=with_total
+        )
 
-            total_pack_bags = sum((p.bag_nos or 0) for p in pkgs) if pkgs else 0
-            total_bag_weight_grams = 0
-            for p in pkgs:
-                if getattr(p, "packaging", None) and getattr(p.packaging, "bag_weight", None):
-                    total_bag_weight_grams += (p.packaging.bag_weight or 0) * (p.bag_nos or 0)
+    async def get_stock_summary(
+        self,
+        db: AsyncSession,
+        godown_name: Optional[str] = None,
+        stock_item_name: Optional[str] = None
+    ):
+        ledger_stmt = select(*_stock_ledger_columns()).join(
+            GodownDetails, GodownDetails.id == StockLedger.godown_id
+        ).join(
+            StockItems, StockItems.id == StockLedger.stock_item_id
+        ).group_by(
+            GodownDetails.godown_name, StockItems.stock_item_name
+        )
+        ledger_stmt = _filter_stock_ledger(ledger_stmt, godown_name=godown_name, stock_item_name=stock_item_name)
+        results = (await db.execute(ledger_stmt)).all()
 
-            total_unload_bags = sum((u.number_of_bags or 0) for u in unloads) if unloads else 0
-            if total_unload_bags == 0 or not t_stock_items:
-                continue
+        sales_stmt = select(TransactionMillOperations).options(*_sales_packaging_options()).filter(
+            TransactionMillOperations.transaction_type == False
+        )
+        sales_stmt = _filter_sales_transactions(sales_stmt, godown_name=godown_name, stock_item_name=stock_item_name)
+        sales_transactions = (await db.execute(sales_stmt)).unique().scalars().all()
 
-            total_stock_bags_in_txn = sum((si.number_of_bags or 0) for si in t_stock_items) if t_stock_items else 0
-            
-            for u in unloads:
-                godown = getattr(u, "godown", None)
-                if not godown:
-                    continue
-                unload_bags = (u.number_of_bags or 0)
-                
-                if total_stock_bags_in_txn == 0:
-                    base = unload_bags // len(t_stock_items)
-                    remainder = unload_bags % len(t_stock_items)
-                    item_allocations = [(si, base + (1 if idx < remainder else 0)) for idx, si in enumerate(t_stock_items)]
-                else:
-                    remaining_bags_to_assign = unload_bags
-                    item_allocations = []
-                    for idx, si in enumerate(t_stock_items):
-                        if idx < len(t_stock_items) - 1:
-                            proportion = ((si.number_of_bags or 0) / total_stock_bags_in_txn)
-                            item_bags_for_unload = int(proportion * unload_bags)
-                            item_bags_for_unload = min(item_bags_for_unload, remaining_bags_to_assign)
-                        else:
-                            item_bags_for_unload = remaining_bags_to_assign
-                        
-                        remaining_bags_to_assign -= item_bags_for_unload
-                        item_allocations.append((si, item_bags_for_unload))
-
-                for si, item_bags_for_unload in item_allocations:
-                    if item_bags_for_unload <= 0:
-                        continue
-                        
-                    allocated_bag_weight_grams = total_bag_weight_grams * (item_bags_for_unload / total_unload_bags)
-                    allocated_quintal = allocated_bag_weight_grams / 100000.0
-                    
-                    key = (godown.godown_name, si.stock_items.stock_item_name if si.stock_items else None)
-                    bag_weight_adjustments[key] = bag_weight_adjustments.get(key, 0.0) + allocated_quintal
-
-        godown_totals = {}
-        for row in results:
-            godown = row.godown_name
-            item_name = row.stock_item_name
-            if godown not in godown_totals:
-                godown_totals[godown] = {
-                    "godown_name": godown,
-                    "items": [],
-                    "total_bags": 0,
-                    "total_weight_quintal": 0.0
-                }
-
-            adj = bag_weight_adjustments.get((godown, item_name), 0.0)
-            adjusted_weight_quintal = float(((row.total_weight_quintal or 0) - adj))
-
-            godown_totals[godown]["items"].append({
-                "stock_item_name": item_name,
-                "bags": int(row.total_bags or 0),
-                "weight_quintal": adjusted_weight_quintal
-            })
-
-            godown_totals[godown]["total_bags"] += int(row.total_bags or 0)
-            godown_totals[godown]["total_weight_quintal"] += adjusted_weight_quintal
-
-        grand_total_bags = sum(g["total_bags"] for g in godown_totals.values())
-        grand_total_weight = sum(g["total_weight_quintal"] for g in godown_totals.values())
-
-        return {
-            "summary": list(godown_totals.values()),
-            "grand_total": {
-                "total_bags": grand_total_bags,
-                "total_weight_quintal": grand_total_weight
-            }
-        }
+        return build_stock_summary(results, sales_transactions)
 
 incoming_outgoing_repository = IncomingOutgoingRepository(IncomingOutgoing)
 transaction_repository = TransactionRepository(TransactionMillOperations)
+async_transaction_repository = AsyncTransactionRepository(TransactionMillOperations, options=_transaction_response_options)
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import date
-from app.db.session import get_db
-from app.core.security import get_current_user
+from app.db.session import get_db, get_async_db, get_async_read_db
+from app.db.writer import run_write_async
+from app.core.security import get_current_user, get_current_user_async
+from app.core.pagination import AllRowsPageParams, page_response
 from app.modules.inventory.service import inventory_service
 from app.modules.inventory.schemas import (
     IncomingOutgoingRead, IncomingOutgoingCreate, IncomingOutgoingUpdate,
@@ -17,17 +20,22 @@ router = APIRouter()
 # --- Incoming Outgoing ---
 @router.get("/incoming_outgoing", response_model=List[IncomingOutgoingRead])
 def get_incoming_outgoing(
+    response: Response,
     brought_by: Optional[str] = None,
     vehicle_no: Optional[str] = None,
     party_through: Optional[str] = None,
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
     is_incoming: Optional[bool] = None,
+    page: AllRowsPageParams = Depends(),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    return inventory_service.get_incoming_outgoing(
+    result = inventory_service.get_incoming_outgoing_page(
         db,
+        limit=page.limit,
+        cursor=page.cursor,
+        with_total=page.include_total,
         brought_by=brought_by,
         vehicle_no=vehicle_no,
         party_through=party_through,
@@ -35,6 +43,7 @@ def get_incoming_outgoing(
         to_date=to_date,
         is_incoming=is_incoming
     )
+    return page_response(response, result)
 
 @router.get("/incoming_outgoing/{id}", response_model=IncomingOutgoingRead)
 def get_incoming_outgoing_by_id(
@@ -66,7 +75,8 @@ def update_incoming_outgoing(
 
 # --- Transactions ---
 @router.get("/transactions", response_model=List[TransactionMillOperations])
-def get_transactions(
+async def get_transactions(
+    response: Response,
     party_name: Optional[str] = None,
     broker_name: Optional[str] = None,
     transporter_name: Optional[str] = None,
@@ -74,11 +84,15 @@ def get_transactions(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     transaction_type: Optional[bool] = None,
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    page: AllRowsPageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async)
 ):
-    return inventory_service.get_transactions(
+    result = await inventory_service.get_transactions_page_async(
         db,
+        limit=page.limit,
+        cursor=page.cursor,
+        with_total=page.include_total,
         party_name=party_name,
         broker_name=broker_name,
         transporter_name=transporter_name,
@@ -87,6 +101,7 @@ def get_transactions(
         end_date=end_date,
         transaction_type=transaction_type
     )
+    return page_response(response, result)
 
 @router.get("/transactions/{id}", response_model=TransactionMillOperations)
 def get_transaction_by_id(
@@ -100,12 +115,17 @@ def get_transaction_by_id(
     return item
 
 @router.post("/transactions", response_model=TransactionMillOperations)
-def create_transaction(
+async def create_transaction(
     transaction: TransactionMillOperationsCreate,
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user_async)
 ):
-    return inventory_service.create_transaction(db, transaction)
+    def create(db):
+        created = inventory_service.create_transaction(db, transaction)
+        # Load what the response walks while the writer's session is open
+        return inventory_service.reload_transaction(db, created.id)
+
+    # Validated after the commit, so a serialization error cannot roll back the write
+    return TransactionMillOperations.model_validate(await run_write_async(create))
 
 # @router.put("/transactions/{id}", response_model=TransactionMillOperations)
 # def update_transaction(
@@ -117,13 +137,13 @@ def create_transaction(
 #     return inventory_service.update_transaction(db, id, transaction)
 
 @router.get("/stock_summary")
-def get_stock_summary(
+async def get_stock_summary(
     godown_name: Optional[str] = None,
     stock_item_name: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: dict = Depends(get_current_user_async)
 ):
-    return inventory_service.get_stock_summary(db, godown_name=godown_name, stock_item_name=stock_item_name)
+    return await inventory_service.get_stock_summary_async(db, godown_name=godown_name, stock_item_name=stock_item_name)
 
 @router.post("/transactions/{id}/return_bags", response_model=List[BagDetailsOut])
 def return_bags(
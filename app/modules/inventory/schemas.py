@@ -261,6 +261,15 @@ class BagDetailsOut(BaseModel):
     total_bags: int
     returned_bags: int
 
+    class Config:
+        from_attributes = True
+
 class BagReturnRequest(BaseModel):
     packaging_name: str
     returned_count: int
+
+# The transaction request/response schemas still live with the legacy endpoints;
+# re-exported so the inventory router and service share them
+from app.schemas.transaction import (  # noqa: E402,F401
+    TransactionMillOperationsCreate, TransactionMillOperationsUpdate, TransactionMillOperations
+)
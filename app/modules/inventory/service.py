@@ -1,18 +1,26 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Any
 from datetime import date
 from fastapi import HTTPException
-from app.modules.inventory.repository import incoming_outgoing_repository, transaction_repository
+from app.core.tracing import span, traced
+from app.db.retry import retry_on_busy
+from app.modules.inventory.repository import (
+    incoming_outgoing_repository, transaction_repository, async_transaction_repository
+)
 from app.modules.inventory.schemas import (
     IncomingOutgoingCreate, IncomingOutgoingUpdate,
     TransactionMillOperationsCreate, TransactionMillOperationsUpdate,
     BagReturnRequest
 )
 from app.modules.inventory.models import (
-    TransactionMillOperations, StockItems, GodownDetails, PackagingDetails,
+    TransactionMillOperations,
     TransactionStockItem, TransactionPaymentDetails, TransactionPackagingDetails,
     BagDetails, BagsStatus, TransactionAllowanceDeductionsDetails,
-    TransactionUnloadingPointDetails, StockLedger, PartyDetails, BrokerDetails,
+    TransactionUnloadingPointDetails, StockLedger
+)
+from app.modules.master_data.models import (
+    StockItems, GodownDetails, PackagingDetails, PartyDetails, BrokerDetails,
     TransportorDetails, WeightBridgeOperator
 )
 from sqlalchemy.exc import SQLAlchemyError
@@ -26,6 +34,9 @@ class InventoryService:
     def get_incoming_outgoing(self, db: Session, **kwargs):
         return incoming_outgoing_repository.get_multi_with_filters(db, **kwargs)
 
+    def get_incoming_outgoing_page(self, db: Session, **kwargs):
+        return incoming_outgoing_repository.get_page_with_filters(db, **kwargs)
+
     def get_incoming_outgoing_by_id(self, db: Session, id: int):
         return incoming_outgoing_repository.get_by_id(db, id)
 
@@ -42,40 +53,55 @@ class InventoryService:
     def get_transactions(self, db: Session, **kwargs):
         return transaction_repository.get_multi_with_filters(db, **kwargs)
 
+    async def get_transactions_async(self, db: AsyncSession, **kwargs):
+        return await async_transaction_repository.get_multi_with_filters(db, **kwargs)
+
+    async def get_transactions_page_async(self, db: AsyncSession, **kwargs):
+        return await async_transaction_repository.get_page_with_filters(db, **kwargs)
+
     def get_transaction_by_id(self, db: Session, id: int):
         return transaction_repository.get_by_id(db, id)
 
+    def reload_transaction(self, db: Session, id: int):
+        return transaction_repository.reload_for_response(db, id)
+
+    @traced()
+    @retry_on_busy
     def create_transaction(self, db: Session, transaction: TransactionMillOperationsCreate):
         # Validation
-        db_party = db.query(PartyDetails).filter_by(party_name=transaction.party_name).first()
-        if not db_party:
-            raise HTTPException(status_code=400, detail="The person doesn't exist in the party list.")
-
-        db_broker = db.query(BrokerDetails).filter_by(broker_name=transaction.broker_name).first()
-        if not db_broker:
-            raise HTTPException(status_code=400, detail="The person doesn't exist in the broker list.")
-
-        db_transportor = db.query(TransportorDetails).filter_by(transportor_name=transaction.transportor_name).first()
-        if not db_transportor:
-            raise HTTPException(status_code=400, detail="The person doesn't exist in the transportor list.")
-
-        db_operator = db.query(WeightBridgeOperator).filter_by(operator_name=transaction.operator_name).first()
-        if not db_operator:
-            raise HTTPException(status_code=400, detail="The person doesn't exist in the weight bridge operator list.")
-
-        stock_items = []
-        for item in transaction.transaction_stock_items:
-            db_item = db.query(StockItems).filter_by(stock_item_name=item.stock_item_name).first()
-            if not db_item:
-                raise HTTPException(status_code=400, detail=f"Stock item '{item.stock_item_name}' does not exist.")
-            stock_items.append((db_item, item))
-
-        for unload in transaction.unloadings:
-            db_godown = db.query(GodownDetails).filter_by(id=unload.godown_id).first()
-            if not db_godown:
-                raise HTTPException(status_code=400, detail=f"Godown with ID {unload.godown_id} does not exist.")
-
-        # Create Transaction
+        with span("validate references"):
+            db_party = db.query(PartyDetails).filter_by(party_name=transaction.party_name).first()
+            if not db_party:
+                raise HTTPException(status_code=400, detail="The person doesn't exist in the party list.")
+
+            db_broker = db.query(BrokerDetails).filter_by(broker_name=transaction.broker_name).first()
+            if not db_broker:
+                raise HTTPException(status_code=400, detail="The person doesn't exist in the broker list.")
+
+            db_transportor = db.query(TransportorDetails).filter_by(transportor_name=transaction.transportor_name).first()
+            if not db_transportor:
+                raise HTTPException(status_code=400, detail="The person doesn't exist in the transportor list.")
+
+            db_operator = db.query(WeightBridgeOperator).filter_by(operator_name=transaction.operator_name).first()
+            if not db_operator:
+                raise HTTPException(status_code=400, detail="The person doesn't exist in the weight bridge operator list.")
+
+            stock_items = []
+            for item in transaction.transaction_stock_items:
+                db_item = db.query(StockItems).filter_by(stock_item_name=item.stock_item_name).first()
+                if not db_item:
+                    raise HTTPException(status_code=400, detail=f"Stock item '{item.stock_item_name}' does not exist.")
+                stock_items.append((db_item, item))
+
+            for unload in transaction.unloadings:
+                db_godown = db.query(GodownDetails).filter_by(id=unload.godown_id).first()
+                if not db_godown:
+                    raise HTTPException(status_code=400, detail=f"Godown with ID {unload.godown_id} does not exist.")
+
+        # Create Transaction. Children are attached through the relationships (not by
+        # transaction_id) so the whole graph is flushed in one go at commit and the
+        # response is built from memory; the empty lists keep those collections from
+        # lazy loading later.
         db_transaction = TransactionMillOperations(
             user_login_id=transaction.user_login_id,
             rst_number=transaction.rst_number,
@@ -90,29 +116,32 @@ class InventoryService:
             weight_bridge_operator_id=db_operator.id,
             vehicle_number=transaction.vehicle_number,
             remarks=transaction.remarks,
+            transaction_stock_items=[],
+            transaction_payments_mill_operations=[],
+            transaction_packaging_details=[],
+            bag_details=[],
+            transaction_allowance_deduction_details=[],
+            transaction_unloading_point_details=[],
         )
         db.add(db_transaction)
-        db.flush()
 
         # Add Stock Items
         trans_stock_objs = []
         total_stock_bags_in_txn = 0
         for db_item, item in stock_items:
             tsi = TransactionStockItem(
-                transaction_id=db_transaction.id,
-                stock_item_id=db_item.id,
+                stock_items=db_item,
                 number_of_bags=item.number_of_bags,
                 weight=item.weight,
                 rate=item.rate
             )
-            db.add(tsi)
+            db_transaction.transaction_stock_items.append(tsi)
             trans_stock_objs.append((db_item, item))
             total_stock_bags_in_txn += (item.number_of_bags or 0)
 
         # Add Payments
         for payment in transaction.payments:
-            db.add(TransactionPaymentDetails(
-                transaction_id=db_transaction.id,
+            db_transaction.transaction_payments_mill_operations.append(TransactionPaymentDetails(
                 payment_amount=payment.payment_amount,
                 payment_date=payment.payment_date,
                 payment_remarks=payment.payment_remarks
@@ -123,15 +152,13 @@ class InventoryService:
             db_packaging = db.query(PackagingDetails).filter_by(packaging_name=packaging.packaging_name).first()
             if not db_packaging:
                 raise HTTPException(status_code=400, detail=f"Packaging '{packaging.packaging_name}' does not exist.")
-            db.add(TransactionPackagingDetails(
-                transaction_id=db_transaction.id,
-                packaging_id=db_packaging.id,
+            db_transaction.transaction_packaging_details.append(TransactionPackagingDetails(
+                packaging=db_packaging,
                 bag_nos=packaging.bag_nos
             ))
             
-            db.add(BagDetails(
-                transaction_id=db_transaction.id,
-                packaging_id=db_packaging.id,
+            db_transaction.bag_details.append(BagDetails(
+                packaging=db_packaging,
                 total_bags=packaging.bag_nos,
                 returned_bags=0,
                 remaining_bags=packaging.bag_nos,
@@ -140,8 +167,7 @@ class InventoryService:
 
         # Add Allowances/Deductions
         for allowance in transaction.allowances_deductions:
-            db.add(TransactionAllowanceDeductionsDetails(
-                transaction_id=db_transaction.id,
+            db_transaction.transaction_allowance_deduction_details.append(TransactionAllowanceDeductionsDetails(
                 is_allowance=allowance.is_allowance,
                 allowance_deduction_name=allowance.allowance_deduction_name,
                 allowance_deduction_amount=allowance.allowance_deduction_amount,
@@ -149,94 +175,63 @@ class InventoryService:
             ))
 
         # Stock Ledger Logic
-        total_pack_bags = sum((p.bag_nos or 0) for p in transaction.packagings) if transaction.packagings else 0
-        total_bag_weight_grams = 0
-        for packaging in transaction.packagings:
-            db_pack = db.query(PackagingDetails).filter_by(packaging_name=packaging.packaging_name).first()
-            if db_pack:
-                total_bag_weight_grams += (db_pack.bag_weight or 0) * (packaging.bag_nos or 0)
-        total_bag_weight_kg = total_bag_weight_grams / 1000.0 if total_bag_weight_grams else 0.0
-
-        total_unload_bags = sum((u.number_of_bags or 0) for u in transaction.unloadings) if transaction.unloadings else 0
-        net_weight_total_kg = (transaction.gross_weight or 0) - (transaction.tare_weight or 0)
-
-        weight_per_bag_including_pack_kg = (net_weight_total_kg / total_unload_bags) if total_unload_bags else 0.0
-        bag_weight_per_bag_kg = (total_bag_weight_kg / total_pack_bags) if total_pack_bags else 0.0
-        net_weight_per_bag_excluding_pack_kg = max(weight_per_bag_including_pack_kg - bag_weight_per_bag_kg, 0.0)
-        net_weight_per_bag_including_pack_kg = weight_per_bag_including_pack_kg
-
-        for unload in transaction.unloadings:
-            db_godown = db.query(GodownDetails).filter_by(id=unload.godown_id).with_for_update().first()
-            if not db_godown:
-                raise HTTPException(status_code=400, detail=f"Godown with ID {unload.godown_id} does not exist.")
+        with span("stock ledger"):
+            total_pack_bags = sum((p.bag_nos or 0) for p in transaction.packagings) if transaction.packagings else 0
+            total_bag_weight_grams = 0
+            for packaging in transaction.packagings:
+                db_pack = db.query(PackagingDetails).filter_by(packaging_name=packaging.packaging_name).first()
+                if db_pack:
+                    total_bag_weight_grams += (db_pack.bag_weight or 0) * (packaging.bag_nos or 0)
+            total_bag_weight_kg = total_bag_weight_grams / 1000.0 if total_bag_weight_grams else 0.0
+
+            total_unload_bags = sum((u.number_of_bags or 0) for u in transaction.unloadings) if transaction.unloadings else 0
+            net_weight_total_kg = (transaction.gross_weight or 0) - (transaction.tare_weight or 0)
+
+            weight_per_bag_including_pack_kg = (net_weight_total_kg / total_unload_bags) if total_unload_bags else 0.0
+            bag_weight_per_bag_kg = (total_bag_weight_kg / total_pack_bags) if total_pack_bags else 0.0
+            net_weight_per_bag_excluding_pack_kg = max(weight_per_bag_including_pack_kg - bag_weight_per_bag_kg, 0.0)
+            net_weight_per_bag_including_pack_kg = weight_per_bag_including_pack_kg
+
+            for unload in transaction.unloadings:
+                db_godown = db.query(GodownDetails).filter_by(id=unload.godown_id).with_for_update().first()
+                if not db_godown:
+                    raise HTTPException(status_code=400, detail=f"Godown with ID {unload.godown_id} does not exist.")
             
-            db.add(TransactionUnloadingPointDetails(
-                transaction_id=db_transaction.id,
-                godown_id=db_godown.id,
-                number_of_bags=unload.number_of_bags,
-                remarks=unload.remarks
-            ))
-
-            unload_bags = (unload.number_of_bags or 0)
+                db_transaction.transaction_unloading_point_details.append(TransactionUnloadingPointDetails(
+                    godown=db_godown,
+                    number_of_bags=unload.number_of_bags,
+                    remarks=unload.remarks
+                ))
 
-            if total_stock_bags_in_txn > 0:
-                remaining_bags_to_assign = unload_bags
-                for idx, (db_item, item) in enumerate(trans_stock_objs):
-                    if idx < len(trans_stock_objs) - 1:
-                        proportion = ((item.number_of_bags or 0) / total_stock_bags_in_txn) if total_stock_bags_in_txn else 0
-                        item_bags_for_unload = int(proportion * unload_bags)
-                        item_bags_for_unload = min(item_bags_for_unload, remaining_bags_to_assign)
-                    else:
-                        item_bags_for_unload = remaining_bags_to_assign
+                unload_bags = (unload.number_of_bags or 0)
 
-                    remaining_bags_to_assign -= item_bags_for_unload
+                if total_stock_bags_in_txn > 0:
+                    remaining_bags_to_assign = unload_bags
+                    for idx, (db_item, item) in enumerate(trans_stock_objs):
+                        if idx < len(trans_stock_objs) - 1:
+                            proportion = ((item.number_of_bags or 0) / total_stock_bags_in_txn) if total_stock_bags_in_txn else 0
+                            item_bags_for_unload = int(proportion * unload_bags)
+                            item_bags_for_unload = min(item_bags_for_unload, remaining_bags_to_assign)
+                        else:
+                            item_bags_for_unload = remaining_bags_to_assign
 
-                    if item_bags_for_unload <= 0:
-                        continue
+                        remaining_bags_to_assign -= item_bags_for_unload
 
-                    if transaction.transaction_type:
-                        weight_per_bag_to_use = net_weight_per_bag_excluding_pack_kg
-                    else:
-                        weight_per_bag_to_use = net_weight_per_bag_including_pack_kg
-                    
-                    item_weight_quintal = (weight_per_bag_to_use * item_bags_for_unload) / 100.0
-                    
-                    ledger = db.query(StockLedger).filter_by(
-                        godown_id=unload.godown_id,
-                        stock_item_id=db_item.id
-                    ).with_for_update().first()
-
-                    if not ledger:
-                        ledger = StockLedger(
-                            godown_id=unload.godown_id,
-                            stock_item_id=db_item.id,
-                            stock_quantity_bags=0,
-                            stock_weight_quintal=0.0
-                        )
-                        db.add(ledger)
-                        db.flush()
-
-                    ledger.apply_stock_movement(transaction.transaction_type, item_bags_for_unload, item_weight_quintal)
-            else:
-                if trans_stock_objs:
-                    if transaction.transaction_type:
-                        weight_per_bag_to_use = net_weight_per_bag_excluding_pack_kg
-                    else:
-                        weight_per_bag_to_use = net_weight_per_bag_including_pack_kg
-                    
-                    base = unload_bags // len(trans_stock_objs)
-                    remainder = unload_bags % len(trans_stock_objs)
-                    for idx, (db_item, item) in enumerate(trans_stock_objs):
-                        item_bags_for_unload = base + (1 if idx < remainder else 0)
                         if item_bags_for_unload <= 0:
                             continue
-                            
-                        item_weight_quintal = (weight_per_bag_to_use * item_bags_for_unload) / 100.0
 
+                        if transaction.transaction_type:
+                            weight_per_bag_to_use = net_weight_per_bag_excluding_pack_kg
+                        else:
+                            weight_per_bag_to_use = net_weight_per_bag_including_pack_kg
+                    
+                        item_weight_quintal = (weight_per_bag_to_use * item_bags_for_unload) / 100.0
+                    
                         ledger = db.query(StockLedger).filter_by(
                             godown_id=unload.godown_id,
                             stock_item_id=db_item.id
                         ).with_for_update().first()
+
                         if not ledger:
                             ledger = StockLedger(
                                 godown_id=unload.godown_id,
@@ -248,10 +243,39 @@ class InventoryService:
                             db.flush()
 
                         ledger.apply_stock_movement(transaction.transaction_type, item_bags_for_unload, item_weight_quintal)
+                else:
+                    if trans_stock_objs:
+                        if transaction.transaction_type:
+                            weight_per_bag_to_use = net_weight_per_bag_excluding_pack_kg
+                        else:
+                            weight_per_bag_to_use = net_weight_per_bag_including_pack_kg
+                    
+                        base = unload_bags // len(trans_stock_objs)
+                        remainder = unload_bags % len(trans_stock_objs)
+                        for idx, (db_item, item) in enumerate(trans_stock_objs):
+                            item_bags_for_unload = base + (1 if idx < remainder else 0)
+                            if item_bags_for_unload <= 0:
+                                continue
+                            
+                            item_weight_quintal = (weight_per_bag_to_use * item_bags_for_unload) / 100.0
 
-        db.commit()
-        db.refresh(db_transaction)
-        return db_transaction
+                            ledger = db.query(StockLedger).filter_by(
+                                godown_id=unload.godown_id,
+                                stock_item_id=db_item.id
+                            ).with_for_update().first()
+                            if not ledger:
+                                ledger = StockLedger(
+                                    godown_id=unload.godown_id,
+                                    stock_item_id=db_item.id,
+                                    stock_quantity_bags=0,
+                                    stock_weight_quintal=0.0
+                                )
+                                db.add(ledger)
+                                db.flush()
+
+                            ledger.apply_stock_movement(transaction.transaction_type, item_bags_for_unload, item_weight_quintal)
+
+        return transaction_repository.save(db, db_transaction)
 
     def update_transaction(self, db: Session, transaction_id: int, updated_data: TransactionMillOperationsUpdate):
         # ... (Implement update logic similar to create, with reversal)
@@ -270,6 +294,9 @@ class InventoryService:
     def get_stock_summary(self, db: Session, **kwargs):
         return transaction_repository.get_stock_summary(db, **kwargs)
 
+    async def get_stock_summary_async(self, db: AsyncSession, **kwargs):
+        return await async_transaction_repository.get_stock_summary(db, **kwargs)
+
     def return_bags(self, db: Session, transaction_id: int, return_data: List[BagReturnRequest]):
         updated_records = []
         for item in return_data:
@@ -300,8 +327,6 @@ class InventoryService:
             updated_records.append(bag_detail)
 
         db.commit()
-        for record in updated_records:
-            db.refresh(record)
         return updated_records
 
 inventory_service = InventoryService()
@@ -6,13 +6,13 @@ from app.db.base import Base
 class PartyDetails(Base):
     __tablename__ = "party_details_operations"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    party_name = Column(String(30), index=True)
-    party_mob_no = Column(String(10), index=True)
-    party_address = Column(String(30), index=True)
-    party_type = Column(String(20), index=True)
-    remarks = Column(String(50), index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
+    party_name = Column(String(30), index=True, unique=True)
+    party_mob_no = Column(String(10))
+    party_address = Column(String(30))
+    party_type = Column(String(20))
+    remarks = Column(String(50))
+    user_login_id = Column(Integer, ForeignKey("users.id"))
 
     users = relationship("User", back_populates="party_details")
     transaction_mill_operations = relationship("TransactionMillOperations", back_populates="party", foreign_keys="[TransactionMillOperations.party_id]")
@@ -24,12 +24,12 @@ class PartyDetails(Base):
 class BrokerDetails(Base):
     __tablename__ = "broker_details_operations"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    broker_name = Column(String(30), index=True)
-    broker_mob_no = Column(String(10), index=True)
-    brokerage_rate = Column(Float, index=True, default=0.00)
-    remarks = Column(String(50), index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
+    broker_name = Column(String(30), index=True, unique=True)
+    broker_mob_no = Column(String(10))
+    brokerage_rate = Column(Float, default=0.00)
+    remarks = Column(String(50))
+    user_login_id = Column(Integer, ForeignKey("users.id"))
 
     users = relationship("User", back_populates="broker_details")
     transaction_mill_operations = relationship("TransactionMillOperations", back_populates="broker", foreign_keys="[TransactionMillOperations.broker_id]")
@@ -41,11 +41,11 @@ class BrokerDetails(Base):
 class TransportorDetails(Base):
     __tablename__ = "transportor_details_operations"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    transportor_name = Column(String(30), index=True)
-    transportor_mob_no = Column(String(10), index=True)
-    remarks = Column(String(50), index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
+    transportor_name = Column(String(30), index=True, unique=True)
+    transportor_mob_no = Column(String(10))
+    remarks = Column(String(50))
+    user_login_id = Column(Integer, ForeignKey("users.id"))
 
     users = relationship("User", back_populates="transportor_details")
     transaction_mill_operations = relationship("TransactionMillOperations", back_populates="transportor", foreign_keys="[TransactionMillOperations.transportor_id]")
@@ -57,12 +57,12 @@ class TransportorDetails(Base):
 class GodownDetails(Base):
     __tablename__ = "godown_details_operations"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    godown_name = Column(String(30), index=True)
-    godown_qtl_capacity = Column(Integer, index=True)
-    godown_bags_capacity = Column(Integer, index=True)
-    remarks = Column(String(50), index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
+    godown_name = Column(String(30), index=True, unique=True)
+    godown_qtl_capacity = Column(Integer)
+    godown_bags_capacity = Column(Integer)
+    remarks = Column(String(50))
+    user_login_id = Column(Integer, ForeignKey("users.id"))
 
     users = relationship("User", back_populates="godown_details")
     transaction_unloading_point_details = relationship("TransactionUnloadingPointDetails", back_populates="godown", foreign_keys="[TransactionUnloadingPointDetails.godown_id]")
@@ -74,10 +74,10 @@ class GodownDetails(Base):
 class StockItems(Base):
     __tablename__ = "stock_items_operations"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    stock_item_name = Column(String(30), index=True)
-    remarks = Column(String(50), index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
+    stock_item_name = Column(String(30), index=True, unique=True)
+    remarks = Column(String(50))
+    user_login_id = Column(Integer, ForeignKey("users.id"))
 
     users = relationship("User", back_populates="stock_items")
     transaction_stock_items = relationship("TransactionStockItem", back_populates="stock_items", foreign_keys="[TransactionStockItem.stock_item_id]")
@@ -90,12 +90,12 @@ class StockItems(Base):
 class PackagingDetails(Base):
     __tablename__ = "packaging_details_operations"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    packaging_name = Column(String(30), index=True)
-    bag_weight = Column(Integer, index=True)
-    packaging_unit = Column(String(4), index=True)
-    remarks = Column(String(50), index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
+    packaging_name = Column(String(30), index=True, unique=True)
+    bag_weight = Column(Integer)
+    packaging_unit = Column(String(4))
+    remarks = Column(String(50))
+    user_login_id = Column(Integer, ForeignKey("users.id"))
 
     users = relationship("User", back_populates="packaging_details")
     transaction_packaging_details = relationship("TransactionPackagingDetails", back_populates="packaging", foreign_keys="[TransactionPackagingDetails.packaging_id]")
@@ -108,12 +108,12 @@ class PackagingDetails(Base):
 class WeightBridgeOperator(Base):
     __tablename__ = "weight_bridge_operator_operations"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    operator_name = Column(String(30), index=True)
-    operator_mob_no = Column(String(10), index=True)
-    is_active = Column(Boolean, index=True)
-    remarks = Column(String(50), index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
+    operator_name = Column(String(30), index=True, unique=True)
+    operator_mob_no = Column(String(10))
+    is_active = Column(Boolean)
+    remarks = Column(String(50))
+    user_login_id = Column(Integer, ForeignKey("users.id"))
 
     users = relationship("User", back_populates="weight_bridge_operator")
     transaction_mill_operations = relationship("TransactionMillOperations", back_populates="weight_bridge_operator", foreign_keys="[TransactionMillOperations.weight_bridge_operator_id]")
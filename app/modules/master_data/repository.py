@@ -1,4 +1,6 @@
-from app.core.repository import BaseRepository
+import functools
+from sqlalchemy.orm import joinedload
+from app.core.repository import AsyncBaseRepository, BaseRepository
 from app.modules.master_data.models import (
     PartyDetails, BrokerDetails, TransportorDetails, GodownDetails,
     StockItems, PackagingDetails, WeightBridgeOperator
@@ -12,6 +14,7 @@ from app.modules.master_data.schemas import (
     PackagingCreate, PackagingUpdate,
     WeightBridgeOperatorCreate, WeightBridgeOperatorUpdate
 )
+from app.modules.users.models import User
 
 class PartyRepository(BaseRepository[PartyDetails, PartyCreate, PartyUpdate]):
     pass
@@ -34,10 +37,24 @@ class PackagingRepository(BaseRepository[PackagingDetails, PackagingCreate, Pack
 class WeightBridgeOperatorRepository(BaseRepository[WeightBridgeOperator, WeightBridgeOperatorCreate, WeightBridgeOperatorUpdate]):
     pass
 
-party_repository = PartyRepository(PartyDetails)
-broker_repository = BrokerRepository(BrokerDetails)
-transportor_repository = TransportorRepository(TransportorDetails)
-godown_repository = GodownRepository(GodownDetails)
-stock_item_repository = StockItemRepository(StockItems)
-packaging_repository = PackagingRepository(PackagingDetails)
-weight_bridge_operator_repository = WeightBridgeOperatorRepository(WeightBridgeOperator)
+party_repository = PartyRepository(PartyDetails, natural_key=("party_name",))
+broker_repository = BrokerRepository(BrokerDetails, natural_key=("broker_name",))
+transportor_repository = TransportorRepository(TransportorDetails, natural_key=("transportor_name",))
+godown_repository = GodownRepository(GodownDetails, natural_key=("godown_name",))
+stock_item_repository = StockItemRepository(StockItems, natural_key=("stock_item_name",))
+packaging_repository = PackagingRepository(PackagingDetails, natural_key=("packaging_name",))
+weight_bridge_operator_repository = WeightBridgeOperatorRepository(WeightBridgeOperator, natural_key=("operator_name",))
+
+# Async repositories eager load `users` so the `user_login` hybrid in every response schema
+# is available without a lazy load (which an AsyncSession cannot do). Passed as a function
+# so the options are only built on the first query, once every model is registered.
+def _user_login_options(model):
+    return (joinedload(model.users).load_only(User.user_login_id),)
+
+async_party_repository = AsyncBaseRepository(PartyDetails, options=functools.partial(_user_login_options, PartyDetails))
+async_broker_repository = AsyncBaseRepository(BrokerDetails, options=functools.partial(_user_login_options, BrokerDetails))
+async_transportor_repository = AsyncBaseRepository(TransportorDetails, options=functools.partial(_user_login_options, TransportorDetails))
+async_godown_repository = AsyncBaseRepository(GodownDetails, options=functools.partial(_user_login_options, GodownDetails))
+async_stock_item_repository = AsyncBaseRepository(StockItems, options=functools.partial(_user_login_options, StockItems))
+async_packaging_repository = AsyncBaseRepository(PackagingDetails, options=functools.partial(_user_login_options, PackagingDetails))
+async_weight_bridge_operator_repository = AsyncBaseRepository(WeightBridgeOperator, options=functools.partial(_user_login_options, WeightBridgeOperator))
@@ -1,31 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.db.session import get_db
-from app.core.security import get_current_user
+from app.db.session import get_db, get_async_db
+from app.core.security import get_current_user, get_current_user_async
+from app.core.pagination import AllRowsPageParams, page_response
 from app.modules.master_data import schemas
 from app.modules.master_data.service import (
     party_service, broker_service, transportor_service,
     godown_service, stock_item_service, packaging_service,
-    weight_bridge_operator_service
+    weight_bridge_operator_service,
+    async_party_service, async_broker_service, async_transportor_service,
+    async_godown_service, async_stock_item_service, async_packaging_service,
+    async_weight_bridge_operator_service
 )
 
 router = APIRouter()
 
 # --- Party Details ---
 @router.get("/get_party_details", response_model=List[schemas.PartyDetails], tags=["Party Details"])
-def get_party_details(
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user),
+async def get_party_details(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async),
     party_name: Optional[str] = None,
+    page: AllRowsPageParams = Depends(),
 ):
-    if party_name:
-        # Custom filter not in generic service yet, accessing repo directly or adding method to service
-        # For now, let's just do what we did before but using service/repo
-        return db.query(party_service.repository.model).filter(
-            party_service.repository.model.party_name.ilike(f"%{party_name}%")
-        ).all()
-    return party_service.get_multi(db)
+    result = await async_party_service.get_page(
+        db, limit=page.limit, cursor=page.cursor, with_total=page.include_total,
+        field="party_name", term=party_name
+    )
+    return page_response(response, result)
 
 @router.get("/get_party_details/{party_id}", response_model=schemas.PartyDetails, tags=["Party Details"])
 def get_party_detail(party_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -45,18 +50,30 @@ def update_party_details(party_id: int, party: schemas.PartyUpdate, db: Session
         raise HTTPException(status_code=404, detail="Party Details not found")
     return party_service.update(db, db_obj=db_party, obj_in=party)
 
+@router.post("/bulk_create_party_details", tags=["Party Details"])
+def bulk_create_party_details(parties: List[schemas.PartyCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = party_service.bulk_create(db, objs_in=parties, return_ids=True)
+    return {"detail": f"{len(ids)} Party Details created", "ids": ids}
+
+@router.put("/bulk_upsert_party_details", tags=["Party Details"])
+def bulk_upsert_party_details(parties: List[schemas.PartyCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = party_service.upsert_many(db, objs_in=parties)
+    return {"detail": f"{len(ids)} Party Details saved", "ids": ids}
+
 # --- Broker Details ---
 @router.get("/get_broker_details", response_model=List[schemas.BrokerDetails], tags=["Broker Details"])
-def get_broker_details(
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user),
+async def get_broker_details(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async),
     broker_name: Optional[str] = None,
+    page: AllRowsPageParams = Depends(),
 ):
-    if broker_name:
-        return db.query(broker_service.repository.model).filter(
-            broker_service.repository.model.broker_name.ilike(f"%{broker_name}%")
-        ).all()
-    return broker_service.get_multi(db)
+    result = await async_broker_service.get_page(
+        db, limit=page.limit, cursor=page.cursor, with_total=page.include_total,
+        field="broker_name", term=broker_name
+    )
+    return page_response(response, result)
 
 @router.get("/get_broker_details/{broker_id}", response_model=schemas.BrokerDetails, tags=["Broker Details"])
 def get_broker_detail(broker_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -76,18 +93,30 @@ def update_broker_details(broker_id: int, broker: schemas.BrokerUpdate, db: Sess
         raise HTTPException(status_code=404, detail="Broker Details not found")
     return broker_service.update(db, db_obj=db_broker, obj_in=broker)
 
+@router.post("/bulk_create_broker_details", tags=["Broker Details"])
+def bulk_create_broker_details(brokers: List[schemas.BrokerCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = broker_service.bulk_create(db, objs_in=brokers, return_ids=True)
+    return {"detail": f"{len(ids)} Broker Details created", "ids": ids}
+
+@router.put("/bulk_upsert_broker_details", tags=["Broker Details"])
+def bulk_upsert_broker_details(brokers: List[schemas.BrokerCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = broker_service.upsert_many(db, objs_in=brokers)
+    return {"detail": f"{len(ids)} Broker Details saved", "ids": ids}
+
 # --- Transporter Details ---
 @router.get("/get_transportor_details", response_model=List[schemas.TransportorDetails], tags=["Transportor Details"])
-def get_transportor_details(
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user),
+async def get_transportor_details(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async),
     transportor_name: Optional[str] = None,
+    page: AllRowsPageParams = Depends(),
 ):
-    if transportor_name:
-        return db.query(transportor_service.repository.model).filter(
-            transportor_service.repository.model.transportor_name.ilike(f"%{transportor_name}%")
-        ).all()
-    return transportor_service.get_multi(db)
+    result = await async_transportor_service.get_page(
+        db, limit=page.limit, cursor=page.cursor, with_total=page.include_total,
+        field="transportor_name", term=transportor_name
+    )
+    return page_response(response, result)
 
 @router.get("/get_transportor_details/{transportor_id}", response_model=schemas.TransportorDetails, tags=["Transportor Details"])
 def get_transportor_detail(transportor_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -107,18 +136,30 @@ def update_transportor_details(transportor_id: int, transportor: schemas.Transpo
         raise HTTPException(status_code=404, detail="Transportor Details not found")
     return transportor_service.update(db, db_obj=db_transportor, obj_in=transportor)
 
+@router.post("/bulk_create_transportor_details", tags=["Transportor Details"])
+def bulk_create_transportor_details(transportors: List[schemas.TransportorCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = transportor_service.bulk_create(db, objs_in=transportors, return_ids=True)
+    return {"detail": f"{len(ids)} Transportor Details created", "ids": ids}
+
+@router.put("/bulk_upsert_transportor_details", tags=["Transportor Details"])
+def bulk_upsert_transportor_details(transportors: List[schemas.TransportorCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = transportor_service.upsert_many(db, objs_in=transportors)
+    return {"detail": f"{len(ids)} Transportor Details saved", "ids": ids}
+
 # --- Godown Details ---
 @router.get("/get_godown_details", response_model=List[schemas.GodownDetails], tags=["Godown Details"])
-def get_godown_details(
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user),
+async def get_godown_details(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async),
     godown_name: Optional[str] = None,
+    page: AllRowsPageParams = Depends(),
 ):
-    if godown_name:
-        return db.query(godown_service.repository.model).filter(
-            godown_service.repository.model.godown_name.ilike(f"%{godown_name}%")
-        ).all()
-    return godown_service.get_multi(db)
+    result = await async_godown_service.get_page(
+        db, limit=page.limit, cursor=page.cursor, with_total=page.include_total,
+        field="godown_name", term=godown_name
+    )
+    return page_response(response, result)
 
 @router.get("/get_godown_details/{godown_id}", response_model=schemas.GodownDetails, tags=["Godown Details"])
 def get_godown_detail(godown_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -138,18 +179,30 @@ def update_godown_details(godown_id: int, godown: schemas.GodownUpdate, db: Sess
         raise HTTPException(status_code=404, detail="Godown Details not found")
     return godown_service.update(db, db_obj=db_godown, obj_in=godown)
 
+@router.post("/bulk_create_godown_details", tags=["Godown Details"])
+def bulk_create_godown_details(godowns: List[schemas.GodownCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = godown_service.bulk_create(db, objs_in=godowns, return_ids=True)
+    return {"detail": f"{len(ids)} Godown Details created", "ids": ids}
+
+@router.put("/bulk_upsert_godown_details", tags=["Godown Details"])
+def bulk_upsert_godown_details(godowns: List[schemas.GodownCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = godown_service.upsert_many(db, objs_in=godowns)
+    return {"detail": f"{len(ids)} Godown Details saved", "ids": ids}
+
 # --- Stock Items Details ---
 @router.get("/get_stock_items_details", response_model=List[schemas.StockItemsDetails], tags=["Stock Items Details"])
-def get_stock_items_details(
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user),
+async def get_stock_items_details(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async),
     stock_item_name: Optional[str] = None,
+    page: AllRowsPageParams = Depends(),
 ):
-    if stock_item_name:
-        return db.query(stock_item_service.repository.model).filter(
-            stock_item_service.repository.model.stock_item_name.ilike(f"%{stock_item_name}%")
-        ).all()
-    return stock_item_service.get_multi(db)
+    result = await async_stock_item_service.get_page(
+        db, limit=page.limit, cursor=page.cursor, with_total=page.include_total,
+        field="stock_item_name", term=stock_item_name
+    )
+    return page_response(response, result)
 
 @router.get("/get_stock_items_details/{stock_item_id}", response_model=schemas.StockItemsDetails, tags=["Stock Items Details"])
 def get_stock_item_detail(stock_item_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -169,18 +222,30 @@ def update_stock_items_details(stock_item_id: int, item: schemas.StockItemsUpdat
         raise HTTPException(status_code=404, detail="Stock Item not found")
     return stock_item_service.update(db, db_obj=db_item, obj_in=item)
 
+@router.post("/bulk_create_stock_items_details", tags=["Stock Items Details"])
+def bulk_create_stock_items_details(items: List[schemas.StockItemsCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = stock_item_service.bulk_create(db, objs_in=items, return_ids=True)
+    return {"detail": f"{len(ids)} Stock Items created", "ids": ids}
+
+@router.put("/bulk_upsert_stock_items_details", tags=["Stock Items Details"])
+def bulk_upsert_stock_items_details(items: List[schemas.StockItemsCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = stock_item_service.upsert_many(db, objs_in=items)
+    return {"detail": f"{len(ids)} Stock Items saved", "ids": ids}
+
 # --- Packaging Details ---
 @router.get("/get_packaging_details", response_model=List[schemas.PackagingDetails], tags=["Packaging Details"])
-def get_packaging_details(
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user),
+async def get_packaging_details(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async),
     packaging_name: Optional[str] = None,
+    page: AllRowsPageParams = Depends(),
 ):
-    if packaging_name:
-        return db.query(packaging_service.repository.model).filter(
-            packaging_service.repository.model.packaging_name.ilike(f"%{packaging_name}%")
-        ).all()
-    return packaging_service.get_multi(db)
+    result = await async_packaging_service.get_page(
+        db, limit=page.limit, cursor=page.cursor, with_total=page.include_total,
+        field="packaging_name", term=packaging_name
+    )
+    return page_response(response, result)
 
 @router.get("/get_packaging_details/{packaging_id}", response_model=schemas.PackagingDetails, tags=["Packaging Details"])
 def get_packaging_detail(packaging_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -200,18 +265,30 @@ def update_packaging_details(packaging_id: int, packaging: schemas.PackagingUpda
         raise HTTPException(status_code=404, detail="Packaging Details not found")
     return packaging_service.update(db, db_obj=db_packaging, obj_in=packaging)
 
+@router.post("/bulk_create_packaging_details", tags=["Packaging Details"])
+def bulk_create_packaging_details(packagings: List[schemas.PackagingCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = packaging_service.bulk_create(db, objs_in=packagings, return_ids=True)
+    return {"detail": f"{len(ids)} Packaging Details created", "ids": ids}
+
+@router.put("/bulk_upsert_packaging_details", tags=["Packaging Details"])
+def bulk_upsert_packaging_details(packagings: List[schemas.PackagingCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = packaging_service.upsert_many(db, objs_in=packagings)
+    return {"detail": f"{len(ids)} Packaging Details saved", "ids": ids}
+
 # --- Weight Bridge Operator Details ---
 @router.get("/get_weight_bridge_operator_details", response_model=List[schemas.WeightBridgeOperator], tags=["Weight Bridge Operator Details"])
-def get_wb_operator_details(
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user),
+async def get_wb_operator_details(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user_async),
     operator_name: Optional[str] = None,
+    page: AllRowsPageParams = Depends(),
 ):
-    if operator_name:
-        return db.query(weight_bridge_operator_service.repository.model).filter(
-            weight_bridge_operator_service.repository.model.operator_name.ilike(f"%{operator_name}%")
-        ).all()
-    return weight_bridge_operator_service.get_multi(db)
+    result = await async_weight_bridge_operator_service.get_page(
+        db, limit=page.limit, cursor=page.cursor, with_total=page.include_total,
+        field="operator_name", term=operator_name
+    )
+    return page_response(response, result)
 
 @router.get("/get_weight_bridge_operator_details/{operator_id}", response_model=schemas.WeightBridgeOperator, tags=["Weight Bridge Operator Details"])
 def get_wb_operator_detail(operator_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -231,6 +308,16 @@ def update_wb_operator_details(operator_id: int, operator: schemas.WeightBridgeO
         raise HTTPException(status_code=404, detail="Weight Bridge Operator not found")
     return weight_bridge_operator_service.update(db, db_obj=db_operator, obj_in=operator)
 
+@router.post("/bulk_create_weight_bridge_operator_details", tags=["Weight Bridge Operator Details"])
+def bulk_create_wb_operator_details(operators: List[schemas.WeightBridgeOperatorCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = weight_bridge_operator_service.bulk_create(db, objs_in=operators, return_ids=True)
+    return {"detail": f"{len(ids)} Weight Bridge Operators created", "ids": ids}
+
+@router.put("/bulk_upsert_weight_bridge_operator_details", tags=["Weight Bridge Operator Details"])
+def bulk_upsert_wb_operator_details(operators: List[schemas.WeightBridgeOperatorCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = weight_bridge_operator_service.upsert_many(db, objs_in=operators)
+    return {"detail": f"{len(ids)} Weight Bridge Operators saved", "ids": ids}
+
 @router.delete("/delete_weight_bridge_operator_details/{operator_id}", tags=["Weight Bridge Operator Details"])
 def delete_wb_operator_details(operator_id: int, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     db_operator = weight_bridge_operator_service.get(db, id=operator_id)
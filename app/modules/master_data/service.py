@@ -1,4 +1,4 @@
-from app.core.service import BaseService
+from app.core.service import AsyncBaseService, BaseService
 from app.modules.master_data.models import (
     PartyDetails, BrokerDetails, TransportorDetails, GodownDetails,
     StockItems, PackagingDetails, WeightBridgeOperator
@@ -15,7 +15,10 @@ from app.modules.master_data.schemas import (
 from app.modules.master_data.repository import (
     party_repository, broker_repository, transportor_repository,
     godown_repository, stock_item_repository, packaging_repository,
-    weight_bridge_operator_repository
+    weight_bridge_operator_repository,
+    async_party_repository, async_broker_repository, async_transportor_repository,
+    async_godown_repository, async_stock_item_repository, async_packaging_repository,
+    async_weight_bridge_operator_repository
 )
 
 class PartyService(BaseService[PartyDetails, PartyCreate, PartyUpdate]):
@@ -46,3 +49,11 @@ godown_service = GodownService(godown_repository)
 stock_item_service = StockItemService(stock_item_repository)
 packaging_service = PackagingService(packaging_repository)
 weight_bridge_operator_service = WeightBridgeOperatorService(weight_bridge_operator_repository)
+
+async_party_service = AsyncBaseService(async_party_repository)
+async_broker_service = AsyncBaseService(async_broker_repository)
+async_transportor_service = AsyncBaseService(async_transportor_repository)
+async_godown_service = AsyncBaseService(async_godown_repository)
+async_stock_item_service = AsyncBaseService(async_stock_item_repository)
+async_packaging_service = AsyncBaseService(async_packaging_repository)
+async_weight_bridge_operator_service = AsyncBaseService(async_weight_bridge_operator_repository)
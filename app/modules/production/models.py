@@ -8,11 +8,11 @@ from datetime import datetime
 class BatchOperator(Base):
     __tablename__ = "batch_operator"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    operator_name = Column(String(30), index=True)
-    operator_mob_no = Column(String(10), index=True)
-    is_active = Column(Boolean, index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
+    operator_name = Column(String(30), index=True, unique=True)
+    operator_mob_no = Column(String(10))
+    is_active = Column(Boolean)
+    user_login_id = Column(Integer, ForeignKey("users.id"))
     time_stamp = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
 
     users = relationship("app.modules.users.models.User", back_populates="batch_operator")
@@ -37,11 +37,11 @@ class BatchOperator(Base):
 class Clerks(Base):
     __tablename__ = "clerks"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
-    clerk_name = Column(String(30), index=True)
-    clerk_mob_no = Column(String(10), index=True)
-    is_active = Column(Boolean, index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
+    clerk_name = Column(String(30), index=True, unique=True)
+    clerk_mob_no = Column(String(10))
+    is_active = Column(Boolean)
+    user_login_id = Column(Integer, ForeignKey("users.id"))
     time_stamp = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
 
     users = relationship("app.modules.users.models.User", back_populates="clerks")
@@ -67,17 +67,17 @@ class Clerks(Base):
 class Batch(Base):
     __tablename__ = "batch"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     batch_name = Column(String(30), index=True)
-    batch_date = Column(Date, index=True)
-    pot_number = Column(Integer, index=True)
+    batch_date = Column(Date)
+    pot_number = Column(Integer)
     stock_item_id = Column(Integer, ForeignKey("stock_items_operations.id"), index=True)
     stock_quantity = Column(Integer, default=0) # Bags
     stock_weight = Column(Float, default=0.0) # KG (as per legacy schema, though user said quintal for calc, legacy stores KG?)
     # Checking legacy batch_operations.py: stock_weight=batch.stock_weight (KG). 
     # But calculation uses / 100.0 for quintal. So DB stores KG.
     
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    user_login_id = Column(Integer, ForeignKey("users.id"))
     time_stamp = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
 
     cross_verification = relationship("CrossVerification", back_populates="batch")
@@ -105,13 +105,13 @@ class Batch(Base):
 class SteamOn(Base):
     __tablename__ = "steam_on"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     batch_id = Column(Integer, ForeignKey("batch.id"), index=True)
-    steam_on_date = Column(Date, index=True)
-    steam_on_time = Column(Time, index=True)
-    first_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"), index=True)
-    second_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"), index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    steam_on_date = Column(Date)
+    steam_on_time = Column(Time)
+    first_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"))
+    second_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"))
+    user_login_id = Column(Integer, ForeignKey("users.id"))
     time_stamp = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
 
     users = relationship("app.modules.users.models.User", back_populates="steam_on")
@@ -127,13 +127,13 @@ class SteamOn(Base):
 class SteamOff(Base):
     __tablename__ = "steam_off"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     batch_id = Column(Integer, ForeignKey("batch.id"), index=True)
-    steam_off_date = Column(Date, index=True)
-    steam_off_time = Column(Time, index=True)
-    first_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"), index=True)
-    second_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"), index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    steam_off_date = Column(Date)
+    steam_off_time = Column(Time)
+    first_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"))
+    second_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"))
+    user_login_id = Column(Integer, ForeignKey("users.id"))
     time_stamp = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
 
     users = relationship("app.modules.users.models.User", back_populates="steam_off")
@@ -149,13 +149,13 @@ class SteamOff(Base):
 class Drainage(Base):
     __tablename__ = "drainage"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     batch_id = Column(Integer, ForeignKey("batch.id"), index=True)
-    drainage_date = Column(Date, index=True)
-    drainage_time = Column(Time, index=True)
-    first_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"), index=True)
-    second_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"), index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    drainage_date = Column(Date)
+    drainage_time = Column(Time)
+    first_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"))
+    second_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"))
+    user_login_id = Column(Integer, ForeignKey("users.id"))
     time_stamp = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
 
     users = relationship("app.modules.users.models.User", back_populates="drainage")
@@ -171,13 +171,13 @@ class Drainage(Base):
 class Immerse(Base):
     __tablename__ = "immerse"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     batch_id = Column(Integer, ForeignKey("batch.id"), index=True)
-    immersion_date = Column(Date, index=True)
-    immersion_time = Column(Time, index=True)
-    first_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"), index=True)
-    second_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"), index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    immersion_date = Column(Date)
+    immersion_time = Column(Time)
+    first_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"))
+    second_batch_operator_id = Column(Integer, ForeignKey("batch_operator.id"))
+    user_login_id = Column(Integer, ForeignKey("users.id"))
     time_stamp = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
 
     users = relationship("app.modules.users.models.User", back_populates="immerse")
@@ -193,16 +193,16 @@ class Immerse(Base):
 class MillingAnalysis(Base):
     __tablename__ = "milling_analysis"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     batch_id = Column(Integer, ForeignKey("batch.id"), index=True)
-    analyzer_clerk_id = Column(Integer, ForeignKey("clerks.id"), index=True)
-    milling_rice_moisture_percent = Column(Float, index=True)
-    milling_broken_percent = Column(Float, index=True)
-    milling_discolor_percent = Column(Float, index=True)
-    milling_damaged_percent = Column(Float, index=True)
-    milling_output_porridge_30sec = Column(Float, index=True)
-    milling_output_final_polisher_30sec = Column(Float, index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    analyzer_clerk_id = Column(Integer, ForeignKey("clerks.id"))
+    milling_rice_moisture_percent = Column(Float)
+    milling_broken_percent = Column(Float)
+    milling_discolor_percent = Column(Float)
+    milling_damaged_percent = Column(Float)
+    milling_output_porridge_30sec = Column(Float)
+    milling_output_final_polisher_30sec = Column(Float)
+    user_login_id = Column(Integer, ForeignKey("users.id"))
     time_stamp = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
 
     users = relationship("app.modules.users.models.User", back_populates="milling_analysis")
@@ -217,23 +217,23 @@ class MillingAnalysis(Base):
 class SortingAnalysis(Base):
     __tablename__ = "sorting_analysis"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     batch_id = Column(Integer, ForeignKey("batch.id"), index=True)
-    analyzer_clerk_id = Column(Integer, ForeignKey("clerks.id"), index=True)
-    sorted_rice_moisture_percent = Column(Float, index=True)
-    sorted_broken_percent = Column(Float, index=True)
-    sorted_discolor_percent = Column(Float, index=True)
-    sorted_damaged_percent = Column(Float, index=True)
-    rejection_rice_percent = Column(Float, index=True)
-    sorting_output_30sec = Column(Float, index=True)
-    rejection_output_30sec = Column(Float, index=True)
-    checker_clerk_id = Column(Integer, ForeignKey("clerks.id"), index=True)
-    checking_date = Column(Date, index=True)
-    checking_time = Column(Time, index=True)
-    verifier_clerk_id = Column(Integer, ForeignKey("clerks.id"), index=True)
-    verifying_date = Column(Date, index=True)
-    verifying_time = Column(Time, index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    analyzer_clerk_id = Column(Integer, ForeignKey("clerks.id"))
+    sorted_rice_moisture_percent = Column(Float)
+    sorted_broken_percent = Column(Float)
+    sorted_discolor_percent = Column(Float)
+    sorted_damaged_percent = Column(Float)
+    rejection_rice_percent = Column(Float)
+    sorting_output_30sec = Column(Float)
+    rejection_output_30sec = Column(Float)
+    checker_clerk_id = Column(Integer, ForeignKey("clerks.id"))
+    checking_date = Column(Date)
+    checking_time = Column(Time)
+    verifier_clerk_id = Column(Integer, ForeignKey("clerks.id"))
+    verifying_date = Column(Date)
+    verifying_time = Column(Time)
+    user_login_id = Column(Integer, ForeignKey("users.id"))
     time_stamp = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
 
     users = relationship("app.modules.users.models.User", back_populates="sorting_analysis")
@@ -250,17 +250,17 @@ class SortingAnalysis(Base):
 class CrossVerification(Base):
     __tablename__ = "cross_verification"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     batch_id = Column(Integer, ForeignKey("batch.id"), index=True)
-    checker_clerk_id = Column(Integer, ForeignKey("clerks.id"), index=True)
-    checking_date = Column(Date, index=True)
-    checking_time = Column(Time, index=True)
-    verifier_clerk_id = Column(Integer, ForeignKey("clerks.id"), index=True)
-    verifying_date = Column(Date, index=True)
-    verifying_time = Column(Time, index=True)
-    paddy_moisture_percent = Column(Float, index=True)
-    approver_clerk_id = Column(Integer, ForeignKey("clerks.id"), index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    checker_clerk_id = Column(Integer, ForeignKey("clerks.id"))
+    checking_date = Column(Date)
+    checking_time = Column(Time)
+    verifier_clerk_id = Column(Integer, ForeignKey("clerks.id"))
+    verifying_date = Column(Date)
+    verifying_time = Column(Time)
+    paddy_moisture_percent = Column(Float)
+    approver_clerk_id = Column(Integer, ForeignKey("clerks.id"))
+    user_login_id = Column(Integer, ForeignKey("users.id"))
     time_stamp = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
 
     users = relationship("app.modules.users.models.User", back_populates="cross_verification")
@@ -277,23 +277,23 @@ class CrossVerification(Base):
 class LotDetails(Base):
     __tablename__ = "lot_details"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     lot_number = Column(Integer, index=True)
-    lot_moisture_percent = Column(Float, index=True)
-    lot_broken_percent = Column(Float, index=True)
-    lot_discolor_percent = Column(Float, index=True)
-    lot_damaged_percent = Column(Float, index=True)
-    lot_lower_grain_percent = Column(Float, index=True)
-    lot_chalky_percent = Column(Float, index=True)
-    lot_frk_percent = Column(Float, index=True)
-    lot_other_percent = Column(Float, index=True)
-    checker_clerk_id = Column(Integer, ForeignKey("clerks.id"), index=True)
-    checking_date = Column(Date, index=True)
-    checking_time = Column(Time, index=True)
-    verifier_clerk_id = Column(Integer, ForeignKey("clerks.id"), index=True)
-    verifying_date = Column(Date, index=True)
-    verifying_time = Column(Time, index=True)
-    user_login_id = Column(Integer, ForeignKey("users.id"), index=True)
+    lot_moisture_percent = Column(Float)
+    lot_broken_percent = Column(Float)
+    lot_discolor_percent = Column(Float)
+    lot_damaged_percent = Column(Float)
+    lot_lower_grain_percent = Column(Float)
+    lot_chalky_percent = Column(Float)
+    lot_frk_percent = Column(Float)
+    lot_other_percent = Column(Float)
+    checker_clerk_id = Column(Integer, ForeignKey("clerks.id"))
+    checking_date = Column(Date)
+    checking_time = Column(Time)
+    verifier_clerk_id = Column(Integer, ForeignKey("clerks.id"))
+    verifying_date = Column(Date)
+    verifying_time = Column(Time)
+    user_login_id = Column(Integer, ForeignKey("users.id"))
     time_stamp = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), onupdate=func.now())
 
     users = relationship("app.modules.users.models.User", back_populates="lot_details")
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List
 from app.db.session import get_db
-from app.core.security import get_current_user
+from app.db.writer import run_write_async
+from app.core.security import get_current_user, get_current_user_async
+from app.core.pagination import PageParams, page_response
 from app.modules.production.service import production_service
 from app.modules.production.schemas import (
     BatchOperatorCreate, BatchOperatorUpdate, BatchOperatorResponse,
@@ -22,8 +24,9 @@ router = APIRouter()
 
 # --- Batch Operator ---
 @router.get("/get_batch_operators", response_model=List[BatchOperatorResponse])
-def get_batch_operators(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return production_service.get_batch_operators(db)
+def get_batch_operators(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    result = production_service.get_batch_operators(db, limit=page.limit, cursor=page.cursor, with_total=page.include_total)
+    return page_response(response, result)
 
 @router.post("/create_batch_operator", response_model=BatchOperatorResponse)
 def create_batch_operator(operator: BatchOperatorCreate, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -33,10 +36,21 @@ def create_batch_operator(operator: BatchOperatorCreate, db: Session = Depends(g
 def update_batch_operator(id: int, operator: BatchOperatorUpdate, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     return production_service.update_batch_operator(db, id, operator)
 
+@router.post("/bulk_create_batch_operators")
+def bulk_create_batch_operators(operators: List[BatchOperatorCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = production_service.bulk_create_batch_operators(db, operators)
+    return {"detail": f"{len(ids)} Batch Operators created", "ids": ids}
+
+@router.put("/bulk_upsert_batch_operators")
+def bulk_upsert_batch_operators(operators: List[BatchOperatorCreate], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = production_service.upsert_batch_operators(db, operators)
+    return {"detail": f"{len(ids)} Batch Operators saved", "ids": ids}
+
 # --- Clerks ---
 @router.get("/get_clerks", response_model=List[ClerkResponse])
-def get_clerks(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return production_service.get_clerks(db)
+def get_clerks(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    result = production_service.get_clerks(db, limit=page.limit, cursor=page.cursor, with_total=page.include_total)
+    return page_response(response, result)
 
 @router.post("/create_clerk", response_model=ClerkResponse)
 def create_clerk(clerk: CreateClerk, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -46,14 +60,31 @@ def create_clerk(clerk: CreateClerk, db: Session = Depends(get_db), current_user
 def update_clerk(id: int, clerk: UpdateClerk, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     return production_service.update_clerk(db, id, clerk)
 
+@router.post("/bulk_create_clerks")
+def bulk_create_clerks(clerks: List[CreateClerk], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = production_service.bulk_create_clerks(db, clerks)
+    return {"detail": f"{len(ids)} Clerks created", "ids": ids}
+
+@router.put("/bulk_upsert_clerks")
+def bulk_upsert_clerks(clerks: List[CreateClerk], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = production_service.upsert_clerks(db, clerks)
+    return {"detail": f"{len(ids)} Clerks saved", "ids": ids}
+
 # --- Batch ---
 @router.get("/get_all_batches", response_model=List[BatchResponse])
-def get_batches(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return production_service.get_batches(db)
+def get_batches(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    result = production_service.get_batches(db, limit=page.limit, cursor=page.cursor, with_total=page.include_total)
+    return page_response(response, result)
 
 @router.post("/create_batch", response_model=BatchResponse)
-def create_batch(batch: CreateBatch, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return production_service.create_batch(db, batch)
+async def create_batch(batch: CreateBatch, current_user: dict = Depends(get_current_user_async)):
+    def create(db):
+        created = production_service.create_batch(db, batch)
+        # Load what the response walks while the writer's session is open
+        return production_service.reload_batch(db, created.id)
+
+    # Validated after the commit, so a serialization error cannot roll back the write
+    return BatchResponse.model_validate(await run_write_async(create))
 
 @router.put("/update_batch/{id}", response_model=BatchResponse)
 def update_batch(id: int, batch: UpdateBatch, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -61,44 +92,69 @@ def update_batch(id: int, batch: UpdateBatch, db: Session = Depends(get_db), cur
 
 # --- Steam On ---
 @router.get("/get_steam_on_details", response_model=List[SteamOnResponse])
-def get_steam_on(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return production_service.get_steam_on(db)
+def get_steam_on(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    result = production_service.get_steam_on(db, limit=page.limit, cursor=page.cursor, with_total=page.include_total)
+    return page_response(response, result)
 
 @router.post("/create_steam_on", response_model=SteamOnResponse)
 def create_steam_on(steam_on: CreateSteamOn, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     return production_service.create_steam_on(db, steam_on)
 
+@router.post("/bulk_create_steam_on")
+def bulk_create_steam_on(steam_on: List[CreateSteamOn], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = production_service.bulk_create_steam_on(db, steam_on)
+    return {"detail": f"{len(ids)} Steam On records created", "ids": ids}
+
 # --- Steam Off ---
 @router.get("/get_steam_off_details", response_model=List[SteamOffResponse])
-def get_steam_off(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return production_service.get_steam_off(db)
+def get_steam_off(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    result = production_service.get_steam_off(db, limit=page.limit, cursor=page.cursor, with_total=page.include_total)
+    return page_response(response, result)
 
 @router.post("/create_steam_off", response_model=SteamOffResponse)
 def create_steam_off(steam_off: CreateSteamOff, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     return production_service.create_steam_off(db, steam_off)
 
+@router.post("/bulk_create_steam_off")
+def bulk_create_steam_off(steam_off: List[CreateSteamOff], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = production_service.bulk_create_steam_off(db, steam_off)
+    return {"detail": f"{len(ids)} Steam Off records created", "ids": ids}
+
 # --- Drainage ---
 @router.get("/get_drainage_details", response_model=List[DrainageResponse])
-def get_drainage(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return production_service.get_drainage(db)
+def get_drainage(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    result = production_service.get_drainage(db, limit=page.limit, cursor=page.cursor, with_total=page.include_total)
+    return page_response(response, result)
 
 @router.post("/create_drainage", response_model=DrainageResponse)
 def create_drainage(drainage: CreateDrainage, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     return production_service.create_drainage(db, drainage)
 
+@router.post("/bulk_create_drainage")
+def bulk_create_drainage(drainage: List[CreateDrainage], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = production_service.bulk_create_drainage(db, drainage)
+    return {"detail": f"{len(ids)} Drainage records created", "ids": ids}
+
 # --- Immerse ---
 @router.get("/get_immerse_details", response_model=List[ImmerseResponse])
-def get_immerse(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return production_service.get_immerse(db)
+def get_immerse(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    result = production_service.get_immerse(db, limit=page.limit, cursor=page.cursor, with_total=page.include_total)
+    return page_response(response, result)
 
 @router.post("/create_immerse", response_model=ImmerseResponse)
 def create_immerse(immerse: CreateImmerse, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     return production_service.create_immerse(db, immerse)
 
+@router.post("/bulk_create_immerse")
+def bulk_create_immerse(immerse: List[CreateImmerse], db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    ids = production_service.bulk_create_immerse(db, immerse)
+    return {"detail": f"{len(ids)} Immerse records created", "ids": ids}
+
 # --- Milling Analysis ---
 @router.get("/get_milling_analysis_details", response_model=List[MillingAnalysisResponse])
-def get_milling_analysis(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return production_service.get_milling_analysis(db)
+def get_milling_analysis(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    result = production_service.get_milling_analysis(db, limit=page.limit, cursor=page.cursor, with_total=page.include_total)
+    return page_response(response, result)
 
 @router.post("/create_milling_analysis", response_model=MillingAnalysisResponse)
 def create_milling_analysis(analysis: CreateMillingAnalysis, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -106,8 +162,9 @@ def create_milling_analysis(analysis: CreateMillingAnalysis, db: Session = Depen
 
 # --- Sorting Analysis ---
 @router.get("/get_sorting_analysis_details", response_model=List[SortingAnalysisResponse])
-def get_sorting_analysis(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return production_service.get_sorting_analysis(db)
+def get_sorting_analysis(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    result = production_service.get_sorting_analysis(db, limit=page.limit, cursor=page.cursor, with_total=page.include_total)
+    return page_response(response, result)
 
 @router.post("/create_sorting_analysis", response_model=SortingAnalysisResponse)
 def create_sorting_analysis(analysis: CreateSortingAnalysis, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -115,8 +172,9 @@ def create_sorting_analysis(analysis: CreateSortingAnalysis, db: Session = Depen
 
 # --- Cross Verification ---
 @router.get("/get_cross_verification_details", response_model=List[CrossVerificationResponse])
-def get_cross_verification(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return production_service.get_cross_verification(db)
+def get_cross_verification(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    result = production_service.get_cross_verification(db, limit=page.limit, cursor=page.cursor, with_total=page.include_total)
+    return page_response(response, result)
 
 @router.post("/create_cross_verification", response_model=CrossVerificationResponse)
 def create_cross_verification(verification: CreateCrossVerification, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
@@ -124,8 +182,9 @@ def create_cross_verification(verification: CreateCrossVerification, db: Session
 
 # --- Lot Details ---
 @router.get("/get_lot_details", response_model=List[LotDetailsResponse])
-def get_lot_details(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
-    return production_service.get_lot_details(db)
+def get_lot_details(response: Response, page: PageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    result = production_service.get_lot_details(db, limit=page.limit, cursor=page.cursor, with_total=page.include_total)
+    return page_response(response, result)
 
 @router.post("/create_lot_details", response_model=LotDetailsResponse)
 def create_lot_details(lot: CreateLot, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
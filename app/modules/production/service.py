@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, List, Optional
 from fastapi import HTTPException
+from app.core.tracing import traced
+from app.db.retry import retry_on_busy
 from app.modules.production.repository import (
     batch_operator_repository, clerk_repository, batch_repository,
     steam_on_repository, steam_off_repository, drainage_repository,
@@ -20,18 +22,54 @@ from app.modules.production.schemas import (
     CreateCrossVerification, UpdateCrossVerification,
     CreateLot, UpdateLot
 )
-from app.modules.production.models import Batch, BatchOperator, Clerks
+from app.modules.production.models import (
+    Batch, BatchOperator, Clerks, SteamOn, SteamOff, Drainage, Immerse,
+    MillingAnalysis, SortingAnalysis, CrossVerification, LotDetails
+)
 from app.modules.master_data.models import StockItems
 from app.modules.inventory.models import StockLedger
 
 class ProductionService:
+    def _bulk_create_batch_step(self, db: Session, repository, objs_in: List[Any], date_field: str, time_field: str):
+        """
+        Shared bulk insert for the steam on / steam off / drainage / immerse logs.
+        Batch and operator names are resolved with one query each instead of per row.
+        """
+        batch_names = {obj.batch_name for obj in objs_in}
+        operator_names = {obj.first_batch_operator for obj in objs_in} | {obj.second_batch_operator for obj in objs_in}
+        # descending so the dict keeps the lowest id per name, like `.first()` in the single-row paths
+        batches = dict(db.query(Batch.batch_name, Batch.id).filter(Batch.batch_name.in_(batch_names)).order_by(Batch.id.desc()).all())
+        operators = dict(db.query(BatchOperator.operator_name, BatchOperator.id).filter(
+            BatchOperator.operator_name.in_(operator_names)
+        ).order_by(BatchOperator.id.desc()).all())
+
+        rows = []
+        for obj in objs_in:
+            if obj.batch_name not in batches:
+                raise HTTPException(status_code=404, detail=f"Batch '{obj.batch_name}' not found")
+            rows.append({
+                "batch_id": batches[obj.batch_name],
+                date_field: getattr(obj, date_field),
+                time_field: getattr(obj, time_field),
+                "first_batch_operator_id": operators.get(obj.first_batch_operator),
+                "second_batch_operator_id": operators.get(obj.second_batch_operator),
+                "user_login_id": obj.user_login_id
+            })
+        return repository.bulk_create(db, objs_in=rows, return_ids=True)
+
     # --- Batch Operator ---
-    def get_batch_operators(self, db: Session, skip: int = 0, limit: int = 100):
-        return batch_operator_repository.get_multi(db, skip=skip, limit=limit)
+    def get_batch_operators(self, db: Session, *, limit: Optional[int], cursor: Optional[str] = None, with_total: bool = False):
+        return batch_operator_repository.get_page(db, limit=limit, cursor=cursor, with_total=with_total)
 
     def create_batch_operator(self, db: Session, obj_in: BatchOperatorCreate):
         return batch_operator_repository.create(db, obj_in=obj_in)
 
+    def bulk_create_batch_operators(self, db: Session, objs_in: List[BatchOperatorCreate]):
+        return batch_operator_repository.bulk_create(db, objs_in=objs_in, return_ids=True)
+
+    def upsert_batch_operators(self, db: Session, objs_in: List[BatchOperatorCreate]):
+        return batch_operator_repository.upsert_many(db, objs_in=objs_in)
+
     def update_batch_operator(self, db: Session, id: int, obj_in: BatchOperatorUpdate):
         db_obj = batch_operator_repository.get(db, id)
         if not db_obj:
@@ -39,12 +77,18 @@ class ProductionService:
         return batch_operator_repository.update(db, db_obj=db_obj, obj_in=obj_in)
 
     # --- Clerks ---
-    def get_clerks(self, db: Session, skip: int = 0, limit: int = 100):
-        return clerk_repository.get_multi(db, skip=skip, limit=limit)
+    def get_clerks(self, db: Session, *, limit: Optional[int], cursor: Optional[str] = None, with_total: bool = False):
+        return clerk_repository.get_page(db, limit=limit, cursor=cursor, with_total=with_total)
 
     def create_clerk(self, db: Session, obj_in: CreateClerk):
         return clerk_repository.create(db, obj_in=obj_in)
 
+    def bulk_create_clerks(self, db: Session, objs_in: List[CreateClerk]):
+        return clerk_repository.bulk_create(db, objs_in=objs_in, return_ids=True)
+
+    def upsert_clerks(self, db: Session, objs_in: List[CreateClerk]):
+        return clerk_repository.upsert_many(db, objs_in=objs_in)
+
     def update_clerk(self, db: Session, id: int, obj_in: UpdateClerk):
         db_obj = clerk_repository.get(db, id)
         if not db_obj:
@@ -52,9 +96,11 @@ class ProductionService:
         return clerk_repository.update(db, db_obj=db_obj, obj_in=obj_in)
 
     # --- Batch ---
-    def get_batches(self, db: Session, skip: int = 0, limit: int = 100):
-        return batch_repository.get_multi(db, skip=skip, limit=limit)
+    def get_batches(self, db: Session, *, limit: Optional[int], cursor: Optional[str] = None, with_total: bool = False):
+        return batch_repository.get_page(db, limit=limit, cursor=cursor, with_total=with_total)
 
+    @traced()
+    @retry_on_busy
     def create_batch(self, db: Session, obj_in: CreateBatch):
         db_stock_item = db.query(StockItems).filter(StockItems.stock_item_name == obj_in.stock_item_name).first()
         if not db_stock_item:
@@ -107,15 +153,15 @@ class ProductionService:
             batch_name=obj_in.batch_name,
             batch_date=obj_in.batch_date,
             pot_number=obj_in.pot_number,
-            stock_item_id=db_stock_item.id,
+            stock_items=db_stock_item,
             stock_quantity=quantity_bags,
             stock_weight=obj_in.stock_weight,
             user_login_id=obj_in.user_login_id
         )
-        db.add(db_batch)
-        db.commit()
-        db.refresh(db_batch)
-        return db_batch
+        return batch_repository.save(db, db_batch)
+
+    def reload_batch(self, db: Session, id: int):
+        return batch_repository.reload(db, id)
 
     def update_batch(self, db: Session, id: int, obj_in: UpdateBatch):
         db_batch = batch_repository.get(db, id)
@@ -135,16 +181,14 @@ class ProductionService:
         db_batch.batch_name = obj_in.batch_name
         db_batch.batch_date = obj_in.batch_date
         db_batch.pot_number = obj_in.pot_number
-        db_batch.stock_item_id = db_stock_item.id
+        db_batch.stock_items = db_stock_item
         db_batch.user_login_id = obj_in.user_login_id
         
-        db.commit()
-        db.refresh(db_batch)
-        return db_batch
+        return batch_repository.save(db, db_batch)
 
     # --- Steam On ---
-    def get_steam_on(self, db: Session, skip: int = 0, limit: int = 100):
-        return steam_on_repository.get_multi(db, skip=skip, limit=limit)
+    def get_steam_on(self, db: Session, *, limit: Optional[int], cursor: Optional[str] = None, with_total: bool = False):
+        return steam_on_repository.get_page(db, limit=limit, cursor=cursor, with_total=with_total)
 
     def create_steam_on(self, db: Session, obj_in: CreateSteamOn):
         db_batch = batch_repository.get_by_name(db, obj_in.batch_name)
@@ -155,21 +199,21 @@ class ProductionService:
         second_op = db.query(BatchOperator).filter(BatchOperator.operator_name == obj_in.second_batch_operator).first()
 
         db_obj = SteamOn(
-            batch_id=db_batch.id,
+            batch=db_batch,
             steam_on_date=obj_in.steam_on_date,
             steam_on_time=obj_in.steam_on_time,
-            first_batch_operator_id=first_op.id if first_op else None,
-            second_batch_operator_id=second_op.id if second_op else None,
+            first_batch_operator=first_op,
+            second_batch_operator=second_op,
             user_login_id=obj_in.user_login_id
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return steam_on_repository.save(db, db_obj)
+
+    def bulk_create_steam_on(self, db: Session, objs_in: List[CreateSteamOn]):
+        return self._bulk_create_batch_step(db, steam_on_repository, objs_in, "steam_on_date", "steam_on_time")
 
     # --- Steam Off ---
-    def get_steam_off(self, db: Session, skip: int = 0, limit: int = 100):
-        return steam_off_repository.get_multi(db, skip=skip, limit=limit)
+    def get_steam_off(self, db: Session, *, limit: Optional[int], cursor: Optional[str] = None, with_total: bool = False):
+        return steam_off_repository.get_page(db, limit=limit, cursor=cursor, with_total=with_total)
 
     def create_steam_off(self, db: Session, obj_in: CreateSteamOff):
         db_batch = batch_repository.get_by_name(db, obj_in.batch_name)
@@ -180,21 +224,21 @@ class ProductionService:
         second_op = db.query(BatchOperator).filter(BatchOperator.operator_name == obj_in.second_batch_operator).first()
 
         db_obj = SteamOff(
-            batch_id=db_batch.id,
+            batch=db_batch,
             steam_off_date=obj_in.steam_off_date,
             steam_off_time=obj_in.steam_off_time,
-            first_batch_operator_id=first_op.id if first_op else None,
-            second_batch_operator_id=second_op.id if second_op else None,
+            first_batch_operator=first_op,
+            second_batch_operator=second_op,
             user_login_id=obj_in.user_login_id
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return steam_off_repository.save(db, db_obj)
+
+    def bulk_create_steam_off(self, db: Session, objs_in: List[CreateSteamOff]):
+        return self._bulk_create_batch_step(db, steam_off_repository, objs_in, "steam_off_date", "steam_off_time")
 
     # --- Drainage ---
-    def get_drainage(self, db: Session, skip: int = 0, limit: int = 100):
-        return drainage_repository.get_multi(db, skip=skip, limit=limit)
+    def get_drainage(self, db: Session, *, limit: Optional[int], cursor: Optional[str] = None, with_total: bool = False):
+        return drainage_repository.get_page(db, limit=limit, cursor=cursor, with_total=with_total)
 
     def create_drainage(self, db: Session, obj_in: CreateDrainage):
         db_batch = batch_repository.get_by_name(db, obj_in.batch_name)
@@ -205,21 +249,21 @@ class ProductionService:
         second_op = db.query(BatchOperator).filter(BatchOperator.operator_name == obj_in.second_batch_operator).first()
 
         db_obj = Drainage(
-            batch_id=db_batch.id,
+            batch=db_batch,
             drainage_date=obj_in.drainage_date,
             drainage_time=obj_in.drainage_time,
-            first_batch_operator_id=first_op.id if first_op else None,
-            second_batch_operator_id=second_op.id if second_op else None,
+            first_batch_operator=first_op,
+            second_batch_operator=second_op,
             user_login_id=obj_in.user_login_id
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return drainage_repository.save(db, db_obj)
+
+    def bulk_create_drainage(self, db: Session, objs_in: List[CreateDrainage]):
+        return self._bulk_create_batch_step(db, drainage_repository, objs_in, "drainage_date", "drainage_time")
 
     # --- Immerse ---
-    def get_immerse(self, db: Session, skip: int = 0, limit: int = 100):
-        return immerse_repository.get_multi(db, skip=skip, limit=limit)
+    def get_immerse(self, db: Session, *, limit: Optional[int], cursor: Optional[str] = None, with_total: bool = False):
+        return immerse_repository.get_page(db, limit=limit, cursor=cursor, with_total=with_total)
 
     def create_immerse(self, db: Session, obj_in: CreateImmerse):
         db_batch = batch_repository.get_by_name(db, obj_in.batch_name)
@@ -230,21 +274,21 @@ class ProductionService:
         second_op = db.query(BatchOperator).filter(BatchOperator.operator_name == obj_in.second_batch_operator).first()
 
         db_obj = Immerse(
-            batch_id=db_batch.id,
+            batch=db_batch,
             immersion_date=obj_in.immersion_date,
             immersion_time=obj_in.immersion_time,
-            first_batch_operator_id=first_op.id if first_op else None,
-            second_batch_operator_id=second_op.id if second_op else None,
+            first_batch_operator=first_op,
+            second_batch_operator=second_op,
             user_login_id=obj_in.user_login_id
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return immerse_repository.save(db, db_obj)
+
+    def bulk_create_immerse(self, db: Session, objs_in: List[CreateImmerse]):
+        return self._bulk_create_batch_step(db, immerse_repository, objs_in, "immersion_date", "immersion_time")
 
     # --- Milling Analysis ---
-    def get_milling_analysis(self, db: Session, skip: int = 0, limit: int = 100):
-        return milling_analysis_repository.get_multi(db, skip=skip, limit=limit)
+    def get_milling_analysis(self, db: Session, *, limit: Optional[int], cursor: Optional[str] = None, with_total: bool = False):
+        return milling_analysis_repository.get_page(db, limit=limit, cursor=cursor, with_total=with_total)
 
     def create_milling_analysis(self, db: Session, obj_in: CreateMillingAnalysis):
         db_batch = batch_repository.get_by_name(db, obj_in.batch_name)
@@ -254,8 +298,8 @@ class ProductionService:
         clerk = db.query(Clerks).filter(Clerks.clerk_name == obj_in.analyzer_clerk_name).first()
 
         db_obj = MillingAnalysis(
-            batch_id=db_batch.id,
-            analyzer_clerk_id=clerk.id if clerk else None,
+            batch=db_batch,
+            analyzer_clerk=clerk,
             milling_rice_moisture_percent=obj_in.milling_rice_moisture_percent,
             milling_broken_percent=obj_in.milling_broken_percent,
             milling_discolor_percent=obj_in.milling_discolor_percent,
@@ -264,14 +308,11 @@ class ProductionService:
             milling_output_final_polisher_30sec=obj_in.milling_output_final_polisher_30sec,
             user_login_id=obj_in.user_login_id
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return milling_analysis_repository.save(db, db_obj)
 
     # --- Sorting Analysis ---
-    def get_sorting_analysis(self, db: Session, skip: int = 0, limit: int = 100):
-        return sorting_analysis_repository.get_multi(db, skip=skip, limit=limit)
+    def get_sorting_analysis(self, db: Session, *, limit: Optional[int], cursor: Optional[str] = None, with_total: bool = False):
+        return sorting_analysis_repository.get_page(db, limit=limit, cursor=cursor, with_total=with_total)
 
     def create_sorting_analysis(self, db: Session, obj_in: CreateSortingAnalysis):
         db_batch = batch_repository.get_by_name(db, obj_in.batch_name)
@@ -283,8 +324,8 @@ class ProductionService:
         verifier = db.query(Clerks).filter(Clerks.clerk_name == obj_in.verifier_clerk_name).first()
 
         db_obj = SortingAnalysis(
-            batch_id=db_batch.id,
-            analyzer_clerk_id=analyzer.id if analyzer else None,
+            batch=db_batch,
+            analyzer_clerk=analyzer,
             sorted_rice_moisture_percent=obj_in.sorted_rice_moisture_percent,
             sorted_broken_percent=obj_in.sorted_broken_percent,
             sorted_discolor_percent=obj_in.sorted_discolor_percent,
@@ -292,22 +333,19 @@ class ProductionService:
             rejection_rice_percent=obj_in.rejection_rice_percent,
             sorting_output_30sec=obj_in.sorting_output_30sec,
             rejection_output_30sec=obj_in.rejection_output_30sec,
-            checker_clerk_id=checker.id if checker else None,
+            checker_clerk=checker,
             checking_date=obj_in.checking_date,
             checking_time=obj_in.checking_time,
-            verifier_clerk_id=verifier.id if verifier else None,
+            verifier_clerk=verifier,
             verifying_date=obj_in.verifying_date,
             verifying_time=obj_in.verifying_time,
             user_login_id=obj_in.user_login_id
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return sorting_analysis_repository.save(db, db_obj)
 
     # --- Cross Verification ---
-    def get_cross_verification(self, db: Session, skip: int = 0, limit: int = 100):
-        return cross_verification_repository.get_multi(db, skip=skip, limit=limit)
+    def get_cross_verification(self, db: Session, *, limit: Optional[int], cursor: Optional[str] = None, with_total: bool = False):
+        return cross_verification_repository.get_page(db, limit=limit, cursor=cursor, with_total=with_total)
 
     def create_cross_verification(self, db: Session, obj_in: CreateCrossVerification):
         db_batch = batch_repository.get_by_name(db, obj_in.batch_name)
@@ -319,25 +357,22 @@ class ProductionService:
         approver = db.query(Clerks).filter(Clerks.clerk_name == obj_in.approver_clerk_name).first()
 
         db_obj = CrossVerification(
-            batch_id=db_batch.id,
-            checker_clerk_id=checker.id if checker else None,
+            batch=db_batch,
+            checker_clerk=checker,
             checking_date=obj_in.checking_date,
             checking_time=obj_in.checking_time,
-            verifier_clerk_id=verifier.id if verifier else None,
+            verifier_clerk=verifier,
             verifying_date=obj_in.verifying_date,
             verifying_time=obj_in.verifying_time,
             paddy_moisture_percent=obj_in.paddy_moisture_percent,
-            approver_clerk_id=approver.id if approver else None,
+            approver_clerk=approver,
             user_login_id=obj_in.user_login_id
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return cross_verification_repository.save(db, db_obj)
 
     # --- Lot Details ---
-    def get_lot_details(self, db: Session, skip: int = 0, limit: int = 100):
-        return lot_details_repository.get_multi(db, skip=skip, limit=limit)
+    def get_lot_details(self, db: Session, *, limit: Optional[int], cursor: Optional[str] = None, with_total: bool = False):
+        return lot_details_repository.get_page(db, limit=limit, cursor=cursor, with_total=with_total)
 
     def create_lot_details(self, db: Session, obj_in: CreateLot):
         checker = db.query(Clerks).filter(Clerks.clerk_name == obj_in.checker_clerk).first()
@@ -353,17 +388,14 @@ class ProductionService:
             lot_chalky_percent=obj_in.lot_chalky_percent,
             lot_frk_percent=obj_in.lot_frk_percent,
             lot_other_percent=obj_in.lot_other_percent,
-            checker_clerk_id=checker.id if checker else None,
+            checker_clerk=checker,
             checking_date=obj_in.checking_date,
             checking_time=obj_in.checking_time,
-            verifier_clerk_id=verifier.id if verifier else None,
+            verifier_clerk=verifier,
             verifying_date=obj_in.verifying_date,
             verifying_time=obj_in.verifying_time,
             user_login_id=obj_in.user_login_id
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return lot_details_repository.save(db, db_obj)
 
 production_service = ProductionService()
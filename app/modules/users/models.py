@@ -7,14 +7,14 @@ from datetime import datetime, timezone
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, autoincrement=True, primary_key=True, index=True)
+    id = Column(Integer, autoincrement=True, primary_key=True)
     user_login_id = Column(String(30), unique=True, index=True)
-    user_first_name = Column(String(30), index=True)
-    user_second_name = Column(String(30), index=True)
-    mobile_number = Column(String(10), index=True)
-    designation = Column(String(30), index=True)
+    user_first_name = Column(String(30))
+    user_second_name = Column(String(30))
+    mobile_number = Column(String(10))
+    designation = Column(String(30))
     user_role = Column(String(15), default=False)
-    password = Column(String(100), index=True)
+    password = Column(String(100))
     time_stamp = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), server_default=func.now(), onupdate=func.now())
 
     # Relationships
@@ -29,7 +29,7 @@ class User(Base):
     packaging_details = relationship("PackagingDetails", back_populates="users")
     weight_bridge_operator = relationship("WeightBridgeOperator", back_populates="users")
     transaction_mill_operations = relationship("TransactionMillOperations", back_populates="users")
-    # labour_payment_vouchers = relationship("LabourPaymentVouchers", back_populates="users") # TODO: Fix import path later
+    labour_payment_vouchers = relationship("LabourPaymentVouchers", back_populates="users")
     module_control = relationship("ModuleControl", back_populates="users")
     license_renewal = relationship("LicenseRenewal", back_populates="users")
     
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.db.session import get_db
 from app.core.security import get_current_user, verify_password, hash_password
+from app.core.pagination import AllRowsPageParams, page_response
 from app.modules.users.schemas import UserCreate, UserUpdate, UserResponse, UpdatePassword
 from app.modules.users.service import user_service
 
@@ -22,7 +23,7 @@ def read_current_user(current_user: dict = Depends(get_current_user)):
     }
 
 @router.get("/get_users", response_model=List[UserResponse])
-def get_users(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+def get_users(response: Response, page: AllRowsPageParams = Depends(), db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
     # Custom query logic not yet in generic service, but we can use get_multi or add custom method
     # For now, let's stick to the original logic but maybe move it to service later if complex
     # Or better, use service.repository.model to query
@@ -32,7 +33,10 @@ def get_users(db: Session = Depends(get_db), current_user: dict = Depends(get_cu
     # For now, I will reproduce the logic here using the service's repository session access if needed, 
     # but ideally we shouldn't access DB directly in router.
     # I'll add `get_all_except_superadmin` to UserService.
-    return user_service.get_all_except_superadmin(db)
+    result = user_service.get_page_except_superadmin(
+        db, limit=page.limit, cursor=page.cursor, with_total=page.include_total
+    )
+    return page_response(response, result)
 
 @router.post("/create_user", response_model=UserResponse)
 def create_user(
@@ -1,9 +1,11 @@
 from typing import Optional, List
 from sqlalchemy.orm import Session
+from app.core.repository import Page
 from app.core.service import BaseService
 from app.modules.users.models import User
 from app.modules.users.schemas import UserCreate, UserUpdate
 from app.modules.users.repository import user_repository
+from app.core.auth_cache import auth_cache
 from app.core.security import hash_password
 
 class UserService(BaseService[User, UserCreate, UserUpdate]):
@@ -23,13 +25,33 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         if "password" in update_data and update_data["password"]:
             hashed_password = hash_password(update_data["password"])
             update_data["password"] = hashed_password
-            
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
 
-    def get_all_except_superadmin(self, db: Session) -> List[User]:
-        return db.query(self.repository.model).filter(
+        # Cached logins carry the old role/name; the login id itself may be what changes
+        previous_login_id = db_obj.user_login_id
+        user = super().update(db, db_obj=db_obj, obj_in=update_data)
+        auth_cache.invalidate_user(previous_login_id, user.user_login_id)
+        return user
+
+    def delete(self, db: Session, *, id: int) -> User:
+        user = super().delete(db, id=id)
+        if user is not None:
+            auth_cache.invalidate_user(user.user_login_id)
+        return user
+
+    def _not_superadmin(self):
+        return (
             self.repository.model.user_login_id != "superadmin",
             self.repository.model.user_role != "superadmin"
-        ).all()
+        )
+
+    def get_all_except_superadmin(self, db: Session) -> List[User]:
+        return db.query(self.repository.model).filter(*self._not_superadmin()).all()
+
+    def get_page_except_superadmin(
+        self, db: Session, *, limit: Optional[int], cursor: Optional[str] = None, with_total: bool = False
+    ) -> Page[User]:
+        return self.repository.get_page(
+            db, limit=limit, cursor=cursor, filters=self._not_superadmin(), with_total=with_total
+        )
 
 user_service = UserService(user_repository)
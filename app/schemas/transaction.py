@@ -156,6 +156,9 @@ class BagDetailsOut(BaseModel):
     total_bags: int
     returned_bags: int
 
+    class Config:
+        from_attributes = True
+
 from app.modules.users.schemas import UserResponse
 from typing import List
 from datetime import datetime
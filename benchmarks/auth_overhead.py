@@ -0,0 +1,94 @@
+"""
+Per-request cost of `get_current_user` - JWT verification plus the `User` SELECT on
+every call ("uncached", the auth cache cleared before each request) against a hit in
+the auth cache ("cached") - for a pool of distinct users' tokens.
+
+Usage:
+    python -m benchmarks.auth_overhead [--iterations 2000] [--users 50]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (registers every model module the app maps, so User's relationships resolve)
+from app.core.auth_cache import auth_cache
+from app.core.security import create_access_token, get_current_user
+from app.db.base import Base
+from app.db.session import apply_sqlite_pragmas, get_sqlite_pragmas
+from app.modules.users.models import User
+
+
+def seed(db, users: int):
+    db.add_all([
+        User(
+            user_login_id=f"bench{i}", user_first_name="bench", user_second_name="bench", mobile_number="0",
+            designation="bench", user_role="admin", password="x",
+        )
+        for i in range(users)
+    ])
+    db.commit()
+
+
+def run(session_factory, tokens, iterations: int, cached: bool) -> dict:
+    timings = []
+    for i in range(iterations):
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=tokens[i % len(tokens)])
+        if not cached:
+            auth_cache.clear()
+        started = time.perf_counter()
+        # One session per request, like get_db
+        with session_factory() as db:
+            get_current_user(credentials, db)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "mean": statistics.fmean(timings),
+        "p50": timings[len(timings) // 2],
+        "p99": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=50)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    apply_sqlite_pragmas(engine, get_sqlite_pragmas("tuned"))
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    try:
+        with session_factory() as db:
+            seed(db, args.users)
+        tokens = [create_access_token({"sub": f"bench{i}", "role": "admin"})[0] for i in range(args.users)]
+
+        # Warm up the connection pool and the ORM's compiled query cache
+        run(session_factory, tokens, min(args.iterations, 100), cached=False)
+        results = {
+            "uncached": run(session_factory, tokens, args.iterations, cached=False),
+            "cached": run(session_factory, tokens, args.iterations, cached=True),
+        }
+    finally:
+        auth_cache.clear()
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    print(f"{'mode':<12}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for mode, stats in results.items():
+        print(f"{mode:<12}{stats['mean']:>10.3f}{stats['p50']:>10.3f}{stats['p99']:>10.3f}")
+    print(f"speedup (mean): {results['uncached']['mean'] / results['cached']['mean']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Compare write cost and hot-query latency of the old blanket schema (a single-column
+index on nearly every column) with the rationalized one (composite indexes matched
+to the repository queries, everything else dropped).
+
+Usage:
+    python -m benchmarks.index_rationalization [--transactions 2000] [--queries 500]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (registers every mapped class, as the app does)
+from app.db.base import Base
+from app.db.session import apply_sqlite_pragmas, get_sqlite_pragmas
+from app.modules.master_data.models import GodownDetails, StockItems
+from app.modules.inventory.service import inventory_service
+from app.schemas.transaction import TransactionMillOperationsCreate
+from benchmarks.write_query_count import seed
+
+GODOWNS = 5
+STOCK_ITEMS = 20
+REPEATS = 5
+COPIED_TABLES = (
+    "transaction_mill_operations", "transaction_stock_items_operations", "transaction_payments_mill_operations",
+    "transaction_packaging_details_mill_operations", "transaction_unloading_point_operations",
+    "transaction_allowances_deduction_mill_operations", "bag_details",
+)
+# Never had index=True in the models
+UNINDEXED_COLUMNS = {"time_stamp", "last_updated", "stock_quantity_bags", "stock_weight_quintal",
+                     "stock_quantity", "stock_weight", "user_role"}
+
+HOT_QUERIES = {
+    "ledger_lookup": (
+        "SELECT * FROM stock_ledger WHERE godown_id = :godown AND stock_item_id = :item",
+        lambda i: {"godown": i % GODOWNS + 1, "item": i % STOCK_ITEMS + 1},
+    ),
+    "sales_by_date": (
+        "SELECT * FROM transaction_mill_operations WHERE transaction_type = 0 "
+        "AND transaction_date BETWEEN :start AND :end ORDER BY id LIMIT 100",
+        lambda i: {
+            "start": (date(2025, 1, 1) + timedelta(days=i % 300)).isoformat(),
+            "end": (date(2025, 1, 1) + timedelta(days=i % 300 + 30)).isoformat(),
+        },
+    ),
+    "items_of_transactions": (
+        "SELECT * FROM transaction_stock_items_operations WHERE transaction_id IN (:a, :b, :c)",
+        lambda i: {"a": i % 1000 + 1, "b": i % 1000 + 2, "c": i % 1000 + 3},
+    ),
+    "bag_return_lookup": (
+        "SELECT bag_details.* FROM bag_details JOIN packaging_details_operations "
+        "ON packaging_details_operations.id = bag_details.packaging_id "
+        "WHERE bag_details.transaction_id = :tx AND packaging_details_operations.packaging_name = 'Jute'",
+        lambda i: {"tx": i % 1000 + 1},
+    ),
+}
+
+
+def make_blanket(engine):
+    """Recreate the old schema: drop the composite indexes, index every column on its own"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in inspector.get_indexes(table.name):
+                if len(index["column_names"]) > 1:
+                    conn.execute(text(f"DROP INDEX {index['name']}"))
+            for column in table.columns:
+                if column.name in UNINDEXED_COLUMNS:
+                    continue
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table.name}_{column.name} ON {table.name} ({column.name})"))
+
+
+def count_indexes(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT count(*) FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")).scalar()
+
+
+def run(schema: str, transactions: int, queries: int) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    apply_sqlite_pragmas(engine, get_sqlite_pragmas("tuned"))
+    Base.metadata.create_all(engine)
+    if schema == "blanket":
+        make_blanket(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    with session_factory() as db:
+        user_id = seed(db)
+        db.add_all([GodownDetails(godown_name=f"Godown {n}", user_login_id=user_id) for n in range(2, GODOWNS + 1)])
+        db.add_all([StockItems(stock_item_name=f"Item {n}", user_login_id=user_id) for n in range(2, STOCK_ITEMS + 1)])
+        db.commit()
+        item_names = ["Paddy"] + [f"Item {n}" for n in range(2, STOCK_ITEMS + 1)]
+
+    started = time.perf_counter()
+    for i in range(transactions):
+        with session_factory() as db:
+            inventory_service.create_transaction(db, TransactionMillOperationsCreate(
+                rst_number=str(i), bill_number=str(i), transaction_date=date(2025, 1, 1) + timedelta(days=i % 365),
+                transaction_type=(i % 3 != 0), party_name="Party", broker_name="Broker", transportor_name="Transportor",
+                operator_name="Operator", gross_weight=10000, tare_weight=2000, vehicle_number="-", remarks="-",
+                user_login_id=user_id,
+                transaction_stock_items=[
+                    {"stock_item_name": item_names[(i + k) % STOCK_ITEMS], "number_of_bags": 10, "weight": 80, "rate": 10}
+                    for k in range(2)
+                ],
+                payments=[{"payment_amount": 10, "payment_date": date(2025, 1, 1), "payment_remarks": "-"}],
+                packagings=[{"packaging_name": "Jute", "bag_nos": 20}],
+                unloadings=[{"godown_id": i % GODOWNS + 1, "number_of_bags": 20, "remarks": "-"}],
+                allowances_deductions=[{"is_allowance": True, "allowance_deduction_name": "-", "allowance_deduction_amount": 1, "remarks": "-"}],
+            ))
+    write_ms = (time.perf_counter() - started) * 1000 / transactions
+
+    with engine.connect() as conn:
+        page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+        page_count = conn.exec_driver_sql("PRAGMA page_count").scalar()
+
+        # Engine-only write cost (no ORM overhead): copy every transaction row once more,
+        # so each index on the transaction tables takes as many inserts as the posting run did
+        started = time.perf_counter()
+        for table in COPIED_TABLES:
+            columns = ", ".join(c.name for c in Base.metadata.tables[table].columns if c.name != "id")
+            conn.exec_driver_sql(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}")
+        conn.commit()
+        copy_ms = (time.perf_counter() - started) * 1000
+
+        conn.exec_driver_sql("ANALYZE")
+        conn.commit()
+        # Straight on the DBAPI cursor: at these sizes SQLAlchemy's per-call overhead would hide the plan
+        cursor = conn.connection.dbapi_connection.cursor()
+        latencies = {}
+        for name, (sql, params) in HOT_QUERIES.items():
+            for i in range(queries):
+                cursor.execute(sql, params(i)).fetchall()
+            best = None
+            for _ in range(REPEATS):
+                started = time.perf_counter()
+                for i in range(queries):
+                    cursor.execute(sql, params(i)).fetchall()
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            latencies[name] = best * 1_000_000 / queries
+        cursor.close()
+
+    result = {
+        "indexes": count_indexes(engine),
+        "write_ms": write_ms,
+        "copy_ms": copy_ms,
+        "size_kb": page_size * page_count / 1024,
+        **latencies,
+    }
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    before = run("blanket", args.transactions, args.queries)
+    after = run("rationalized", args.transactions, args.queries)
+    print(f"{'metric':<26}{'blanket':>12}{'rationalized':>14}")
+    print(f"{'indexes':<26}{before['indexes']:>12}{after['indexes']:>14}")
+    print(f"{'ms per transaction POST':<26}{before['write_ms']:>12.2f}{after['write_ms']:>14.2f}")
+    print(f"{'bulk copy of tx rows (ms)':<26}{before['copy_ms']:>12.1f}{after['copy_ms']:>14.1f}")
+    print(f"{'database size (KiB)':<26}{before['size_kb']:>12.0f}{after['size_kb']:>14.0f}")
+    for name in HOT_QUERIES:
+        print(f"{name + ' (us)':<26}{before[name]:>12.1f}{after[name]:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
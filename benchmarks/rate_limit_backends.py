@@ -0,0 +1,49 @@
+"""
+Per-check overhead of the rate limiter backends: "memory", in-process, and "sqlite",
+shared by all workers through a file. That the sqlite backend allows exactly the
+limit across processes is checked by tests/test_rate_limit_backends.py.
+
+Usage:
+    python -m benchmarks.rate_limit_backends [--clients 10000] [--requests 50000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.middleware.rate_limiter import RateLimit, RateLimiter, SQLiteRateLimiter
+
+
+def make_limiter(backend: str, path: str):
+    return SQLiteRateLimiter(path) if backend == "sqlite" else RateLimiter()
+
+
+def overhead(backend: str, path: str, clients: int, requests: int) -> float:
+    limiter = make_limiter(backend, path)
+    rate = RateLimit("bench", 60, 60)
+    keys = [f"bench:10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(clients)]
+    started = time.perf_counter()
+    for i in range(requests):
+        limiter.hit(keys[i % clients], rate)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=50000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    print(f"{'backend':<10}{'us/check':>10}")
+    for backend in ("memory", "sqlite"):
+        per_check = overhead(backend, os.path.join(directory, f"overhead-{backend}.db"), args.clients, args.requests)
+        print(f"{backend:<10}{per_check:>10.2f}")
+
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Compare the previous rate limiter (a list of datetimes per client, rebuilt on every
+check behind one asyncio.Lock, never evicted) with the current GCRA limiter: time per
+check and memory held, with requests spread round-robin over many distinct clients.
+
+Usage:
+    python -m benchmarks.rate_limiter [--clients 10000] [--requests 200000]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Tuple
+
+from app.middleware.rate_limiter import RateLimit, RateLimiter
+
+
+class PreviousRateLimiter:
+    """The implementation RateLimiter replaced, kept verbatim for comparison"""
+    def __init__(self, requests_per_minute: int = 60):
+        self.requests_per_minute = requests_per_minute
+        self.requests: Dict[str, list] = defaultdict(list)
+        self.lock = asyncio.Lock()
+
+    async def is_allowed(self, identifier: str) -> Tuple[bool, int]:
+        async with self.lock:
+            now = datetime.now()
+            minute_ago = now - timedelta(minutes=1)
+            self.requests[identifier] = [
+                req_time for req_time in self.requests[identifier]
+                if req_time > minute_ago
+            ]
+            current_requests = len(self.requests[identifier])
+            if current_requests >= self.requests_per_minute:
+                return False, 0
+            self.requests[identifier].append(now)
+            return True, self.requests_per_minute - current_requests - 1
+
+
+async def run_previous(keys, limit: int, trace: bool) -> Tuple[float, int, int]:
+    limiter = PreviousRateLimiter(limit)
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    allowed = 0
+    for key in keys:
+        allowed += (await limiter.is_allowed(key))[0]
+    elapsed = time.perf_counter() - started
+    return elapsed, _stop_tracing(trace), allowed
+
+
+def run_current(keys, limit: int, trace: bool) -> Tuple[float, int, int]:
+    limiter = RateLimiter()
+    rate = RateLimit("default", limit, 60)
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    allowed = 0
+    for key in keys:
+        allowed += limiter.hit(key, rate)[0]
+    elapsed = time.perf_counter() - started
+    return elapsed, _stop_tracing(trace), allowed
+
+
+def _stop_tracing(trace: bool) -> int:
+    if not trace:
+        return 0
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--limit", type=int, default=60, help="requests per minute per client")
+    args = parser.parse_args()
+
+    clients = [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(args.clients)]
+    keys = [clients[i % args.clients] for i in range(args.requests)]
+
+    # Timed without tracemalloc (it slows every allocation down), then run again to measure memory
+    results = {}
+    for name, run in (("previous", lambda trace: asyncio.run(run_previous(keys, args.limit, trace))),
+                      ("gcra", lambda trace: run_current(keys, args.limit, trace))):
+        elapsed, _, allowed = run(False)
+        results[name] = (elapsed, run(True)[1], allowed)
+    print(f"{args.requests} checks over {args.clients} clients, limit {args.limit}/minute")
+    print(f"{'limiter':<10}{'us/check':>10}{'checks/s':>12}{'memory KiB':>12}{'allowed':>10}")
+    for name, (elapsed, memory, allowed) in results.items():
+        print(f"{name:<10}{elapsed / args.requests * 1e6:>10.2f}{args.requests / elapsed:>12.0f}"
+              f"{memory / 1024:>12.0f}{allowed:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Compare read/write throughput of the "default" and "tuned" SQLite connection profiles
+under concurrent readers and writers.
+
+Usage:
+    python -m benchmarks.sqlite_profile [--readers 8] [--writers 4] [--seconds 5]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.db.session import apply_sqlite_pragmas, get_sqlite_pragmas
+
+
+def make_engine(path: str, profile: str):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    apply_sqlite_pragmas(engine, get_sqlite_pragmas(profile))
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS stock_ledger ("
+            "id INTEGER PRIMARY KEY, godown_id INTEGER, stock_item_id INTEGER, "
+            "stock_quantity_bags INTEGER, stock_weight_quintal REAL)"
+        ))
+        conn.execute(text(
+            "INSERT INTO stock_ledger (godown_id, stock_item_id, stock_quantity_bags, stock_weight_quintal) "
+            "VALUES (:g, :s, 0, 0.0)"
+        ), [{"g": g, "s": s} for g in range(10) for s in range(50)])
+    return engine
+
+
+def run(profile: str, readers: int, writers: int, seconds: float) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = make_engine(path, profile)
+    counters = {"reads": 0, "writes": 0, "locked": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def reader():
+        done = 0
+        while time.perf_counter() < deadline:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text(
+                        "SELECT godown_id, SUM(stock_quantity_bags), SUM(stock_weight_quintal) "
+                        "FROM stock_ledger GROUP BY godown_id"
+                    )).all()
+                done += 1
+            except OperationalError:
+                with lock:
+                    counters["locked"] += 1
+        with lock:
+            counters["reads"] += done
+
+    def writer(n: int):
+        done = 0
+        while time.perf_counter() < deadline:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(
+                        "UPDATE stock_ledger SET stock_quantity_bags = stock_quantity_bags + 1, "
+                        "stock_weight_quintal = stock_weight_quintal + 0.5 WHERE id = :id"
+                    ), {"id": (done * writers + n) % 500 + 1})
+                done += 1
+            except OperationalError:
+                with lock:
+                    counters["locked"] += 1
+        with lock:
+            counters["writes"] += done
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    return {
+        "profile": profile,
+        "reads_per_sec": round(counters["reads"] / seconds, 1),
+        "writes_per_sec": round(counters["writes"] / seconds, 1),
+        "locked_errors": counters["locked"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10}{'reads/s':>12}{'writes/s':>12}{'locked':>10}")
+    for profile in ("default", "tuned"):
+        result = run(profile, args.readers, args.writers, args.seconds)
+        print(f"{result['profile']:<10}{result['reads_per_sec']:>12}{result['writes_per_sec']:>12}{result['locked_errors']:>10}")
+
+
+if __name__ == "__main__":
+    main()
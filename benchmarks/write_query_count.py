@@ -0,0 +1,157 @@
+"""
+Count the SQL statements each POST issues, from the write through serializing the
+response model, with the old commit-then-refresh pattern ("refresh") and the current
+RETURNING / expire_on_commit=False write path ("returning").
+
+Usage:
+    python -m benchmarks.write_query_count [--iterations 50]
+"""
+import argparse
+import os
+import tempfile
+from datetime import date, time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (registers every mapped class, as the app does)
+from app.db.base import Base
+from app.db.session import apply_sqlite_pragmas, get_sqlite_pragmas
+from app.modules.users.models import User
+from app.modules.master_data.models import (
+    PartyDetails, BrokerDetails, TransportorDetails, GodownDetails, StockItems,
+    PackagingDetails, WeightBridgeOperator,
+)
+from app.modules.master_data.schemas import PartyCreate, PartyDetails as PartyResponse
+from app.modules.master_data.service import party_service
+from app.modules.production.models import Batch, BatchOperator
+from app.modules.production.schemas import CreateSteamOn, SteamOnResponse
+from app.modules.production.service import production_service
+from app.modules.inventory.schemas import IncomingOutgoingCreate, IncomingOutgoingRead
+from app.modules.inventory.service import inventory_service
+from app.schemas.transaction import TransactionMillOperationsCreate, TransactionMillOperations
+
+
+def seed(db) -> int:
+    user = User(
+        user_login_id="bench", user_first_name="bench", user_second_name="bench", mobile_number="0",
+        designation="bench", user_role="superadmin", password="x",
+    )
+    db.add(user)
+    db.flush()
+    db.add_all([
+        PartyDetails(party_name="Party", party_mob_no="0", party_address="-", party_type="-", remarks="-", user_login_id=user.id),
+        BrokerDetails(broker_name="Broker", broker_mob_no="0", brokerage_rate=0, remarks="-", user_login_id=user.id),
+        TransportorDetails(transportor_name="Transportor", transportor_mob_no="0", remarks="-", user_login_id=user.id),
+        GodownDetails(godown_name="Godown", godown_qtl_capacity=1, godown_bags_capacity=1, remarks="-", user_login_id=user.id),
+        StockItems(stock_item_name="Paddy", remarks="-", user_login_id=user.id),
+        PackagingDetails(packaging_name="Jute", bag_weight=500, packaging_unit="g", remarks="-", user_login_id=user.id),
+        WeightBridgeOperator(operator_name="Operator", operator_mob_no="0", is_active=True, remarks="-", user_login_id=user.id),
+        BatchOperator(operator_name="First", operator_mob_no="0", is_active=True, user_login_id=user.id),
+        BatchOperator(operator_name="Second", operator_mob_no="0", is_active=True, user_login_id=user.id),
+        Batch(batch_name="B1", batch_date=date(2025, 1, 1), pot_number=1, user_login_id=user.id),
+    ])
+    db.commit()
+    return user.id
+
+
+def create_party(db, user_id: int, i: int):
+    obj = party_service.create(db, obj_in=PartyCreate(
+        party_name=f"Party {i}", party_mob_no="0", party_address="-", party_type="-", remarks="-", user_login_id=user_id,
+    ))
+    return obj, PartyResponse
+
+
+def create_steam_on(db, user_id: int, i: int):
+    obj = production_service.create_steam_on(db, CreateSteamOn(
+        batch_name="B1", steam_on_date=date(2025, 1, 1), steam_on_time=time(6, 0),
+        first_batch_operator="First", second_batch_operator="Second", user_login_id=user_id,
+    ))
+    return obj, SteamOnResponse
+
+
+def create_transaction(db, user_id: int, i: int):
+    obj = inventory_service.create_transaction(db, TransactionMillOperationsCreate(
+        rst_number=str(i), bill_number=str(i), transaction_date=date(2025, 1, 1), transaction_type=True,
+        party_name="Party", broker_name="Broker", transportor_name="Transportor", operator_name="Operator",
+        gross_weight=10000, tare_weight=2000, vehicle_number="-", remarks="-", user_login_id=user_id,
+        transaction_stock_items=[{"stock_item_name": "Paddy", "number_of_bags": 10, "weight": 80, "rate": 10}],
+        payments=[{"payment_amount": 10, "payment_date": date(2025, 1, 1), "payment_remarks": "-"}],
+        packagings=[{"packaging_name": "Jute", "bag_nos": 10}],
+        unloadings=[{"godown_id": 1, "number_of_bags": 10, "remarks": "-"}],
+        allowances_deductions=[{"is_allowance": True, "allowance_deduction_name": "-", "allowance_deduction_amount": 1, "remarks": "-"}],
+    ))
+    return obj, TransactionMillOperations
+
+
+def create_incoming_outgoing(db, user_id: int, i: int):
+    obj = inventory_service.create_incoming_outgoing(db, IncomingOutgoingCreate(
+        io_date=date(2025, 1, 1), is_incoming=True, rst_bill=str(i), brought_by="-", mob_no="0", vehicle_no="-",
+        origin="-", party_through="-", transportation_expense=0, remarks="-", user_login_id=user_id,
+        incoming_outgoing_items=[{
+            "jins": "-", "bags_no": 1, "quantity": 1, "packaging": "Jute", "weight_society": 1, "weight_wb": 1, "amount": 1,
+        }],
+        incoming_outgoing_payment=[{"payment_amount": 1, "payment_date": date(2025, 1, 1)}],
+    ))
+    return obj, IncomingOutgoingRead
+
+
+SCENARIOS = {
+    "party": create_party,
+    "steam_on": create_steam_on,
+    "transaction": create_transaction,
+    "incoming_outgoing": create_incoming_outgoing,
+}
+
+
+def run(mode: str, iterations: int) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    apply_sqlite_pragmas(engine, get_sqlite_pragmas("tuned"))
+    Base.metadata.create_all(engine)
+    # "refresh" reproduces the previous write path: objects expire at commit and are reloaded
+    session_factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=(mode == "refresh"))
+
+    with session_factory() as db:
+        user_id = seed(db)
+
+    statements = {"count": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements["count"] += 1
+
+    results = {}
+    for name, scenario in SCENARIOS.items():
+        statements["count"] = 0
+        for i in range(iterations):
+            # One session per request, like get_db
+            with session_factory() as db:
+                obj, response_model = scenario(db, user_id, i)
+                if mode == "refresh":
+                    db.refresh(obj)
+                response_model.model_validate(obj).model_dump()
+        results[name] = statements["count"] / iterations
+
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    before = run("refresh", args.iterations)
+    after = run("returning", args.iterations)
+    print(f"{'endpoint':<20}{'refresh':>10}{'returning':>12}")
+    for name in SCENARIOS:
+        print(f"{name:<20}{before[name]:>10.1f}{after[name]:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
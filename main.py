@@ -1,7 +1,18 @@
 import logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from app.core.profiler import ProfilerMiddleware, profile_routes
+from app.core.query_budget import QueryBudgetMiddleware, instrument_sessions
+from app.core.timing import ServerTimingMiddleware, instrument_routes
+from app.core.tracing import TracingMiddleware
+from app.db.health import readiness_probe
+from app.middleware.access_log import AccessLogMiddleware
+from app.middleware.rate_limiter import RateLimitMiddleware
 
 # Suppress annoying asyncio connection reset errors on Windows
 logging.getLogger("asyncio").setLevel(logging.CRITICAL)
@@ -16,6 +27,10 @@ app = FastAPI(
     }
 )
 
+# Inside CORS, so 429 responses still carry the CORS headers
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 # Set all CORS enabled origins
 app.add_middleware(
     CORSMiddleware,
@@ -23,19 +38,80 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "Server-Timing", "X-Profile-Id", "traceparent",
+                    "X-RateLimit-Limit", "X-RateLimit-Remaining", "Retry-After"],
 )
 
+if settings.ORM_STRICT_MODE != "off" or settings.ORM_RAISELOAD:
+    instrument_sessions()
+if settings.ORM_STRICT_MODE != "off":
+    app.add_middleware(QueryBudgetMiddleware)
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+if settings.ACCESS_LOG_ENABLED:
+    app.add_middleware(AccessLogMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
 @app.get("/")
 def root():
     return {"message": "Welcome to Rice Mill ERP API"}
 
 @app.get(f"{settings.API_V1_STR}/health")
-def health_check():
+@app.get(f"{settings.API_V1_STR}/health/live")
+async def health_check():
+    """Liveness: the process is up and its event loop is responding; no dependencies are checked"""
     return {"status": "healthy"}
 
+@app.get(f"{settings.API_V1_STR}/health/ready")
+async def readiness_check():
+    """Readiness: database reachable and writable within the deadline (503 otherwise), plus pool and WAL stats"""
+    result = readiness_probe.cached() or await run_in_threadpool(readiness_probe.check)
+    return JSONResponse(result, status_code=200 if result["status"] == "ready" else 503)
+
+if settings.METRICS_ENABLED:
+    @app.get(f"{settings.API_V1_STR}/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(registry.render(), media_type=CONTENT_TYPE)
+
 from app.api.v1.api import api_router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+if settings.SERVER_TIMING_ENABLED:
+    instrument_routes(app)
+if settings.PROFILING_ENABLED:
+    profile_routes(app)
+
+from app.core.revocation import revocation_store
+from app.db.writer import write_queue
+
+if settings.LOOP_MONITOR_ENABLED:
+    @app.on_event("startup")
+    async def start_loop_monitor():
+        loop_monitor.start()
+
+    @app.on_event("shutdown")
+    async def stop_loop_monitor():
+        await loop_monitor.stop()
+
+@app.on_event("shutdown")
+def stop_write_queue():
+    # Let queued writes commit before the process exits
+    write_queue.stop(timeout=30)
+
+@app.on_event("startup")
+def start_revocation_sync():
+    # Sync (blocking) loads the revoked tokens before the first request
+    revocation_store.start()
+
+@app.on_event("shutdown")
+def stop_revocation_sync():
+    revocation_store.stop(timeout=5)
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,134 @@
+"""rationalize indexes: drop unused single-column indexes, add composite indexes
+
+Revision ID: 7c2e4d91b3a6
+Revises: a5b1bd9ffbf9
+Create Date: 2026-10-18 10:12:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e4d91b3a6'
+down_revision: Union[str, Sequence[str], None] = 'a5b1bd9ffbf9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Single-column `index=True` indexes that no repository query uses: primary keys
+# (already the rowid), free text matched with ilike('%..%'), amounts, weights,
+# percentages, booleans and foreign keys that are never filtered or joined from.
+DROPPED_INDEXES = {
+    "incoming_outgoing": [
+        "id", "is_incoming", "rst_bill", "brought_by", "mob_no", "vehicle_no", "origin", "party_through",
+        "transportation_expense", "remarks", "user_login_id",
+    ],
+    "incoming_outgoing_items": [
+        "id", "jins", "bags_no", "quantity", "packaging", "weight_society", "weight_wb", "amount",
+    ],
+    "incoming_outgoing_payment": ["id", "payment_amount", "payment_date"],
+    "stock_ledger": ["id", "godown_id"],
+    "transaction_mill_operations": [
+        "id", "rst_number", "bill_number", "transaction_type", "gross_weight", "tare_weight",
+        "weight_bridge_operator_id", "vehicle_number", "remarks", "user_login_id",
+    ],
+    "transaction_packaging_details_mill_operations": ["id", "packaging_id", "bag_nos"],
+    "transaction_stock_items_operations": ["id", "transaction_id", "number_of_bags", "weight", "rate"],
+    "transaction_allowances_deduction_mill_operations": [
+        "id", "is_allowance", "allowance_deduction_name", "allowance_deduction_amount", "remarks",
+    ],
+    "transaction_payments_mill_operations": ["id", "payment_amount", "payment_date", "payment_remarks"],
+    "transaction_unloading_point_operations": ["id", "number_of_bags", "remarks"],
+    "bag_details": [
+        "id", "transaction_id", "packaging_id", "total_bags", "returned_bags", "remaining_bags",
+        "bags_status",
+    ],
+    "party_details_operations": [
+        "id", "party_mob_no", "party_address", "party_type", "remarks", "user_login_id",
+    ],
+    "broker_details_operations": ["id", "broker_mob_no", "brokerage_rate", "remarks", "user_login_id"],
+    "transportor_details_operations": ["id", "transportor_mob_no", "remarks", "user_login_id"],
+    "godown_details_operations": [
+        "id", "godown_qtl_capacity", "godown_bags_capacity", "remarks", "user_login_id",
+    ],
+    "stock_items_operations": ["id", "remarks", "user_login_id"],
+    "packaging_details_operations": ["id", "bag_weight", "packaging_unit", "remarks", "user_login_id"],
+    "weight_bridge_operator_operations": ["id", "operator_mob_no", "is_active", "remarks", "user_login_id"],
+    "batch_operator": ["id", "operator_mob_no", "is_active", "user_login_id"],
+    "clerks": ["id", "clerk_mob_no", "is_active", "user_login_id"],
+    "batch": ["id", "batch_date", "pot_number", "user_login_id"],
+    "steam_on": [
+        "id", "steam_on_date", "steam_on_time", "first_batch_operator_id", "second_batch_operator_id",
+        "user_login_id",
+    ],
+    "steam_off": [
+        "id", "steam_off_date", "steam_off_time", "first_batch_operator_id", "second_batch_operator_id",
+        "user_login_id",
+    ],
+    "drainage": [
+        "id", "drainage_date", "drainage_time", "first_batch_operator_id", "second_batch_operator_id",
+        "user_login_id",
+    ],
+    "immerse": [
+        "id", "immersion_date", "immersion_time", "first_batch_operator_id", "second_batch_operator_id",
+        "user_login_id",
+    ],
+    "milling_analysis": [
+        "id", "analyzer_clerk_id", "milling_rice_moisture_percent", "milling_broken_percent",
+        "milling_discolor_percent", "milling_damaged_percent", "milling_output_porridge_30sec",
+        "milling_output_final_polisher_30sec", "user_login_id",
+    ],
+    "sorting_analysis": [
+        "id", "analyzer_clerk_id", "sorted_rice_moisture_percent", "sorted_broken_percent",
+        "sorted_discolor_percent", "sorted_damaged_percent", "rejection_rice_percent",
+        "sorting_output_30sec", "rejection_output_30sec", "checker_clerk_id", "checking_date",
+        "checking_time", "verifier_clerk_id", "verifying_date", "verifying_time", "user_login_id",
+    ],
+    "cross_verification": [
+        "id", "checker_clerk_id", "checking_date", "checking_time", "verifier_clerk_id", "verifying_date",
+        "verifying_time", "paddy_moisture_percent", "approver_clerk_id", "user_login_id",
+    ],
+    "lot_details": [
+        "id", "lot_moisture_percent", "lot_broken_percent", "lot_discolor_percent", "lot_damaged_percent",
+        "lot_lower_grain_percent", "lot_chalky_percent", "lot_frk_percent", "lot_other_percent",
+        "checker_clerk_id", "checking_date", "checking_time", "verifier_clerk_id", "verifying_date",
+        "verifying_time", "user_login_id",
+    ],
+    "users": ["id", "user_first_name", "user_second_name", "mobile_number", "designation", "password"],
+}
+
+# (name, table, columns) matched to the hot predicates in the repositories
+COMPOSITE_INDEXES = [
+    ("ix_stock_ledger_godown_id_stock_item_id", "stock_ledger", ["godown_id", "stock_item_id"]),
+    ("ix_transaction_mill_operations_transaction_type_transaction_date", "transaction_mill_operations",
+     ["transaction_type", "transaction_date"]),
+    ("ix_transaction_stock_items_operations_transaction_id_stock_item_id", "transaction_stock_items_operations",
+     ["transaction_id", "stock_item_id"]),
+    ("ix_bag_details_transaction_id_packaging_id", "bag_details", ["transaction_id", "packaging_id"]),
+    ("ix_incoming_outgoing_is_incoming_io_date", "incoming_outgoing", ["is_incoming", "io_date"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composites first, so the lookups they replace are never left without an index
+    for name, table, columns in COMPOSITE_INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+    # Databases built with create_all() have all of these; ones built from the
+    # migrations alone are missing some, hence if_exists
+    for table, columns in DROPPED_INDEXES.items():
+        for column in columns:
+            op.drop_index(op.f(f"ix_{table}_{column}"), table_name=table, if_exists=True)
+    op.execute("ANALYZE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, columns in DROPPED_INDEXES.items():
+        for column in columns:
+            op.create_index(op.f(f"ix_{table}_{column}"), table, [column], unique=False, if_not_exists=True)
+    for name, table, columns in COMPOSITE_INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
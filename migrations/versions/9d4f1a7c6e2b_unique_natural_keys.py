@@ -0,0 +1,69 @@
+"""unique natural keys: the master-data name columns the bulk upserts match on
+
+Revision ID: 9d4f1a7c6e2b
+Revises: 7c2e4d91b3a6
+Create Date: 2026-10-18 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4f1a7c6e2b'
+down_revision: Union[str, Sequence[str], None] = '7c2e4d91b3a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column) for every repository `natural_key`: `upsert_many` uses
+# ON CONFLICT(<column>), which needs a UNIQUE index on exactly that column
+NATURAL_KEYS = [
+    ("party_details_operations", "party_name"),
+    ("broker_details_operations", "broker_name"),
+    ("transportor_details_operations", "transportor_name"),
+    ("godown_details_operations", "godown_name"),
+    ("stock_items_operations", "stock_item_name"),
+    ("packaging_details_operations", "packaging_name"),
+    ("weight_bridge_operator_operations", "operator_name"),
+    ("batch_operator", "operator_name"),
+    ("clerks", "clerk_name"),
+    ("labour_gang", "gang_name"),
+    ("labour_work_item", "labour_item_name"),
+    ("labour_work_particulars", "work_name"),
+    ("labour_bag_packaging_weight", "bag_weight"),
+    ("labour_work_location", "work_locations"),
+]
+
+
+def _existing_keys():
+    # Tables created by create_all() on first setup; a database may not have all of them yet
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    return [(table, column) for table, column in NATURAL_KEYS if table in tables]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    keys = _existing_keys()
+    # Fail before changing anything: duplicates have to be merged by hand, since other rows refer to them
+    duplicates = []
+    for table, column in keys:
+        rows = bind.execute(sa.text(
+            f"SELECT {column}, count(*) FROM {table} WHERE {column} IS NOT NULL GROUP BY {column} HAVING count(*) > 1"
+        )).fetchall()
+        duplicates += [f"{table}.{column} = {value!r} ({count} rows)" for value, count in rows]
+    if duplicates:
+        raise RuntimeError("Cannot add unique natural keys, duplicate values:\n" + "\n".join(duplicates))
+    for table, column in keys:
+        op.drop_index(op.f(f"ix_{table}_{column}"), table_name=table, if_exists=True)
+        op.create_index(op.f(f"ix_{table}_{column}"), table, [column], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in _existing_keys():
+        op.drop_index(op.f(f"ix_{table}_{column}"), table_name=table, if_exists=True)
+        op.create_index(op.f(f"ix_{table}_{column}"), table, [column], unique=False)
@@ -0,0 +1,79 @@
+"""
+Shared fixtures. The app is imported from a scratch directory, so its SQLite files,
+logs and profiles land there and a test run leaves the working tree untouched.
+"""
+import atexit
+import os
+import shutil
+import tempfile
+from datetime import date, datetime, time, timedelta
+
+_workdir = tempfile.mkdtemp(prefix="rice-mill-tests-")
+atexit.register(shutil.rmtree, _workdir, ignore_errors=True)
+os.chdir(_workdir)
+os.environ.setdefault("DATABASE_URL", "sqlite:///./database/test.db")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.makedirs("database", exist_ok=True)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Boolean, Date, DateTime, Enum, Float, Integer, Numeric, String, Text, Time, insert
+
+import main
+from app.core.security import create_access_token
+from app.db.base import Base
+from app.db.session import engine
+
+# Rows per table: enough for a list to show a per-row (N+1) query, small enough to stay quick
+SEED_ROWS = 20
+
+
+def _value(column, i: int):
+    """A valid value for row `i`; foreign keys point at parent row `i`, so every row has a distinct parent"""
+    kind = column.type
+    if column.foreign_keys or isinstance(kind, Integer):
+        return i
+    if isinstance(kind, Enum):
+        choices = [member.name for member in kind.enum_class] if kind.enum_class else list(kind.enums)
+        return choices[i % len(choices)]
+    if isinstance(kind, Boolean):
+        return bool(i % 2)
+    if isinstance(kind, (Float, Numeric)):
+        return float(i)
+    if isinstance(kind, DateTime):
+        return datetime(2025, 1, 1) + timedelta(days=i)
+    if isinstance(kind, Date):
+        return date(2025, 1, 1) + timedelta(days=i)
+    if isinstance(kind, Time):
+        return time(10, 0)
+    if isinstance(kind, (String, Text)):
+        return f"{column.name[:6]}{i}"[:getattr(kind, "length", None) or 30]
+    return None
+
+
+def seed_every_table(rows: int):
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            conn.execute(insert(table), [
+                {
+                    column.name: "superadmin" if column.name == "user_role" else _value(column, i)
+                    for column in table.columns
+                    if not (column.primary_key and isinstance(column.type, Integer))
+                }
+                for i in range(1, rows + 1)
+            ])
+
+
+@pytest.fixture(scope="session")
+def client():
+    seed_every_table(SEED_ROWS)
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client):
+    # Seeded user 1: login "user_l1", superadmin
+    token, _ = create_access_token({"sub": "user_l1", "role": "superadmin"})
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,11 @@
+import pytest
+
+from app.core.query_budget import LIST_QUERY_BUDGETS, assert_max_queries
+
+
+@pytest.mark.parametrize("path, budget", sorted(LIST_QUERY_BUDGETS.items()))
+def test_list_stays_within_query_budget(client, auth_headers, path, budget):
+    # include_total adds the COUNT the budgets allow for; lists without paging ignore it
+    with assert_max_queries(budget):
+        response = client.get(path, params={"include_total": "true"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
@@ -0,0 +1,18 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.core.query_log import SlowQueryLog
+
+
+def test_failed_statement_does_not_leave_a_start_time():
+    engine = create_engine("sqlite://")
+    log = SlowQueryLog(threshold_ms=0, explain=False)
+    log.instrument(engine)
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(exc.OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        assert conn.info["query_start_time"] == []
+        conn.execute(text("SELECT 1"))
+        assert conn.info["query_start_time"] == []
+    engine.dispose()
@@ -0,0 +1,45 @@
+import multiprocessing
+import time
+from collections import Counter
+
+import pytest
+
+from app.middleware.rate_limiter import RateLimit, RateLimiter, SQLiteRateLimiter
+
+# Long enough that no allowance refills while the check runs
+LIMIT = RateLimit("check", 50, 3600)
+PROCESSES = 4
+KEYS = 20
+
+
+def make_limiter(backend: str, path: str):
+    return SQLiteRateLimiter(path) if backend == "sqlite" else RateLimiter()
+
+
+def hammer(args) -> Counter:
+    backend, path, attempts, start_at = args
+    limiter = make_limiter(backend, path)
+    # Start together so the processes really contend
+    time.sleep(max(0.0, start_at - time.time()))
+    allowed = Counter()
+    for i in range(attempts):
+        key = f"check:{i % KEYS}"
+        if limiter.hit(key, LIMIT)[0]:
+            allowed[key] += 1
+    return allowed
+
+
+@pytest.mark.parametrize("backend, expected", [
+    # Shared through the file: exactly the limit, however many processes
+    ("sqlite", LIMIT.count),
+    # Per process: each one allows the full limit
+    ("memory", LIMIT.count * PROCESSES),
+])
+def test_allowed_per_key_across_processes(tmp_path, backend, expected):
+    attempts = LIMIT.count * KEYS * 2
+    start_at = time.time() + 1
+    with multiprocessing.get_context("spawn").Pool(PROCESSES) as pool:
+        results = pool.map(hammer, [(backend, str(tmp_path / "limits.db"), attempts, start_at)] * PROCESSES)
+    allowed = sum(results, Counter())
+    assert len(allowed) == KEYS
+    assert set(allowed.values()) == {expected}